@@ -1,5 +1,51 @@
+from ._lazy import lazy_exports
+
 from .constants import *
 from .exceptions import *
-from gcp_compute_machines.providers import *
-from gcp_compute_machines.providers.scraper.models import *
-from gcp_compute_machines.providers.scraper.scraper import InstanceScraper
+from . import constants, exceptions
+
+# Providers and tools pull in the GCP SDK, httpx and pandas. They are imported on the first access,
+# so that `gcp_compute_machines.cli` and dump readers start fast.
+_LAZY_IMPORTS = {
+    'GCPMachinesProvider': 'gcp_compute_machines.providers',
+    'SnapshotRefresher': 'gcp_compute_machines.providers',
+    'PricingSnapshot': 'gcp_compute_machines.providers',
+    'GCloudComputeMachinesProvider': 'gcp_compute_machines.providers',
+    'GCPMachinesScraper': 'gcp_compute_machines.providers',
+    'UnitRatesTable': 'gcp_compute_machines.providers',
+    'CombinationPricer': 'gcp_compute_machines.providers',
+    'ScrapeScope': 'gcp_compute_machines.providers',
+    'RunCheckpoints': 'gcp_compute_machines.providers',
+    'CurrencyRates': 'gcp_compute_machines.providers',
+    'SKUPins': 'gcp_compute_machines.providers',
+    'InstanceScraper': 'gcp_compute_machines.providers.scraper.scraper',
+    'ScrapedMachineInfoModel': 'gcp_compute_machines.providers.scraper.models',
+    'ComputeFamilySKUModel': 'gcp_compute_machines.providers.scraper.models',
+    'GPUInfoModel': 'gcp_compute_machines.providers.scraper.models',
+    'SKURegexMappingModel': 'gcp_compute_machines.providers.scraper.models',
+    'StorageSKUModel': 'gcp_compute_machines.providers.scraper.models',
+    'CATALOG_USAGE_TYPES': 'gcp_compute_machines.providers.scraper.models',
+    'PRICED_RESOURCE_GROUPS': 'gcp_compute_machines.providers.scraper.models',
+    'SKURecord': 'gcp_compute_machines.providers.scraper.models',
+    'SKUCatalog': 'gcp_compute_machines.providers.scraper.models',
+    'BatchQuoter': 'gcp_compute_machines.tools',
+    'BatchQuoteResult': 'gcp_compute_machines.tools',
+    'ZoneAvailabilityIndex': 'gcp_compute_machines.tools',
+    'Reconciler': 'gcp_compute_machines.tools',
+    'ReconciliationReport': 'gcp_compute_machines.tools',
+    'PriceDelta': 'gcp_compute_machines.tools',
+    'SnapshotDiffer': 'gcp_compute_machines.tools',
+    'SnapshotDiff': 'gcp_compute_machines.tools',
+    'SnapshotChange': 'gcp_compute_machines.tools',
+    'diff_snapshots': 'gcp_compute_machines.tools',
+    'MappingCoverageAnalyzer': 'gcp_compute_machines.tools',
+    'MappingCoverageReport': 'gcp_compute_machines.tools',
+    'MachineRankingIndex': 'gcp_compute_machines.tools',
+    'RegionSpatialIndex': 'gcp_compute_machines.tools',
+    'FleetOptimizer': 'gcp_compute_machines.tools',
+    'Workload': 'gcp_compute_machines.tools',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS)
+
+__all__ = constants.__all__ + exceptions.__all__ + list(_LAZY_IMPORTS)
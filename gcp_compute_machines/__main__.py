@@ -0,0 +1,3 @@
+from gcp_compute_machines.cli import main
+
+main()
@@ -0,0 +1,35 @@
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def lazy_exports(
+    module_name: str,
+    module_globals: Dict[str, Any],
+    lazy_imports: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Module `__getattr__` and `__dir__` which import names on the first access, PEP 562.
+
+    :param module_name: `__name__` of the exporting module
+    :param module_globals: `globals()` of the exporting module, imported names are cached there
+    :param lazy_imports: exported name -> module to import it from
+    :return: (`__getattr__`, `__dir__`)
+    """
+
+    def __getattr__(name: str):
+        source_module = lazy_imports.get(name)
+        if source_module is None:
+            raise AttributeError(f'module {module_name!r} has no attribute {name!r}')
+        value = getattr(importlib.import_module(source_module), name)
+        module_globals[name] = value
+        return value
+
+    def __dir__():
+        return sorted(set(module_globals) | set(lazy_imports))
+
+    return __getattr__, __dir__
+
+
+__all__ = [
+    'lazy_exports'
+]
@@ -0,0 +1,69 @@
+import argparse
+import time
+from typing import Optional
+
+import numpy as np
+
+from gcp_compute_machines.benchmarks.fixtures import make_pricing_data
+from gcp_compute_machines.tools.batch_quote import BatchQuoter
+
+USAGE_TYPES = ['ondemand', 'spot', 'cud1y', 'cud3y']
+
+
+def _naive_quote(machines: list, machine_type: str, region: str, usage_type: str, hours: float) -> Optional[float]:
+    for machine in machines:
+        if machine.name == machine_type and machine.region == region:
+            price = getattr(machine, usage_type)
+            return None if price is None else price * hours
+    return None
+
+
+def run(rows: int = 100_000, regions: int = 40, naive_sample: int = 200, seed: int = 42) -> dict:
+    """
+    Prices a synthetic fleet of `rows` entries with BatchQuoter and compares it against
+    a per-row search through the flat pricing data (measured on `naive_sample` rows and extrapolated).
+    """
+    machines = make_pricing_data(regions=regions, seed=seed)
+    rng = np.random.default_rng(seed)
+    picked = rng.integers(0, len(machines), rows)
+    machine_types = np.array([machines[i].name for i in picked], dtype=object)
+    machine_regions = np.array([machines[i].region for i in picked], dtype=object)
+    usage_types = np.array(USAGE_TYPES, dtype=object)[rng.integers(0, len(USAGE_TYPES), rows)]
+    hours = rng.uniform(1, 730, rows)
+
+    start = time.perf_counter()
+    quoter = BatchQuoter(machines)
+    index_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = quoter.quote(machine_types, machine_regions, usage_types, hours)
+    quote_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for i in range(naive_sample):
+        _naive_quote(machines, machine_types[i], machine_regions[i], usage_types[i], hours[i])
+    naive_seconds = (time.perf_counter() - start) * rows / naive_sample
+
+    return {
+        'pricing_rows': len(machines),
+        'fleet_rows': rows,
+        'index_seconds': index_seconds,
+        'quote_seconds': quote_seconds,
+        'naive_seconds_extrapolated': naive_seconds,
+        'speedup': naive_seconds / quote_seconds,
+        'total_cost': result.total_cost,
+        'missing_rows': result.missing_rows,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='BatchQuoter benchmark')
+    parser.add_argument('--rows', type=int, default=100_000)
+    parser.add_argument('--regions', type=int, default=40)
+    args = parser.parse_args(argv)
+    for k, v in run(rows=args.rows, regions=args.regions).items():
+        print(f'{k}: {v}')
+
+
+if __name__ == '__main__':
+    main()
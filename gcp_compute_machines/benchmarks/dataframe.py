@@ -0,0 +1,49 @@
+import argparse
+import time
+
+import pandas as pd
+
+from gcp_compute_machines.benchmarks.fixtures import make_pricing_data
+from gcp_compute_machines.tools.frames import machines_to_dataframe
+
+
+def run(regions: int = 40, seed: int = 42, repeat: int = 3) -> dict:
+    """
+    Compares `machines_to_dataframe` against `pd.DataFrame([x.model_dump() for x in machines])`.
+    """
+    machines = make_pricing_data(regions=regions, seed=seed)
+
+    def best_of(func):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            frame = func()
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        return best, frame
+
+    dump_seconds, dump_frame = best_of(lambda: pd.DataFrame([x.model_dump() for x in machines]))
+    columns_seconds, columns_frame = best_of(lambda: machines_to_dataframe(machines))
+    float32_seconds, float32_frame = best_of(lambda: machines_to_dataframe(machines, price_dtype='float32'))
+
+    return {
+        'rows': len(machines),
+        'model_dump_seconds': dump_seconds,
+        'columns_seconds': columns_seconds,
+        'speedup': dump_seconds / columns_seconds,
+        'model_dump_frame_mb': dump_frame.memory_usage(deep=True).sum() / 2 ** 20,
+        'columns_frame_mb': columns_frame.memory_usage(deep=True).sum() / 2 ** 20,
+        'float32_frame_mb': float32_frame.memory_usage(deep=True).sum() / 2 ** 20,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='DataFrame accessor benchmark')
+    parser.add_argument('--regions', type=int, default=40)
+    args = parser.parse_args(argv)
+    for k, v in run(regions=args.regions).items():
+        print(f'{k}: {v}')
+
+
+if __name__ == '__main__':
+    main()
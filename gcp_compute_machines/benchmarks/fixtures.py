@@ -0,0 +1,56 @@
+import random
+from typing import List
+
+from gcp_compute_machines.providers.base.models.base_machine_info_model import GCPMachineType
+
+SERIES = ['n1', 'n2', 'n2d', 'n4', 'e2', 'c2', 'c2d', 'c3', 'c3d', 'c4', 't2d', 'm1', 'm3']
+SHAPES = ['standard', 'highmem', 'highcpu']
+VCPUS = [1, 2, 4, 8, 16, 32, 48, 64, 80, 96, 128]
+RAM_PER_VCPU = {
+    'standard': 4,
+    'highmem': 8,
+    'highcpu': 1
+}
+
+
+def make_regions(count: int = 40) -> List[str]:
+    geos = ['us-east', 'us-central', 'us-west', 'europe-west', 'europe-north', 'asia-east', 'asia-south',
+            'asia-northeast', 'australia-southeast', 'southamerica-east']
+    return [f'{geos[i % len(geos)]}{i // len(geos) + 1}' for i in range(count)]
+
+
+def make_pricing_data(regions: int = 40, seed: int = 42) -> List[GCPMachineType]:
+    """
+    Generates synthetic flat pricing data: every series x shape x vCPU machine in every region.
+    """
+    rng = random.Random(seed)
+    result = []
+    for region in make_regions(regions):
+        region_multiplier = 1 + rng.random() * 0.4
+        for series in SERIES:
+            vcpu_rate = 0.02 + rng.random() * 0.02
+            ram_rate = 0.003 + rng.random() * 0.002
+            for shape in SHAPES:
+                for vcpus in VCPUS:
+                    ram = vcpus * RAM_PER_VCPU[shape]
+                    ondemand = round((vcpus * vcpu_rate + ram * ram_rate) * region_multiplier, 5)
+                    result.append(GCPMachineType(
+                        name=f'{series}-{shape}-{vcpus}',
+                        series=series,
+                        family='General purpose',
+                        cpu_count=vcpus,
+                        ram=ram,
+                        network_bandwidth=min(2 * vcpus, 32),
+                        ondemand=ondemand,
+                        spot=round(ondemand * 0.3, 5),
+                        cud1y=round(ondemand * 0.63, 5),
+                        cud3y=round(ondemand * 0.45, 5),
+                        region=region,
+                    ))
+    return result
+
+
+__all__ = [
+    'make_regions',
+    'make_pricing_data'
+]
@@ -0,0 +1,86 @@
+import argparse
+import math
+import time
+from typing import List
+
+import numpy as np
+
+from gcp_compute_machines.benchmarks.fixtures import make_pricing_data, make_regions
+from gcp_compute_machines.tools.fleet_optimizer import EXACT_MAX_WORKLOADS, FleetOptimizer, Workload
+
+WORKLOAD_VCPUS = [0.25, 0.5, 1, 2, 3, 4, 6, 8, 12, 16]
+WORKLOAD_RAM_PER_VCPU = [1, 2, 3, 4, 6, 8]
+
+
+def make_workloads(count: int, regions: int = 40, seed: int = 42) -> List[Workload]:
+    """
+    Generates workloads: half of them may run anywhere, the other half in 1-4 random regions.
+    """
+    rng = np.random.default_rng(seed)
+    region_names = make_regions(regions)
+    result = []
+    for i in range(count):
+        cpu = float(rng.choice(WORKLOAD_VCPUS))
+        ram = cpu * float(rng.choice(WORKLOAD_RAM_PER_VCPU))
+        allowed = None
+        if rng.random() < 0.5:
+            allowed = tuple(rng.choice(region_names, int(rng.integers(1, 5)), replace=False))
+        result.append(Workload(cpu=cpu, ram=ram, regions=allowed, name=f'workload-{i}'))
+    return result
+
+
+def _machine_per_workload_cost(optimizer: FleetOptimizer, workloads: List[Workload]) -> float:
+    """
+    Cost of running every workload on its own cheapest fitting machine.
+    """
+    return math.fsum(optimizer.optimize([x], exact=True).total_hourly_cost for x in workloads)
+
+
+def run(workloads: int = 10_000, regions: int = 40, exact_samples: int = 20, seed: int = 42) -> dict:
+    """
+    Packs `workloads` synthetic workloads with the heuristic and compares its cost against one machine per workload
+    and, on `exact_samples` sets of `EXACT_MAX_WORKLOADS` workloads, against the exact mode.
+    """
+    machines = make_pricing_data(regions=regions, seed=seed)
+    fleet = make_workloads(workloads, regions=regions, seed=seed)
+
+    start = time.perf_counter()
+    optimizer = FleetOptimizer(machines)
+    plan = optimizer.optimize(fleet, exact=False)
+    optimize_seconds = time.perf_counter() - start
+
+    gaps = []
+    exact_seconds = 0.0
+    for i in range(exact_samples):
+        sample = make_workloads(EXACT_MAX_WORKLOADS, regions=regions, seed=seed + i + 1)
+        start = time.perf_counter()
+        exact = optimizer.optimize(sample, exact=True)
+        exact_seconds += time.perf_counter() - start
+        gaps.append(optimizer.optimize(sample, exact=False).total_hourly_cost / exact.total_hourly_cost)
+
+    return {
+        'pricing_rows': len(machines),
+        'workloads': workloads,
+        'optimize_seconds': optimize_seconds,
+        'machines': len(plan.machines),
+        'unplaced': len(plan.unplaced),
+        'hourly_cost': plan.total_hourly_cost,
+        'machine_per_workload_hourly_cost': _machine_per_workload_cost(optimizer, fleet),
+        'exact_seconds_per_sample': exact_seconds / exact_samples if exact_samples else None,
+        'heuristic_to_exact_cost_mean': float(np.mean(gaps)) if gaps else None,
+        'heuristic_to_exact_cost_max': max(gaps) if gaps else None,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='FleetOptimizer benchmark')
+    parser.add_argument('--workloads', type=int, default=10_000)
+    parser.add_argument('--regions', type=int, default=40)
+    parser.add_argument('--exact-samples', type=int, default=20)
+    args = parser.parse_args(argv)
+    for k, v in run(workloads=args.workloads, regions=args.regions, exact_samples=args.exact_samples).items():
+        print(f'{k}: {v}')
+
+
+if __name__ == '__main__':
+    main()
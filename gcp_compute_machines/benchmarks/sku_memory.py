@@ -0,0 +1,129 @@
+import argparse
+import multiprocessing
+import resource
+import time
+import tracemalloc
+from typing import Any, Literal
+
+from gcp_compute_machines.benchmarks.fixtures import make_regions
+from gcp_compute_machines.providers.scraper.models import SKUCatalog
+from gcp_compute_machines.testing.catalog import iter_sku_catalog
+
+Layout = Literal['legacy', 'compact']
+
+LEGACY_RESOURCE_GROUPS = ['CPU', 'GPU', 'RAM', 'N1Standard', 'F1Micro', 'G1Small', 'LocalSSD', 'SSD']
+
+
+def _legacy_add_sku(skus: dict, response: Any):
+    """
+    Nested dict per SKU as it was built by `InstanceScraper.get_skus_data` before `SKUCatalog`.
+    """
+    if response.category.resource_group not in skus:
+        return
+    sku_pricing_info = response.pricing_info[0]
+    if len(sku_pricing_info.pricing_expression.tiered_rates) == 0:
+        return
+    if response.category.usage_type not in skus[response.category.resource_group]:
+        skus[response.category.resource_group][response.category.usage_type] = {}
+    skus[response.category.resource_group][response.category.usage_type][response.name] = {
+        'name': response.name,
+        'sku_id': response.sku_id,
+        'description': response.description,
+        'usage_unit': sku_pricing_info.pricing_expression.usage_unit,
+        'usage_unit_description': sku_pricing_info.pricing_expression.usage_unit_description,
+        'base_unit': sku_pricing_info.pricing_expression.base_unit,
+        'base_unit_description': sku_pricing_info.pricing_expression.base_unit_description,
+        'base_unit_conversion_factor': sku_pricing_info.pricing_expression.base_unit_conversion_factor,
+        'display_quantity': sku_pricing_info.pricing_expression.display_quantity,
+        'pricing': {
+            'start_usage_amount': sku_pricing_info.pricing_expression.tiered_rates[0].start_usage_amount,
+            'unit_price_currency_code': sku_pricing_info.pricing_expression.tiered_rates[0].unit_price.currency_code,
+            'unit_price_units': sku_pricing_info.pricing_expression.tiered_rates[0].unit_price.units,
+            'unit_price_nanos': sku_pricing_info.pricing_expression.tiered_rates[0].unit_price.nanos,
+        },
+        'regions': list(response.service_regions)
+    }
+
+
+def _build_legacy(catalog) -> dict:
+    skus = {group: {} for group in LEGACY_RESOURCE_GROUPS}
+    for response in catalog:
+        _legacy_add_sku(skus, response)
+    # `init_skus` copied the groups into per usage type lists
+    return {
+        usage_type: [sku for group in LEGACY_RESOURCE_GROUPS[:-1] for sku in skus[group].get(usage_type, {}).values()]
+        for usage_type in ['OnDemand', 'Preemptible', 'Commit1Yr', 'Commit3Yr']
+    }
+
+
+def _build_compact(catalog) -> SKUCatalog:
+    skus = SKUCatalog()
+    for response in catalog:
+        skus.add(response)
+    return skus
+
+
+BUILDERS = {
+    'legacy': _build_legacy,
+    'compact': _build_compact,
+}
+
+
+def _measure(layout: Layout, regions: int, noise_skus: int, trace: bool, queue: multiprocessing.Queue):
+    catalog = iter_sku_catalog(regions=make_regions(regions), noise_skus=noise_skus)
+    if trace:
+        tracemalloc.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    skus = BUILDERS[layout](catalog)
+    seconds = time.perf_counter() - start
+    result = {
+        'seconds': seconds,
+        # ru_maxrss is in KiB on Linux
+        'peak_rss_growth_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before) / 1024,
+    }
+    if trace:
+        current, peak = tracemalloc.get_traced_memory()
+        result = {'retained_mb': current / 2 ** 20, 'traced_peak_mb': peak / 2 ** 20}
+    del skus
+    queue.put(result)
+
+
+def _run_isolated(layout: Layout, regions: int, noise_skus: int, trace: bool) -> dict:
+    # every measurement runs in a fresh interpreter, so peak RSS isn't shared between layouts
+    context = multiprocessing.get_context('spawn')
+    queue = context.Queue()
+    process = context.Process(target=_measure, args=(layout, regions, noise_skus, trace, queue))
+    process.start()
+    result = queue.get()
+    process.join()
+    return result
+
+
+def run(regions: int = 40, noise_skus: int = 40_000) -> dict:
+    """
+    Builds SKU storage from a synthetic full catalog (every mapping regex in every region plus
+    `noise_skus` SKUs of unused resource groups) with the legacy nested dicts and with `SKUCatalog`.
+    Peak RSS and the traced Python allocations are measured in separate processes.
+    """
+    result = {}
+    for layout in BUILDERS:
+        for k, v in (_run_isolated(layout, regions, noise_skus, trace=False) |
+                     _run_isolated(layout, regions, noise_skus, trace=True)).items():
+            result[f'{layout}_{k}'] = v
+    result['retained_reduction'] = result['legacy_retained_mb'] / result['compact_retained_mb']
+    result['peak_rss_reduction_mb'] = result['legacy_peak_rss_growth_mb'] - result['compact_peak_rss_growth_mb']
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='SKU storage memory benchmark')
+    parser.add_argument('--regions', type=int, default=40)
+    parser.add_argument('--noise-skus', type=int, default=40_000)
+    args = parser.parse_args(argv)
+    for k, v in run(regions=args.regions, noise_skus=args.noise_skus).items():
+        print(f'{k}: {v}')
+
+
+if __name__ == '__main__':
+    main()
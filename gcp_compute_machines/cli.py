@@ -0,0 +1,453 @@
+import argparse
+import csv
+import fnmatch
+import importlib
+import json
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+import yaml
+
+from gcp_compute_machines.constants import SCRAPER_STAGES
+from gcp_compute_machines.dumps import (
+    PartitionedDump,
+    iter_dump_rows,
+    read_yaml_dump_section,
+    write_binary_snapshot,
+    write_partitioned_dump
+)
+from gcp_compute_machines.dumps.partitioned import PARTITION_KEYS
+
+PRICE_COLUMNS = ['ondemand', 'spot', 'sud', 'cud1y', 'cud3y']
+DEFAULT_QUERY_COLUMNS = ['name', 'region', 'cpu_count', 'ram', 'ondemand', 'spot', 'cud1y', 'cud3y']
+
+BENCHMARKS = {
+    'batch-quote': 'gcp_compute_machines.benchmarks.batch_quote',
+    'dataframe': 'gcp_compute_machines.benchmarks.dataframe',
+    'fleet-packing': 'gcp_compute_machines.benchmarks.fleet_packing',
+    'sku-memory': 'gcp_compute_machines.benchmarks.sku_memory',
+}
+
+OUTPUT_FORMATS = {
+    '.csv': 'csv',
+    '.jsonl': 'jsonl',
+    '.yaml': 'yaml',
+    '.yml': 'yaml',
+    '.gcpm': 'binary',
+}
+
+
+# Only `scrape` imports the providers (and the GCP SDK). The other commands work on existing dumps
+# and import nothing but PyYAML, so they start fast.
+
+# region scrape
+
+def _make_provider(args: argparse.Namespace):
+    if args.provider == 'gcloud-compute':
+        from gcp_compute_machines.providers.gcloud_compute import GCloudComputeMachinesProvider
+        return GCloudComputeMachinesProvider(log_level=args.log_level)
+
+    from gcp_compute_machines.providers.scraper import GCPMachinesScraper
+    project = args.project or os.environ.get('GOOGLE_CLOUD_PROJECT')
+    sa_path = args.sa_path or os.environ.get('GOOGLE_APPLICATION_CREDENTIALS')
+    if not project or not sa_path:
+        raise SystemExit('scrape scraper: --project and --sa-path (or GOOGLE_CLOUD_PROJECT and '
+                         'GOOGLE_APPLICATION_CREDENTIALS) are required')
+    return GCPMachinesScraper(
+        gpc_project_name=project,
+        gcp_sa_account_path=sa_path,
+        page_size=args.page_size,
+        request_budget=args.request_budget,
+        log_level=args.log_level,
+        checkpoint_dir=args.checkpoint_dir
+    )
+
+
+def _resumed_run_id(args: argparse.Namespace) -> Optional[str]:
+    if args.resume:
+        if not args.checkpoint_dir:
+            raise SystemExit('--resume requires --checkpoint-dir')
+        from gcp_compute_machines.providers.scraper.checkpoints import RunCheckpoints
+        run_id = RunCheckpoints.latest_run_id(args.checkpoint_dir)
+        if run_id is None:
+            raise SystemExit(f'There are no incomplete runs in {args.checkpoint_dir}')
+        return run_id
+    if args.run_id and not args.checkpoint_dir:
+        raise SystemExit('--run-id requires --checkpoint-dir')
+    return args.run_id
+
+
+def scrape(args: argparse.Namespace) -> int:
+    provider = _make_provider(args)
+    # the gcloud-compute provider has no caches, stages or scopes: it loads one CSV file
+    fetch_kwargs: Dict[str, Any] = {}
+    async_kwargs: Dict[str, Any] = {}
+    if args.provider == 'scraper':
+        fetch_kwargs.update(
+            dump=args.dump, load=args.load,
+            stages=args.stages, regions=args.regions, families=args.families, usage_types=args.usage_types,
+            run_id=_resumed_run_id(args), currencies=args.currencies,
+            sku_pins_path=args.sku_pins
+        )
+        async_kwargs.update(max_concurrency=args.max_concurrency)
+    if args.use_async:
+        import asyncio
+        machines = asyncio.run(provider.afetch_gcp_machines(**fetch_kwargs, **async_kwargs))
+    else:
+        machines = provider.fetch_gcp_machines(**fetch_kwargs)
+
+    if args.output and machines:
+        provider.dump_pricing_info(args.output, partition_by=args.partition_by, max_workers=args.max_workers)
+        print(f'{len(machines)} machines are saved into {args.output}', file=sys.stderr)
+    if args.unit_rates:
+        if args.provider != 'scraper':
+            raise SystemExit('--unit-rates is supported only by the scraper provider')
+        provider.dump_unit_rates(args.unit_rates)
+    return 0
+
+
+def _add_partition_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('--partition-by', choices=PARTITION_KEYS, default=None,
+                        help='write a directory with one dump per partition and a manifest')
+    parser.add_argument('--max-workers', type=int, default=None, help='partitions written in parallel')
+
+
+def _add_scrape_parser(subparsers):
+    parser = subparsers.add_parser('scrape', help='fetch machines pricing and save it into a dump')
+    parser.add_argument('provider', choices=['scraper', 'gcloud-compute'],
+                        help='`scraper` uses GCP APIs, `gcloud-compute` loads https://gcloud-compute.com/ data')
+    parser.add_argument('-o', '--output', help='pricing dump file')
+    parser.add_argument('--project', help='GCP project (scraper)')
+    parser.add_argument('--sa-path', help='service account file (scraper)')
+    parser.add_argument('--load', action='store_true', help='reuse cached machine types and SKUs (scraper)')
+    parser.add_argument('--dump', action='store_true', help='save machine types and SKUs cache (scraper)')
+    parser.add_argument('--stages', nargs='+', choices=SCRAPER_STAGES, default=None,
+                        help='scraper stages to run, all by default. Skipped stages are loaded from the cache')
+    parser.add_argument('--regions', nargs='+', default=None, help='regions to scrape, all by default (scraper)')
+    parser.add_argument('--families', nargs='+', default=None,
+                        help='machine families to scrape, e.g. n2 c3, all by default (scraper)')
+    parser.add_argument('--usage-types', nargs='+', choices=PRICE_COLUMNS, default=None,
+                        help='usage types to price, all by default (scraper)')
+    parser.add_argument('--currencies', nargs='+', default=None,
+                        help='extra price currencies, e.g. EUR GBP: adds ondemand_eur, ... columns (scraper)')
+    parser.add_argument('--sku-pins', default=None,
+                        help='SKU pins file: price through the pinned SKU ids and save the new pins (scraper)')
+    parser.add_argument('--checkpoint-dir', help='checkpoint stage outputs of the run there (scraper)')
+    parser.add_argument('--run-id', help='checkpointed run to resume or the id of the new run (scraper)')
+    parser.add_argument('--resume', action='store_true', help='resume the latest incomplete checkpointed run (scraper)')
+    parser.add_argument('--async', dest='use_async', action='store_true', help='use the async API')
+    parser.add_argument('--max-concurrency', type=int, default=8, help='concurrent zone requests (with --async)')
+    parser.add_argument('--page-size', type=int, default=None, help='page size of list requests (scraper)')
+    parser.add_argument('--request-budget', type=int, default=None, help='max API requests per run (scraper)')
+    parser.add_argument('--unit-rates', help='unit rates file to save (scraper)')
+    _add_partition_arguments(parser)
+    parser.add_argument('--log-level', default='WARNING')
+    parser.set_defaults(func=scrape)
+
+# endregion
+
+
+# region query and export
+
+def _matches_any(value: Optional[str], patterns: Optional[List[str]]) -> bool:
+    if not patterns:
+        return True
+    return value is not None and any(fnmatch.fnmatchcase(value, pattern) for pattern in patterns)
+
+
+def _row_filter(args: argparse.Namespace) -> Callable[[dict], bool]:
+    zone_index = None
+    if args.zone:
+        from gcp_compute_machines.tools.zone_index import ZoneAvailabilityIndex, zone_region
+        zones = read_yaml_dump_section(args.dump, 'zones')
+        if zones is None:
+            raise SystemExit(f'{args.dump} has no zone availability data')
+        zone_index = ZoneAvailabilityIndex.from_dict(zones)
+        zone_regions = {zone_region(zone) for zone in args.zone}
+
+    def _filter(row: dict) -> bool:
+        if not (_matches_any(row.get('name'), args.name)
+                and _matches_any(row.get('region'), args.region)
+                and _matches_any(row.get('series'), args.series)
+                and _matches_any(row.get('family'), args.family)):
+            return False
+        if args.min_cpu is not None and (row.get('cpu_count') or 0) < args.min_cpu:
+            return False
+        if args.min_ram is not None and (row.get('ram') or 0) < args.min_ram:
+            return False
+        if args.max_price is not None:
+            price = row.get(args.usage_type)
+            if price is None or price > args.max_price:
+                return False
+        if zone_index is not None:
+            return row.get('region') in zone_regions and any(
+                zone_index.is_available(row['name'], zone) for zone in args.zone
+                if zone_region(zone) == row.get('region')
+            )
+        return True
+
+    return _filter
+
+
+def _iter_rows(args: argparse.Namespace) -> Iterator[dict]:
+    row_filter = _row_filter(args)
+    if os.path.isdir(args.dump):
+        # only partitions matching the filter of the partition key are opened
+        dump = PartitionedDump(args.dump)
+        patterns = getattr(args, dump.partition_by)
+        source = dump.iter_rows(dump.match(patterns) if patterns else None)
+    else:
+        source = iter_dump_rows(args.dump)
+    rows: Iterable[dict] = filter(row_filter, source)
+    if args.sort:
+        rows = list(rows)
+        # rows without a value go last in both orders
+        rows = sorted(
+            (row for row in rows if row.get(args.sort) is not None),
+            key=lambda row: row[args.sort],
+            reverse=args.desc
+        ) + [row for row in rows if row.get(args.sort) is None]
+    for i, row in enumerate(rows):
+        if args.limit is not None and i >= args.limit:
+            return
+        yield row
+
+
+def _select(row: dict, columns: Optional[List[str]]) -> dict:
+    if columns is None:
+        return row
+    return {column: row.get(column) for column in columns}
+
+
+def _write_csv(rows: Iterator[dict], file):
+    writer = None
+    for row in rows:
+        if writer is None:
+            writer = csv.DictWriter(file, fieldnames=list(row), extrasaction='ignore')
+            writer.writeheader()
+        writer.writerow(row)
+
+
+def _write_jsonl(rows: Iterator[dict], file):
+    for row in rows:
+        file.write(json.dumps(row))
+        file.write('\n')
+
+
+def _format_cell(value: Any) -> str:
+    if value is None:
+        return '-'
+    if isinstance(value, float):
+        return f'{value:g}'
+    return str(value)
+
+
+def _write_table(rows: Iterator[dict], file):
+    rows = [{k: _format_cell(v) for k, v in row.items()} for row in rows]
+    if not rows:
+        return
+    columns = list(rows[0])
+    widths = {column: max(len(column), *(len(row[column]) for row in rows)) for column in columns}
+    file.write('  '.join(column.ljust(widths[column]) for column in columns).rstrip() + '\n')
+    for row in rows:
+        file.write('  '.join(row[column].ljust(widths[column]) for column in columns).rstrip() + '\n')
+
+
+def _write_yaml(rows: Iterator[dict], file, dump_file_path: str):
+    Dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+    data = {
+        'metadata': read_yaml_dump_section(dump_file_path, 'metadata'),
+        'machines': list(rows),
+    }
+    zones = read_yaml_dump_section(dump_file_path, 'zones')
+    if zones is not None:
+        data['zones'] = zones
+    yaml.dump(data, file, Dumper=Dumper)
+
+
+def query(args: argparse.Namespace) -> int:
+    rows = (_select(row, args.columns) for row in _iter_rows(args))
+    if args.format == 'csv':
+        _write_csv(rows, sys.stdout)
+    elif args.format == 'jsonl':
+        _write_jsonl(rows, sys.stdout)
+    else:
+        _write_table(rows, sys.stdout)
+    return 0
+
+
+def export(args: argparse.Namespace) -> int:
+    if args.partition_by:
+        manifest = write_partitioned_dump(
+            args.output,
+            (_select(row, args.columns) for row in _iter_rows(args)),
+            partition_by=args.partition_by,
+            metadata=read_yaml_dump_section(args.dump, 'metadata'),
+            zones=read_yaml_dump_section(args.dump, 'zones'),
+            max_workers=args.max_workers
+        )
+        print(f'{manifest["rows"]} rows are saved into {len(manifest["partitions"])} partitions', file=sys.stderr)
+        return 0
+
+    output_format = args.format
+    if output_format is None:
+        output_format = OUTPUT_FORMATS.get(os.path.splitext(args.output)[1].lower())
+        if output_format is None:
+            raise SystemExit(f'Cannot detect output format of {args.output}, use --format')
+    rows = (_select(row, args.columns) for row in _iter_rows(args))
+    if output_format == 'binary':
+        if args.output == '-':
+            raise SystemExit('Binary snapshots can not be written to stdout')
+        write_binary_snapshot(
+            args.output,
+            rows,
+            metadata=read_yaml_dump_section(args.dump, 'metadata'),
+            zones=read_yaml_dump_section(args.dump, 'zones')
+        )
+        return 0
+    if args.output == '-':
+        file = sys.stdout
+    else:
+        file = open(args.output, 'w', newline='' if output_format == 'csv' else None)
+    try:
+        if output_format == 'csv':
+            _write_csv(rows, file)
+        elif output_format == 'jsonl':
+            _write_jsonl(rows, file)
+        else:
+            _write_yaml(rows, file, args.dump)
+    finally:
+        if file is not sys.stdout:
+            file.close()
+    return 0
+
+
+def _add_filter_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('dump', help='pricing dump file')
+    parser.add_argument('--name', nargs='+', help='machine type patterns, e.g. "n2-*"')
+    parser.add_argument('--region', nargs='+', help='region patterns, e.g. "europe-*"')
+    parser.add_argument('--series', nargs='+', help='series patterns, e.g. "c3"')
+    parser.add_argument('--family', nargs='+', help='family patterns, e.g. "General*"')
+    parser.add_argument('--zone', nargs='+', help='keep machines available in any of the zones')
+    parser.add_argument('--min-cpu', type=float)
+    parser.add_argument('--min-ram', type=float, help='GB')
+    parser.add_argument('--usage-type', choices=PRICE_COLUMNS, default='ondemand', help='price for --max-price')
+    parser.add_argument('--max-price', type=float, help='max hourly price of --usage-type')
+    parser.add_argument('--sort', help='field to sort by, e.g. ondemand')
+    parser.add_argument('--desc', action='store_true', help='sort in descending order')
+    parser.add_argument('--limit', type=int)
+
+
+def _add_query_parsers(subparsers):
+    parser = subparsers.add_parser('query', help='filter and print machines from a pricing dump')
+    _add_filter_arguments(parser)
+    parser.add_argument('--columns', nargs='+', default=DEFAULT_QUERY_COLUMNS)
+    parser.add_argument('--format', choices=['table', 'csv', 'jsonl'], default='table')
+    parser.set_defaults(func=query)
+
+    parser = subparsers.add_parser('export', help='convert (a subset of) a pricing dump to csv, jsonl, yaml or binary snapshot')
+    _add_filter_arguments(parser)
+    parser.add_argument('-o', '--output', default='-', help='output file, `-` for stdout')
+    parser.add_argument('--columns', nargs='+', default=None, help='all columns by default')
+    parser.add_argument('--format', choices=sorted(set(OUTPUT_FORMATS.values())), default=None,
+                        help='detected by --output extension by default')
+    _add_partition_arguments(parser)
+    parser.set_defaults(func=export)
+
+# endregion
+
+
+# region bench, diff and coverage
+
+def bench(args: argparse.Namespace) -> int:
+    names = [args.benchmark] if args.benchmark else list(BENCHMARKS)
+    for name in names:
+        print(f'# {name}')
+        importlib.import_module(BENCHMARKS[name]).main(args.extra_args)
+    return 0
+
+
+def diff(args: argparse.Namespace) -> int:
+    from gcp_compute_machines.tools import snapshot_diff
+
+    parser = argparse.ArgumentParser(prog='gcp-machines diff', description='Diff two pricing snapshots')
+    snapshot_diff.add_arguments(parser)
+    return snapshot_diff.run(parser.parse_args(args.extra_args))
+
+
+def coverage(args: argparse.Namespace) -> int:
+    from gcp_compute_machines.tools.mapping_coverage import MappingCoverageAnalyzer
+
+    report = MappingCoverageAnalyzer(data_dir=args.data_dir).analyze_files(args.skus, args.machines)
+    if args.format == 'jsonl':
+        for issue in report.issues:
+            print(json.dumps({'type': 'issue', **issue.model_dump()}))
+        for sku in report.unclaimed:
+            print(json.dumps({'type': 'unclaimed', **sku.model_dump()}))
+        for name in report.unmapped_machines:
+            print(json.dumps({'type': 'unmapped_machine', 'name': name}))
+    else:
+        for issue in report.issues:
+            print(
+                f'{issue.kind:<8} {issue.mapping}/{issue.component} {issue.usage_type} '
+                f'{issue.region or "*"} {issue.regex!r} {" ".join(issue.sku_ids)}'
+            )
+        for sku in report.unclaimed:
+            print(f'unclaimed {sku.sku_id} {sku.usage_type} {",".join(sku.regions)} {sku.description!r}')
+        for name in report.unmapped_machines:
+            print(f'unmapped {name}')
+    print(
+        f'{report.mappings} mappings, {report.skus} SKUs: {len(report.zero_matches)} zero matches, '
+        f'{len(report.multiple_matches)} multiple matches, {len(report.unclaimed)} unclaimed SKUs, '
+        f'{len(report.unmapped_machines)} unmapped machines',
+        file=sys.stderr
+    )
+    return 0 if report.is_complete else 1
+
+
+def _add_tool_parsers(subparsers):
+    # the remaining arguments are parsed by the benchmark / diff tool itself, see `main`
+    parser = subparsers.add_parser('bench', help='run benchmarks, all of them by default')
+    parser.add_argument('benchmark', nargs='?', choices=list(BENCHMARKS))
+    parser.set_defaults(func=bench, pass_extra_args=True)
+
+    # snapshot diff models are imported only when the command runs
+    parser = subparsers.add_parser('diff', help='diff two pricing dumps', add_help=False)
+    parser.set_defaults(func=diff, pass_extra_args=True)
+
+    parser = subparsers.add_parser('coverage', help='check SKU mappings against a cached SKU catalog')
+    parser.add_argument('skus', nargs='?', default='gcp_sku.yaml', help='cached SKUs (scraper `dump=True` output)')
+    parser.add_argument('--machines', help='cached machine types (gcp_instances.yaml), limits expected regions')
+    parser.add_argument('--data-dir', help='mappings directory, the package mappings by default')
+    parser.add_argument('--format', choices=['text', 'jsonl'], default='text')
+    parser.set_defaults(func=coverage)
+
+# endregion
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='gcp-machines', description='GCP Compute machines pricing')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    _add_scrape_parser(subparsers)
+    _add_query_parsers(subparsers)
+    _add_tool_parsers(subparsers)
+    return parser
+
+
+def main(argv=None):
+    parser = make_parser()
+    args, extra_args = parser.parse_known_args(argv)
+    if extra_args and not getattr(args, 'pass_extra_args', False):
+        parser.error(f'unrecognized arguments: {" ".join(extra_args)}')
+    args.extra_args = extra_args
+    try:
+        sys.exit(args.func(args))
+    except BrokenPipeError:
+        # e.g. `gcp-machines query ... | head`
+        sys.stderr.close()
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,9 @@ CommitmentThreeYearsUsage = 'cud3y'
 
 UsageType = Literal['ondemand', 'spot', 'cud1y', 'cud3y']
 
+# InstanceScraper run stages in execution order
+SCRAPER_STAGES = ('machine-types', 'skus', 'pricing')
+
 
 __all__ = [
     "AVG_HOURS_PER_MONTH",
@@ -17,5 +20,6 @@ __all__ = [
     'OnDemandUsage',
     'SpotUsage',
     'CommitmentOneYearUsage',
-    'CommitmentThreeYearsUsage'
+    'CommitmentThreeYearsUsage',
+    'SCRAPER_STAGES'
 ]
@@ -0,0 +1,3 @@
+from .reader import iter_dump_rows, iter_yaml_dump_rows, read_yaml_dump_section
+from .partitioned import PartitionedDump, write_partitioned_dump
+from .binary import BinarySnapshot, write_binary_snapshot
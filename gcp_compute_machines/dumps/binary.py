@@ -0,0 +1,253 @@
+import json
+import math
+import mmap
+import os
+import struct
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Fixed-layout binary pricing snapshot, read through `mmap`.
+# All numbers are little-endian, every section starts at an 8 bytes aligned offset.
+#
+#   header      magic (8s) | version (I) | rows (I) | columns (I) | reserved (I)
+#               | meta offset (Q) | meta length (Q) | strings offset (Q) | strings count (Q)
+#   directory   per column: name (32s) | kind (B) | padding (7x) | data offset (Q) | data length (Q)
+#   meta        JSON: {"metadata": ..., "zones": ...}
+#   strings     offsets (Q x (count + 1)) | UTF-8 blob, one table for all text columns
+#   columns     text: string codes (I), 0xFFFFFFFF is None
+#               float: float64, NaN is None
+#               int: int64, INT64_MIN is None
+#               bool: int8, -1 is None
+
+MAGIC = b'GCPMSNAP'
+FORMAT_VERSION = 1
+BINARY_SNAPSHOT_EXTENSION = '.gcpm'
+
+_HEADER = struct.Struct('<8sIIIIQQQQ')
+_COLUMN = struct.Struct('<32sB7xQQ')
+
+KIND_TEXT, KIND_FLOAT, KIND_INT, KIND_BOOL = range(4)
+_KIND_FORMATS = {KIND_TEXT: 'I', KIND_FLOAT: 'd', KIND_INT: 'q', KIND_BOOL: 'b'}
+_NULL_CODE = 0xFFFFFFFF
+_NULL_INT = -2 ** 63
+
+
+def _align(offset: int) -> int:
+    return (offset + 7) & ~7
+
+
+def _column_kind(values: List[Any]) -> int:
+    kinds = set()
+    for value in values:
+        if value is None:
+            continue
+        if isinstance(value, bool):
+            kinds.add(KIND_BOOL)
+        elif isinstance(value, int):
+            kinds.add(KIND_INT)
+        elif isinstance(value, float):
+            kinds.add(KIND_FLOAT)
+        elif isinstance(value, str):
+            kinds.add(KIND_TEXT)
+        else:
+            raise TypeError(f'Unsupported value type in a binary snapshot: {type(value).__name__}')
+    if not kinds:
+        return KIND_FLOAT
+    if kinds == {KIND_INT, KIND_FLOAT}:
+        return KIND_FLOAT
+    if len(kinds) > 1:
+        raise TypeError(f'Mixed value types in one column: {sorted(kinds)}')
+    return kinds.pop()
+
+
+def write_binary_snapshot(
+    file_path: str,
+    rows: Iterable[dict],
+    metadata: Optional[dict] = None,
+    zones: Optional[dict] = None,
+):
+    """
+    Writes machine rows (dicts with model field names) into a binary snapshot.
+
+    The file is written next to `file_path` and renamed over it, so processes which have the previous
+    snapshot mapped keep reading it, and new readers see only a complete file.
+    """
+    rows = list(rows)
+    # column names in the order of their first appearance
+    names: Dict[str, None] = {}
+    for row in rows:
+        names.update(dict.fromkeys(row))
+
+    strings: Dict[str, int] = {}
+    columns: List[Tuple[str, int, bytes]] = []
+    for name in names:
+        if len(name.encode()) > 32:
+            raise ValueError(f'Column name is longer than 32 bytes: {name}')
+        values = [row.get(name) for row in rows]
+        kind = _column_kind(values)
+        if kind == KIND_TEXT:
+            data = struct.pack(
+                f'<{len(values)}I',
+                *(_NULL_CODE if x is None else strings.setdefault(x, len(strings)) for x in values)
+            )
+        elif kind == KIND_FLOAT:
+            data = struct.pack(f'<{len(values)}d', *(math.nan if x is None else x for x in values))
+        elif kind == KIND_INT:
+            data = struct.pack(f'<{len(values)}q', *(_NULL_INT if x is None else x for x in values))
+        else:
+            data = struct.pack(f'<{len(values)}b', *(-1 if x is None else int(x) for x in values))
+        columns.append((name, kind, data))
+
+    meta = json.dumps({'metadata': metadata or {}, 'zones': zones}).encode()
+    blob = b''.join(x.encode() for x in strings)
+    string_offsets = [0]
+    for value in strings:
+        string_offsets.append(string_offsets[-1] + len(value.encode()))
+
+    offset = _HEADER.size + _COLUMN.size * len(columns)
+    meta_offset = _align(offset)
+    strings_offset = _align(meta_offset + len(meta))
+    sections = [
+        (meta_offset, meta),
+        (strings_offset, struct.pack(f'<{len(string_offsets)}Q', *string_offsets) + blob),
+    ]
+    offset = _align(strings_offset + len(sections[1][1]))
+    directory = []
+    for name, kind, data in columns:
+        directory.append(_COLUMN.pack(name.encode(), kind, offset, len(data)))
+        sections.append((offset, data))
+        offset = _align(offset + len(data))
+
+    tmp_path = f'{file_path}.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(_HEADER.pack(
+            MAGIC, FORMAT_VERSION, len(rows), len(columns), 0,
+            meta_offset, len(meta), strings_offset, len(strings)
+        ))
+        file.write(b''.join(directory))
+        for position, data in sections:
+            file.write(b'\0' * (position - file.tell()))
+            file.write(data)
+    os.replace(tmp_path, file_path)
+
+
+class BinarySnapshot:
+    """
+    Reader of `write_binary_snapshot` files.
+
+    The file is memory-mapped read-only: opening parses only the header, and columns are memoryviews
+    over the mapping, so worker processes reading one snapshot share one page cache copy.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        with open(file_path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._buffer = memoryview(self._mmap)
+        (
+            magic, version, self._rows, columns_count, _,
+            self._meta_offset, self._meta_length, strings_offset, strings_count
+        ) = _HEADER.unpack_from(self._buffer)
+        if magic != MAGIC:
+            raise ValueError(f'{file_path} is not a binary pricing snapshot')
+        if version != FORMAT_VERSION:
+            raise ValueError(f'Unsupported binary snapshot version {version} of {file_path}')
+
+        # column name -> (kind, values memoryview)
+        self._columns: Dict[str, Tuple[int, memoryview]] = {}
+        for i in range(columns_count):
+            name, kind, offset, length = _COLUMN.unpack_from(self._buffer, _HEADER.size + i * _COLUMN.size)
+            values = self._buffer[offset:offset + length].cast(_KIND_FORMATS[kind])
+            self._columns[name.rstrip(b'\0').decode()] = (kind, values)
+
+        blob_offset = strings_offset + 8 * (strings_count + 1)
+        self._string_offsets = self._buffer[strings_offset:blob_offset].cast('Q')
+        self._blob = self._buffer[blob_offset:]
+        # decoded on first use
+        self._strings: List[Optional[str]] = [None] * strings_count
+        self._meta: Optional[dict] = None
+
+    def close(self):
+        """
+        Unmaps the file, memoryviews returned by `raw_column` must be released first.
+        """
+        for _, values in self._columns.values():
+            values.release()
+        self._string_offsets.release()
+        self._blob.release()
+        self._buffer.release()
+        self._mmap.close()
+
+    def __enter__(self) -> 'BinarySnapshot':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self) -> int:
+        return self._rows
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def _meta_section(self, section: str) -> Any:
+        if self._meta is None:
+            self._meta = json.loads(bytes(self._buffer[self._meta_offset:self._meta_offset + self._meta_length]))
+        return self._meta.get(section)
+
+    @property
+    def metadata(self) -> dict:
+        return self._meta_section('metadata')
+
+    @property
+    def zones(self) -> Optional[dict]:
+        return self._meta_section('zones')
+
+    def _string(self, code: int) -> Optional[str]:
+        if code == _NULL_CODE:
+            return None
+        value = self._strings[code]
+        if value is None:
+            value = bytes(self._blob[self._string_offsets[code]:self._string_offsets[code + 1]]).decode()
+            self._strings[code] = value
+        return value
+
+    def _value(self, kind: int, raw):
+        if kind == KIND_TEXT:
+            return self._string(raw)
+        if kind == KIND_FLOAT:
+            return None if raw != raw else raw
+        if kind == KIND_INT:
+            return None if raw == _NULL_INT else raw
+        return None if raw < 0 else bool(raw)
+
+    def raw_column(self, name: str) -> memoryview:
+        """
+        Zero-copy values of a column: string codes for text columns, see the format description.
+        `numpy.frombuffer(snapshot.raw_column('ondemand'))` shares the mapping too.
+        """
+        return self._columns[name][1]
+
+    def column(self, name: str) -> list:
+        kind, values = self._columns[name]
+        return [self._value(kind, x) for x in values]
+
+    def row(self, i: int) -> dict:
+        return {name: self._value(kind, values[i]) for name, (kind, values) in self._columns.items()}
+
+    def iter_rows(self) -> Iterator[dict]:
+        for i in range(self._rows):
+            yield self.row(i)
+
+
+def iter_binary_snapshot_rows(file_path: str) -> Iterator[dict]:
+    with BinarySnapshot(file_path) as snapshot:
+        yield from snapshot.iter_rows()
+
+
+__all__ = [
+    'BINARY_SNAPSHOT_EXTENSION',
+    'BinarySnapshot',
+    'iter_binary_snapshot_rows',
+    'write_binary_snapshot'
+]
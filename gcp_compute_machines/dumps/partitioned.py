@@ -0,0 +1,221 @@
+import concurrent.futures
+import fnmatch
+import hashlib
+import multiprocessing
+import os
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import yaml
+
+from gcp_compute_machines.dumps.reader import MANIFEST_FILE, iter_yaml_dump_rows
+from gcp_compute_machines.exceptions import PartitionChecksumMismatch
+
+PARTITION_KEYS = ('region', 'family', 'series')
+
+Dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+def _file_sha256(file_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _partition_file_name(value: Any, used: set) -> str:
+    # 'General purpose' -> 'general_purpose.yaml'
+    slug = re.sub(r'[^a-z0-9._-]+', '_', str(value).lower()).strip('_.') or '_none'
+    file_name, i = f'{slug}.yaml', 1
+    while file_name in used:
+        file_name, i = f'{slug}_{i}.yaml', i + 1
+    used.add(file_name)
+    return file_name
+
+
+def _write_partition(file_path: str, metadata: dict, rows: List[dict]) -> Tuple[int, str]:
+    """
+    Writes one partition as a regular pricing dump.
+
+    :return: (rows count, sha256 of the file)
+    """
+    data = yaml.dump({'metadata': metadata, 'machines': rows}, Dumper=Dumper).encode()
+    with open(file_path, 'wb') as file:
+        file.write(data)
+    return len(rows), hashlib.sha256(data).hexdigest()
+
+
+def write_partitioned_dump(
+    dir_path: str,
+    rows: Iterable[dict],
+    partition_by: str = 'region',
+    metadata: Optional[dict] = None,
+    zones: Optional[dict] = None,
+    max_workers: Optional[int] = None,
+    use_processes: bool = False,
+) -> dict:
+    """
+    Writes machine rows into `dir_path` as one dump file per `partition_by` value, in parallel,
+    and a manifest with rows count and sha256 of every partition.
+
+    Every partition is a regular pricing dump, so it can be read alone. Partitions are serialized into
+    temporary files first and moved into place only after all of them are written, then the manifest is
+    replaced and partitions of the previous manifest which are gone are removed. A failed serialization
+    keeps the previous dump intact; an interrupted replacement is caught by `PartitionedDump.verify`.
+
+    :param partition_by: row field, see `PARTITION_KEYS`
+    :param zones: zone availability index (`ZoneAvailabilityIndex.to_dict()`), saved into the manifest
+    :param use_processes: serialize partitions in worker processes. YAML serialization holds the GIL,
+        so threads only overlap files writing. Worker processes are spawned, so the calling script
+        has to be guarded with `if __name__ == '__main__'`.
+    :return: manifest
+    """
+    if partition_by not in PARTITION_KEYS:
+        raise ValueError(f'Unsupported partition key: {partition_by}. Supported keys: {PARTITION_KEYS}')
+    metadata = {} if metadata is None else metadata
+    partitions: Dict[Any, List[dict]] = {}
+    for row in rows:
+        partitions.setdefault(row.get(partition_by), []).append(row)
+
+    os.makedirs(dir_path, exist_ok=True)
+    used_file_names = {MANIFEST_FILE}
+    file_names = {value: _partition_file_name(value, used_file_names) for value in partitions}
+    temp_paths = {value: os.path.join(dir_path, f'.{file_name}.tmp') for value, file_name in file_names.items()}
+
+    if use_processes:
+        executor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers, mp_context=multiprocessing.get_context('spawn')
+        )
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers)
+    try:
+        with executor:
+            futures = {
+                value: executor.submit(_write_partition, temp_paths[value], metadata, partition_rows)
+                for value, partition_rows in partitions.items()
+            }
+            results = {value: future.result() for value, future in futures.items()}
+    except BaseException:
+        for temp_path in temp_paths.values():
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        raise
+
+    manifest = {
+        'metadata': metadata,
+        'partition_by': partition_by,
+        'rows': sum(rows_count for rows_count, _ in results.values()),
+        'partitions': [
+            {
+                'value': value,
+                'file': file_names[value],
+                'rows': rows_count,
+                'sha256': sha256,
+            }
+            for value, (rows_count, sha256) in sorted(results.items(), key=lambda x: str(x[0]))
+        ],
+    }
+    if zones is not None:
+        manifest['zones'] = zones
+
+    manifest_path = os.path.join(dir_path, MANIFEST_FILE)
+    previous_files = set()
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as file:
+            previous_files = {x['file'] for x in yaml.load(file, Loader=Loader)['partitions']}
+    for value, temp_path in temp_paths.items():
+        os.replace(temp_path, os.path.join(dir_path, file_names[value]))
+    with open(f'{manifest_path}.tmp', 'w') as file:
+        yaml.dump(manifest, file, Dumper=Dumper)
+    os.replace(f'{manifest_path}.tmp', manifest_path)
+    for file_name in previous_files - set(file_names.values()):
+        stale_path = os.path.join(dir_path, file_name)
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+    return manifest
+
+
+class PartitionedDump:
+    """
+    Reader of `write_partitioned_dump` output which opens only the requested partitions.
+    """
+
+    def __init__(self, dir_path: str):
+        self.dir_path = dir_path
+        with open(os.path.join(dir_path, MANIFEST_FILE), 'r') as file:
+            self.manifest = yaml.load(file, Loader=Loader)
+        self.partition_by: str = self.manifest['partition_by']
+        self._partitions: Dict[Any, dict] = {x['value']: x for x in self.manifest['partitions']}
+
+    def __len__(self) -> int:
+        return self.manifest['rows']
+
+    @property
+    def metadata(self) -> dict:
+        return self.manifest['metadata']
+
+    @property
+    def zones(self) -> Optional[dict]:
+        return self.manifest.get('zones')
+
+    @property
+    def partitions(self) -> List[Any]:
+        return list(self._partitions)
+
+    def match(self, patterns: Iterable[str]) -> List[Any]:
+        """
+        :return: partition values matching any of the patterns, e.g. `europe-*`
+        """
+        patterns = list(patterns)
+        return [
+            value for value in self._partitions
+            if value is not None and any(fnmatch.fnmatchcase(str(value), pattern) for pattern in patterns)
+        ]
+
+    def verify(self, partitions: Optional[Iterable[Any]] = None):
+        """
+        Compares partition files with the manifest checksums.
+        """
+        for value in self._select(partitions):
+            partition = self._partitions[value]
+            sha256 = _file_sha256(os.path.join(self.dir_path, partition['file']))
+            if sha256 != partition['sha256']:
+                raise PartitionChecksumMismatch(
+                    f'Partition {value} ({partition["file"]}) checksum {sha256} != {partition["sha256"]}'
+                )
+
+    def _select(self, partitions: Optional[Iterable[Any]]) -> List[Any]:
+        if partitions is None:
+            return self.partitions
+        partitions = list(partitions)
+        unknown = [value for value in partitions if value not in self._partitions]
+        if unknown:
+            raise KeyError(f'Unknown partitions of {self.dir_path}: {unknown}')
+        return partitions
+
+    def iter_rows(self, partitions: Optional[Iterable[Any]] = None, verify: bool = False) -> Iterator[dict]:
+        """
+        Streams rows of the requested partitions (all by default).
+
+        :param partitions: `partition_by` values, e.g. ['us-east1', 'europe-west4']
+        :param verify: check partitions checksums before reading
+        """
+        selected = self._select(partitions)
+        if verify:
+            self.verify(selected)
+        for value in selected:
+            yield from iter_yaml_dump_rows(os.path.join(self.dir_path, self._partitions[value]['file']))
+
+
+def iter_partitioned_dump_rows(dir_path: str) -> Iterator[dict]:
+    return PartitionedDump(dir_path).iter_rows()
+
+
+__all__ = [
+    'PARTITION_KEYS',
+    'PartitionedDump',
+    'iter_partitioned_dump_rows',
+    'write_partitioned_dump'
+]
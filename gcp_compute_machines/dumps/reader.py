@@ -0,0 +1,166 @@
+import functools
+import os
+from typing import Any, Callable, Dict, Iterator, Optional
+
+import yaml
+from yaml.constructor import SafeConstructor
+from yaml.events import (
+    AliasEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent
+)
+from yaml.resolver import Resolver
+
+from gcp_compute_machines.dumps.binary import BINARY_SNAPSHOT_EXTENSION, BinarySnapshot, iter_binary_snapshot_rows
+
+Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# manifest of a partitioned dump directory, see `gcp_compute_machines.dumps.partitioned`
+MANIFEST_FILE = 'manifest.yaml'
+
+_resolver = Resolver()
+_constructor = SafeConstructor()
+
+
+@functools.lru_cache(maxsize=65536)
+def _construct_scalar(tag: Optional[str], value: str, plain: bool) -> Any:
+    if tag is None or tag == '!':
+        tag = _resolver.resolve(yaml.ScalarNode, value, (plain, not plain))
+    node = yaml.ScalarNode(tag, value)
+    return SafeConstructor.yaml_constructors[tag](_constructor, node)
+
+
+def _scalar(event: ScalarEvent) -> Any:
+    return _construct_scalar(event.tag, event.value, event.implicit[0])
+
+
+def _build(event, events: Iterator) -> Any:
+    """
+    Builds python object from the events of one YAML node.
+    """
+    if isinstance(event, ScalarEvent):
+        return _scalar(event)
+    if isinstance(event, SequenceStartEvent):
+        result = []
+        for item in events:
+            if isinstance(item, SequenceEndEvent):
+                return result
+            result.append(_build(item, events))
+    if isinstance(event, MappingStartEvent):
+        result = {}
+        for key in events:
+            if isinstance(key, MappingEndEvent):
+                return result
+            result[_build(key, events)] = _build(next(events), events)
+    if isinstance(event, AliasEvent):
+        raise ValueError('YAML aliases are not supported in pricing dumps')
+    raise ValueError(f'Unexpected YAML event: {event}')
+
+
+def _skip(event, events: Iterator):
+    depth = 0
+    while True:
+        if isinstance(event, (SequenceStartEvent, MappingStartEvent)):
+            depth += 1
+        elif isinstance(event, (SequenceEndEvent, MappingEndEvent)):
+            depth -= 1
+        if depth == 0:
+            return
+        event = next(events)
+
+
+def _iter_yaml_sections(file_path: str, sections: Dict[str, Callable[[Any, Iterator], None]]):
+    """
+    Walks top level keys of a YAML dump and hands over the events of the requested sections.
+    """
+    with open(file_path, 'r') as file:
+        events = iter(yaml.parse(file, Loader=Loader))
+        for event in events:
+            if isinstance(event, MappingStartEvent):
+                break
+        for key_event in events:
+            if isinstance(key_event, MappingEndEvent):
+                return
+            key = _scalar(key_event)
+            value_event = next(events)
+            handler = sections.get(key)
+            if handler is None:
+                _skip(value_event, events)
+            else:
+                yield from handler(value_event, events)
+
+
+def iter_yaml_dump_rows(file_path: str) -> Iterator[dict]:
+    """
+    Streams rows of the `machines` section of a YAML pricing dump one by one.
+
+    The file is parsed event by event, so only one row is kept in memory at once.
+    """
+
+    def _rows(event, events: Iterator):
+        if not isinstance(event, SequenceStartEvent):
+            _skip(event, events)
+            return
+        for item in events:
+            if isinstance(item, SequenceEndEvent):
+                return
+            yield _build(item, events)
+
+    yield from _iter_yaml_sections(file_path, {'machines': _rows})
+
+
+def read_yaml_dump_section(file_path: str, section: str) -> Any:
+    """
+    Reads one top level section of a YAML pricing dump (e.g. `metadata`) skipping the others.
+    For a partitioned dump directory the section is read from its manifest.
+    Binary snapshots keep only `metadata` and `zones` sections.
+    """
+    if os.path.isdir(file_path):
+        file_path = os.path.join(file_path, MANIFEST_FILE)
+    elif file_path.lower().endswith(BINARY_SNAPSHOT_EXTENSION):
+        with BinarySnapshot(file_path) as snapshot:
+            return snapshot.metadata if section == 'metadata' else snapshot.zones if section == 'zones' else None
+
+    def _section(event, events: Iterator):
+        yield _build(event, events)
+
+    for value in _iter_yaml_sections(file_path, {section: _section}):
+        return value
+    return None
+
+
+DUMP_ROWS_READERS: Dict[str, Callable[[str], Iterator[dict]]] = {
+    '.yaml': iter_yaml_dump_rows,
+    '.yml': iter_yaml_dump_rows,
+    BINARY_SNAPSHOT_EXTENSION: iter_binary_snapshot_rows,
+}
+
+
+def iter_dump_rows(file_path: str) -> Iterator[dict]:
+    """
+    Streams machine rows (as dicts with model field names) from a pricing dump in any supported format.
+    The format is detected by the file extension, see `DUMP_ROWS_READERS`.
+    Directories are read as partitioned dumps.
+    """
+    if os.path.isdir(file_path):
+        from gcp_compute_machines.dumps.partitioned import iter_partitioned_dump_rows
+        return iter_partitioned_dump_rows(file_path)
+    extension = os.path.splitext(file_path)[1].lower()
+    reader = DUMP_ROWS_READERS.get(extension)
+    if reader is None:
+        raise ValueError(
+            f'Unsupported dump format: {file_path}. Supported extensions: {sorted(DUMP_ROWS_READERS)}'
+        )
+    return reader(file_path)
+
+
+__all__ = [
+    'DUMP_ROWS_READERS',
+    'MANIFEST_FILE',
+    'iter_dump_rows',
+    'iter_yaml_dump_rows',
+    'read_yaml_dump_section'
+]
@@ -4,7 +4,15 @@ class ZeroSKURegexMatch(Exception):
 class MultipleSKURegexMatch(Exception):
     pass
 
+class RequestBudgetExceeded(Exception):
+    pass
+
+class PartitionChecksumMismatch(Exception):
+    pass
+
 __all__ = [
     'ZeroSKURegexMatch',
-    'MultipleSKURegexMatch'
+    'MultipleSKURegexMatch',
+    'RequestBudgetExceeded',
+    'PartitionChecksumMismatch'
 ]
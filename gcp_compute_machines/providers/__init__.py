@@ -1,3 +1,22 @@
-from gcp_compute_machines.providers.base.base_machines_provider import GCPMachinesProvider
-from .gcloud_compute import *
-from gcp_compute_machines.providers.scraper import GCPMachinesScraper, ScrapedMachineInfoModel
+from gcp_compute_machines._lazy import lazy_exports
+
+# gcloud-compute provider imports httpx and the scraper imports the GCP SDK, so both are imported on the first access.
+# Provider models (e.g. `gcp_compute_machines.providers.scraper.models`) can be imported without them.
+_LAZY_IMPORTS = {
+    'GCPMachinesProvider': 'gcp_compute_machines.providers.base',
+    'SnapshotRefresher': 'gcp_compute_machines.providers.base',
+    'PricingSnapshot': 'gcp_compute_machines.providers.base',
+    'GCloudComputeMachinesProvider': 'gcp_compute_machines.providers.gcloud_compute',
+    'GCPMachinesScraper': 'gcp_compute_machines.providers.scraper',
+    'ScrapedMachineInfoModel': 'gcp_compute_machines.providers.scraper',
+    'UnitRatesTable': 'gcp_compute_machines.providers.scraper',
+    'CombinationPricer': 'gcp_compute_machines.providers.scraper',
+    'ScrapeScope': 'gcp_compute_machines.providers.scraper',
+    'RunCheckpoints': 'gcp_compute_machines.providers.scraper',
+    'CurrencyRates': 'gcp_compute_machines.providers.scraper',
+    'SKUPins': 'gcp_compute_machines.providers.scraper',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS)
+
+__all__ = list(_LAZY_IMPORTS)
@@ -1,5 +1,8 @@
 from .base_machines_provider import GCPMachinesProvider
+from .refresher import PricingSnapshot, SnapshotRefresher
 
 __all__ = [
-    'GCPMachinesProvider'
+    'GCPMachinesProvider',
+    'PricingSnapshot',
+    'SnapshotRefresher'
 ]
@@ -1,4 +1,7 @@
+import asyncio
 from abc import abstractmethod
+from typing import AsyncIterator, Optional, Sequence
+
 from gcp_compute_machines.providers.base.models.base_machine_info_model import GCPMachineType
 
 
@@ -18,6 +21,62 @@ class GCPMachinesProvider:
     def dump_pricing_info(self, *args, **kwargs):
         pass
 
+    @abstractmethod
+    def _loaded_machines(self) -> list[GCPMachineType]:
+        """
+        :return: machines of the last fetch
+        """
+        pass
+
+    def to_dataframe(self, columns: Optional[Sequence[str]] = None, price_dtype: str = 'float64'):
+        """
+        Machines of the last fetch as a pandas DataFrame, built column by column.
+        name, series, family, region and cpu_platforms are categorical.
+
+        :param price_dtype: `float64` or `float32` for the price columns
+        """
+        # pandas is imported on the first call only
+        from gcp_compute_machines.tools.frames import machines_to_dataframe
+
+        return machines_to_dataframe(self._loaded_machines(), columns=columns, price_dtype=price_dtype)
+
+    def to_arrow(self, columns: Optional[Sequence[str]] = None, price_dtype: str = 'float64'):
+        """
+        Machines of the last fetch as a `pyarrow.Table` (requires pyarrow), categorical columns are dictionary encoded.
+        """
+        from gcp_compute_machines.tools.frames import dataframe_to_arrow
+
+        return dataframe_to_arrow(self.to_dataframe(columns=columns, price_dtype=price_dtype))
+
+    def fleet_optimizer(self, usage_type: str = 'ondemand'):
+        """
+        `FleetOptimizer` over machines of the last fetch, packs workloads into the cheapest machines of a usage type.
+        """
+        from gcp_compute_machines.tools.fleet_optimizer import FleetOptimizer
+
+        return FleetOptimizer(self._loaded_machines(), usage_type=usage_type)
+
+    async def afetch_gcp_machines(self, *args, **kwargs) -> list[GCPMachineType]:
+        """
+        Async version of `fetch_gcp_machines`.
+
+        Default implementation runs `fetch_gcp_machines` in a worker thread.
+        """
+        return await asyncio.to_thread(self.fetch_gcp_machines, *args, **kwargs)
+
+    async def aiter_gcp_machines(self, *args, **kwargs) -> AsyncIterator[GCPMachineType]:
+        """
+        Async iteration over GCP machines data.
+        """
+        for machine in await self.afetch_gcp_machines(*args, **kwargs):
+            yield machine
+
+    async def adump_pricing_info(self, *args, **kwargs):
+        """
+        Async version of `dump_pricing_info`. Serialization and file writing run in a worker thread.
+        """
+        await asyncio.to_thread(self.dump_pricing_info, *args, **kwargs)
+
 
 __all__ = [
     'GCPMachinesProvider'
@@ -0,0 +1,183 @@
+import threading
+import time
+from types import MappingProxyType
+from typing import Callable, Iterable, Mapping, Optional, Tuple
+
+import loguru
+
+from gcp_compute_machines.providers.base.base_machines_provider import GCPMachinesProvider
+from gcp_compute_machines.providers.base.models.base_machine_info_model import GCPMachineType
+
+
+class PricingSnapshot:
+    """
+    Immutable set of machines of one refresh.
+
+    Machines are kept in a tuple together with a read-only (name, region) index. A snapshot is never
+    changed after it's published, so readers can keep using it while the next one is being built.
+    Machine models themselves are shared with the provider and must not be modified.
+    """
+
+    __slots__ = ('machines', 'version', 'created_at', '_index')
+
+    def __init__(self, machines: Iterable[GCPMachineType], version: int = 0, created_at: Optional[float] = None):
+        machines = tuple(machines)
+        object.__setattr__(self, 'machines', machines)
+        object.__setattr__(self, 'version', version)
+        object.__setattr__(self, 'created_at', time.time() if created_at is None else created_at)
+        object.__setattr__(self, '_index', MappingProxyType({(x.name, x.region): x for x in machines}))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f'{type(self).__name__} is immutable')
+
+    def __len__(self) -> int:
+        return len(self.machines)
+
+    def __iter__(self):
+        return iter(self.machines)
+
+    @property
+    def index(self) -> Mapping[Tuple[str, Optional[str]], GCPMachineType]:
+        """
+        (machine name, region) -> machine
+        """
+        return self._index
+
+    def get(self, name: str, region: Optional[str]) -> Optional[GCPMachineType]:
+        return self._index.get((name, region))
+
+
+class SnapshotRefresher:
+    """
+    Refreshes machines data in a background thread and publishes every result as a new `PricingSnapshot`.
+
+    Publishing is a single reference assignment, so readers just take `refresher.snapshot` without locks
+    and always see a complete snapshot: the previous one until the new one is fully built.
+    A failed refresh is logged and the last good snapshot stays published.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[], Iterable[GCPMachineType]],
+        interval: float,
+        retry_interval: Optional[float] = None,
+        logger=None,
+    ):
+        """
+        :param fetch: builds machines data, e.g. `lambda: provider.fetch_gcp_machines(dump=False, load=False)`.
+            It's called from the refresher thread only, the provider must not be used by readers.
+        :param interval: seconds between successful refreshes
+        :param retry_interval: seconds before the next attempt after a failure, `interval` by default
+        """
+        self.fetch = fetch
+        self.interval = interval
+        self.retry_interval = interval if retry_interval is None else retry_interval
+        self.logger = loguru.logger if logger is None else logger
+
+        self._snapshot: Optional[PricingSnapshot] = None
+        self._version = 0
+        self.failures = 0
+        self.last_error: Optional[BaseException] = None
+
+        # only refreshes are serialized, readers never take it
+        self._refresh_lock = threading.Lock()
+        self._published = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @classmethod
+    def for_provider(
+        cls,
+        provider: GCPMachinesProvider,
+        interval: float,
+        *args,
+        retry_interval: Optional[float] = None,
+        **kwargs
+    ) -> 'SnapshotRefresher':
+        """
+        :param args: `provider.fetch_gcp_machines` arguments, e.g. dump=False, load=False for the scraper
+        """
+        return cls(
+            lambda: provider.fetch_gcp_machines(*args, **kwargs),
+            interval,
+            retry_interval=retry_interval,
+            logger=getattr(provider, 'logger', None)
+        )
+
+    @property
+    def snapshot(self) -> Optional[PricingSnapshot]:
+        """
+        The last published snapshot, None until the first successful refresh.
+        """
+        return self._snapshot
+
+    @property
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def refresh(self) -> bool:
+        """
+        Builds and publishes a new snapshot in the calling thread.
+
+        :return: True if a new snapshot is published
+        """
+        with self._refresh_lock:
+            self.logger.info('[Refresh] Started')
+            try:
+                snapshot = PricingSnapshot(self.fetch(), version=self._version + 1)
+            except Exception as e:
+                self.failures += 1
+                self.last_error = e
+                self.logger.error(f'[Refresh] Failed, keeping snapshot {self._version}: {e!r}')
+                return False
+            self._version = snapshot.version
+            self._snapshot = snapshot
+            self._published.set()
+            self.logger.info(f'[Refresh] Published snapshot {snapshot.version} with {len(snapshot)} machines')
+            return True
+
+    def _run(self):
+        delay = 0.0
+        while not self._stop.wait(delay):
+            delay = self.interval if self.refresh() else self.retry_interval
+
+    def start(self) -> 'SnapshotRefresher':
+        """
+        Starts the daemon thread. The first refresh starts immediately.
+        """
+        if self.is_running:
+            return self
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='gcp-machines-refresher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None):
+        """
+        Stops the thread. A running refresh is finished (and published) first.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wait_for_snapshot(self, timeout: Optional[float] = None) -> Optional[PricingSnapshot]:
+        """
+        Blocks until the first snapshot is published.
+
+        :return: the current snapshot, None on timeout
+        """
+        self._published.wait(timeout)
+        return self._snapshot
+
+    def __enter__(self) -> 'SnapshotRefresher':
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+__all__ = [
+    'PricingSnapshot',
+    'SnapshotRefresher'
+]
@@ -1,8 +1,16 @@
 from gcp_compute_machines.providers.base.base_machines_provider import GCPMachinesProvider
 from gcp_compute_machines.providers.gcloud_compute.models import GcloudComputeMachineInfoModel
+from gcp_compute_machines.tools.zone_index import ZoneAvailabilityIndex
+from gcp_compute_machines.tools.ranking import MachineRankingIndex
+from gcp_compute_machines.tools.region_index import RegionSpatialIndex
+from gcp_compute_machines.dumps.partitioned import write_partitioned_dump
+from gcp_compute_machines.dumps.binary import BINARY_SNAPSHOT_EXTENSION, write_binary_snapshot
 from datetime import datetime
+from typing import AsyncIterator, Iterable, Iterator, Optional
+import asyncio
 import yaml
 import csv
+import httpx
 import requests
 import loguru
 import sys
@@ -15,30 +23,61 @@ class GCloudComputeMachinesProvider(GCPMachinesProvider):
     Link to original repository: https://github.com/Cyclenerd/google-cloud-compute-machine-types
     """
 
+    DATA_URL = "https://gcloud-compute.com/machine-types-regions.csv"
+
     def __init__(
         self,
         logger = None,
         log_level: str = 'DEBUG',  # used only if logger is None
+        url: Optional[str] = None,
     ):
+        """
+        :param url: CSV data location, `DATA_URL` by default
+        """
         if logger is None:
             self.logger = loguru.logger
             self.logger.remove()
             self.logger.add(sys.stdout, level=log_level)
         else:
             self.logger = logger
-        self.__url = "https://gcloud-compute.com/machine-types-regions.csv"
+        self.__url = self.DATA_URL if url is None else url
         self.__data: list[GcloudComputeMachineInfoModel] = []
+        self.__zone_availability = ZoneAvailabilityIndex({})
+        self.__rankings = MachineRankingIndex([])
+        self.__region_index = RegionSpatialIndex([])
 
-    def fetch_gcp_machines(self) -> list[GcloudComputeMachineInfoModel]:
-        self.logger.info(f"Loading data from {self.__url}")
-        # Download the CSV data
-        response = requests.get(self.__url)
-        self.logger.debug(f'Got {response.status_code} for GET: {self.__url}')
-        response.raise_for_status()
-        # Decode bytes to string (assuming UTF-8 encoding)
-        csv_data = response.text
+    @property
+    def zone_availability(self) -> ZoneAvailabilityIndex:
+        return self.__zone_availability
+
+    @property
+    def rankings(self) -> MachineRankingIndex:
+        """
+        CoreMark per dollar and low-carbon price rankings, built once per load.
+        """
+        return self.__rankings
+
+    @property
+    def region_index(self) -> RegionSpatialIndex:
+        """
+        Spatial index of regions (`region_lat` / `region_lng`) linked to machine prices.
+        """
+        return self.__region_index
+
+    def _loaded_machines(self) -> list[GcloudComputeMachineInfoModel]:
+        return self.__data
+
+    def _set_data(self, result: list[GcloudComputeMachineInfoModel]):
+        self.__data = result[:]
+        self.__zone_availability = ZoneAvailabilityIndex.from_gcloud_compute_machines(self.__data)
+        self.__rankings = MachineRankingIndex(self.__data)
+        self.__region_index = RegionSpatialIndex(self.__data)
+        self.logger.info(f"Loaded {len(self.__data)} GCP machines from {self.__url}")
+
+    @staticmethod
+    def _parse_csv(csv_lines: Iterable[str]) -> list[GcloudComputeMachineInfoModel]:
         # Parse CSV rows
-        reader = csv.reader(csv_data.splitlines())
+        reader = csv.reader(csv_lines)
         # Skip header
         header = next(reader)
         # Instantiate model for each row
@@ -49,19 +88,115 @@ class GCloudComputeMachinesProvider(GCPMachinesProvider):
             # Create Pydantic model instance
             item = GcloudComputeMachineInfoModel(**data)
             result.append(item)
-        self.__data = result[:]
-        self.logger.info(f"Loaded {len(self.__data)} GCP machines from {self.__url}")
         return result
 
-    def dump_pricing_info(self, file_path: str):
+    def fetch_gcp_machines(self) -> list[GcloudComputeMachineInfoModel]:
+        self.logger.info(f"Loading data from {self.__url}")
+        # Download the CSV data
+        response = requests.get(self.__url)
+        self.logger.debug(f'Got {response.status_code} for GET: {self.__url}')
+        response.raise_for_status()
+        # Decode bytes to string (assuming UTF-8 encoding)
+        result = self._parse_csv(response.text.splitlines(keepends=True))
+        self._set_data(result)
+        return result
+
+    def iter_gcp_machines(self) -> Iterator[GcloudComputeMachineInfoModel]:
+        """
+        Streams the CSV and yields machines one by one without keeping them in memory.
+        """
+        self.logger.info(f"Streaming data from {self.__url}")
+        with requests.get(self.__url, stream=True) as response:
+            self.logger.debug(f'Got {response.status_code} for GET: {self.__url}')
+            response.raise_for_status()
+            # line breaks are restored, so quoted fields spanning several lines keep them
+            reader = csv.reader(f'{line}\n' for line in response.iter_lines(decode_unicode=True))
+            header = next(reader)
+            for row in reader:
+                yield GcloudComputeMachineInfoModel(**dict(zip(header, row)))
+
+    async def afetch_gcp_machines(self) -> list[GcloudComputeMachineInfoModel]:
+        self.logger.info(f"Loading data from {self.__url}")
+        async with httpx.AsyncClient() as client:
+            response = await client.get(self.__url)
+        self.logger.debug(f'Got {response.status_code} for GET: {self.__url}')
+        response.raise_for_status()
+        # models validation is CPU bound
+        result = await asyncio.to_thread(self._parse_csv, response.text.splitlines(keepends=True))
+        self._set_data(result)
+        return result
+
+    async def aiter_gcp_machines(self) -> AsyncIterator[GcloudComputeMachineInfoModel]:
+        """
+        Streams the CSV and yields machines as soon as their rows are downloaded.
+        """
+        self.logger.info(f"Loading data from {self.__url}")
+        result = []
+        async with httpx.AsyncClient() as client:
+            async with client.stream('GET', self.__url) as response:
+                self.logger.debug(f'Got {response.status_code} for GET: {self.__url}')
+                response.raise_for_status()
+                header = None
+                record_lines, quotes = [], 0
+                async for line in response.aiter_lines():
+                    if not line and not record_lines:
+                        continue
+                    # a quoted field with line breaks spans several lines: the record is complete
+                    # once its quotes are balanced (escaped quotes are doubled)
+                    record_lines.append(line)
+                    quotes += line.count('"')
+                    if quotes % 2:
+                        continue
+                    row = next(csv.reader(['\n'.join(record_lines)]))
+                    record_lines, quotes = [], 0
+                    if header is None:
+                        header = row
+                        continue
+                    item = GcloudComputeMachineInfoModel(**dict(zip(header, row)))
+                    result.append(item)
+                    yield item
+        self._set_data(result)
+
+    def dump_pricing_info(
+        self,
+        file_path: str,
+        partition_by: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False
+    ):
+        """
+        :param partition_by: `region`, `family` or `series`. If set, `file_path` is a directory
+            with one dump per partition and a manifest, see `write_partitioned_dump`.
+            A `.gcpm` file path is written as a memory-mappable binary snapshot, see `write_binary_snapshot`.
+        """
         metadata = {
             'last_time_updated': int(datetime.now().timestamp()),
             "origin": self.__url
         }
+        if partition_by is None and file_path.lower().endswith(BINARY_SNAPSHOT_EXTENSION):
+            write_binary_snapshot(
+                file_path,
+                [x.model_dump() for x in self.__data],
+                metadata=metadata,
+                zones=self.__zone_availability.to_dict()
+            )
+            return
+        if partition_by is not None:
+            write_partitioned_dump(
+                file_path,
+                [x.model_dump() for x in self.__data],
+                partition_by=partition_by,
+                metadata=metadata,
+                zones=self.__zone_availability.to_dict(),
+                max_workers=max_workers,
+                use_processes=use_processes
+            )
+            return
         with open(file_path, 'w') as file:
             yaml.dump({
                 'metadata': metadata,
-                'machines': [x.model_dump() for x in self.__data]
+                'machines': [x.model_dump() for x in self.__data],
+                'zones': self.__zone_availability.to_dict()
             }, file)
 
 
@@ -1,2 +1,18 @@
-from .scraped_machines_provider import GCPMachinesScraper
-from .models import ScrapedMachineInfoModel
+from gcp_compute_machines._lazy import lazy_exports
+
+# the scraper imports the GCP SDK, models and unit rates don't
+_LAZY_IMPORTS = {
+    'GCPMachinesScraper': 'gcp_compute_machines.providers.scraper.scraped_machines_provider',
+    'ScrapedMachineInfoModel': 'gcp_compute_machines.providers.scraper.models',
+    'UnitRatesTable': 'gcp_compute_machines.providers.scraper.unit_rates',
+    'CombinationPricer': 'gcp_compute_machines.providers.scraper.combination_pricer',
+    'MachineConfiguration': 'gcp_compute_machines.providers.scraper.combination_pricer',
+    'ScrapeScope': 'gcp_compute_machines.providers.scraper.scope',
+    'RunCheckpoints': 'gcp_compute_machines.providers.scraper.checkpoints',
+    'CurrencyRates': 'gcp_compute_machines.providers.scraper.currency',
+    'SKUPins': 'gcp_compute_machines.providers.scraper.sku_pins',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS)
+
+__all__ = list(_LAZY_IMPORTS)
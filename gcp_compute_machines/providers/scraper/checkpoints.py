@@ -0,0 +1,137 @@
+import os
+import shutil
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+import yaml
+
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_Dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+MANIFEST = 'manifest.yaml'
+
+
+def new_run_id() -> str:
+    return f'{datetime.now():%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:6]}'
+
+
+def _write_yaml(file_path: str, data: Any):
+    os.makedirs(os.path.dirname(file_path), exist_ok=True)
+    tmp_path = f'{file_path}.tmp'
+    with open(tmp_path, 'w') as file:
+        # keys order is kept: it's the order of the scraped rows
+        yaml.dump(data, file, Dumper=_Dumper, sort_keys=False)
+    os.replace(tmp_path, file_path)
+
+
+def _read_yaml(file_path: str) -> Any:
+    with open(file_path, 'r') as file:
+        return yaml.load(file, Loader=_Loader)
+
+
+class RunCheckpoints:
+    """
+    Stage outputs of one scraper run, kept in `<checkpoint_dir>/<run_id>/`.
+
+    Every checkpoint is written into a temporary file and renamed, so a crash leaves either the previous state
+    or the complete new one. Paged listings are saved page by page together with the next page token.
+    """
+
+    def __init__(self, checkpoint_dir: str, run_id: Optional[str] = None, params: Optional[dict] = None):
+        """
+        :param run_id: id of the run to resume, a new run is started if None
+        :param params: run parameters which must not change on resume (e.g. the run scope)
+        """
+        self.run_id = new_run_id() if run_id is None else run_id
+        self.path = os.path.join(checkpoint_dir, self.run_id)
+        self.params = params or {}
+
+        manifest_path = os.path.join(self.path, MANIFEST)
+        self.resumed = os.path.exists(manifest_path)
+        if self.resumed:
+            self.manifest = _read_yaml(manifest_path)
+            if self.manifest['params'] != self.params:
+                raise ValueError(
+                    f'Run {self.run_id} was started with {self.manifest["params"]}, it can not be resumed with {self.params}'
+                )
+        else:
+            self.manifest = {
+                'run_id': self.run_id,
+                'created_at': int(datetime.now().timestamp()),
+                'completed': False,
+                'params': self.params,
+            }
+            _write_yaml(manifest_path, self.manifest)
+
+    @property
+    def completed(self) -> bool:
+        return self.manifest['completed']
+
+    def _file(self, name: str) -> str:
+        return os.path.join(self.path, f'{name}.yaml')
+
+    def has(self, name: str) -> bool:
+        return os.path.exists(self._file(name))
+
+    def load(self, name: str) -> Any:
+        return _read_yaml(self._file(name))
+
+    def save(self, name: str, data: Any):
+        _write_yaml(self._file(name), data)
+
+    def save_page(self, stream: str, page: Any, next_page_token: str):
+        """
+        Saves the next page of a paged listing. `next_page_token` is empty after the last page.
+        """
+        progress = self.page_progress(stream)
+        pages = 0 if progress is None else progress['pages']
+        self.save(f'{stream}/{pages:05d}', page)
+        self.save(f'{stream}/progress', {'pages': pages + 1, 'next_page_token': next_page_token})
+
+    def page_progress(self, stream: str) -> Optional[dict]:
+        """
+        :return: {pages: saved pages count, next_page_token: ...} or None if no pages are saved
+        """
+        if not self.has(f'{stream}/progress'):
+            return None
+        return self.load(f'{stream}/progress')
+
+    def load_pages(self, stream: str) -> Tuple[List[Any], Optional[str]]:
+        """
+        :return: saved pages and the token to continue listing from: None if listing isn't started,
+            empty string if it's complete
+        """
+        progress = self.page_progress(stream)
+        if progress is None:
+            return [], None
+        return [self.load(f'{stream}/{i:05d}') for i in range(progress['pages'])], progress['next_page_token']
+
+    def complete(self):
+        self.manifest['completed'] = True
+        _write_yaml(os.path.join(self.path, MANIFEST), self.manifest)
+
+    def remove(self):
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    @staticmethod
+    def latest_run_id(checkpoint_dir: str, include_completed: bool = False) -> Optional[str]:
+        """
+        :return: id of the most recently started (by default not completed) run in `checkpoint_dir`
+        """
+        if not os.path.isdir(checkpoint_dir):
+            return None
+        manifests = []
+        for run_id in os.listdir(checkpoint_dir):
+            manifest_path = os.path.join(checkpoint_dir, run_id, MANIFEST)
+            if os.path.exists(manifest_path):
+                manifest = _read_yaml(manifest_path)
+                if include_completed or not manifest['completed']:
+                    manifests.append((manifest['created_at'], run_id))
+        return max(manifests)[1] if manifests else None
+
+
+__all__ = [
+    'RunCheckpoints',
+    'new_run_id'
+]
@@ -0,0 +1,305 @@
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Callable, Iterator, List, Optional, Tuple
+
+import grpc
+from google.api_core import exceptions as core_exceptions
+from google.api_core.retry import AsyncRetry, Retry, if_transient_error
+from google.auth.credentials import Credentials
+from google.cloud import billing_v1, compute_v1
+from google.cloud.billing_v1.services.cloud_catalog.transports import (
+    CloudCatalogGrpcAsyncIOTransport,
+    CloudCatalogGrpcTransport
+)
+from google.cloud.compute_v1.services.machine_types.transports import MachineTypesRestTransport
+from google.cloud.compute_v1.services.regions.transports import RegionsRestTransport
+from google.cloud.compute_v1.services.zones.transports import ZonesRestTransport
+
+from gcp_compute_machines.exceptions import RequestBudgetExceeded
+
+DEFAULT_COMPUTE_ENDPOINT = 'compute.googleapis.com'
+DEFAULT_BILLING_ENDPOINT = 'cloudbilling.googleapis.com'
+
+
+def is_retryable_error(exc: Exception) -> bool:
+    return if_transient_error(exc) or isinstance(exc, core_exceptions.DeadlineExceeded)
+
+
+class GCPClientPool:
+    """
+    Shared GCP API clients for one scraper.
+
+    * Compute Engine clients (regions, zones, machine types) share credentials, so an access token is refreshed
+      once for all of them. REST transports don't accept a session, every client keeps its own connection pool.
+    * Cloud Billing catalog client is created once and reuses one gRPC channel.
+    * Every page is requested separately with an exponential-backoff retry, so a transient error
+      repeats only the failed page instead of the whole listing.
+    * `request_budget` limits the number of API requests (retries included) per run,
+      see `reset_request_budget`.
+    * Async API: the catalog is paged with `CloudCatalogAsyncClient`. Compute Engine has no async client,
+      so compute listings run in worker threads.
+
+    `compute_endpoint`/`billing_endpoint` with `insecure=True` point the pool to a local fake server
+    (see `gcp_compute_machines.testing.fake_gcp_server`).
+    """
+
+    def __init__(
+        self,
+        credentials: Credentials,
+        page_size: Optional[int] = None,
+        request_budget: Optional[int] = None,
+        retry_initial: float = 1.0,
+        retry_maximum: float = 30.0,
+        retry_multiplier: float = 2.0,
+        retry_timeout: float = 300.0,
+        timeout: Optional[float] = 60.0,
+        compute_endpoint: str = DEFAULT_COMPUTE_ENDPOINT,
+        billing_endpoint: str = DEFAULT_BILLING_ENDPOINT,
+        insecure: bool = False,
+        logger: Optional[Any] = None,
+    ):
+        self.credentials = credentials
+        self.page_size = page_size
+        self.request_budget = request_budget
+        self.requests_made = 0
+        self._requests_lock = threading.Lock()
+        self.timeout = timeout
+        self.logger = logger
+        retry_settings = dict(
+            predicate=is_retryable_error,
+            initial=retry_initial,
+            maximum=retry_maximum,
+            multiplier=retry_multiplier,
+            timeout=retry_timeout,
+            on_error=self._on_retryable_error,
+        )
+        self.retry = Retry(**retry_settings)
+        self.async_retry = AsyncRetry(**retry_settings)
+        self._billing_endpoint = billing_endpoint
+        self._insecure = insecure
+
+        url_scheme = 'http' if insecure else 'https'
+        regions_transport = RegionsRestTransport(
+            host=compute_endpoint, credentials=credentials, url_scheme=url_scheme
+        )
+        zones_transport = ZonesRestTransport(
+            host=compute_endpoint, credentials=credentials, url_scheme=url_scheme
+        )
+        machine_types_transport = MachineTypesRestTransport(
+            host=compute_endpoint, credentials=credentials, url_scheme=url_scheme
+        )
+        self.regions_client = compute_v1.RegionsClient(transport=regions_transport)
+        self.zones_client = compute_v1.ZonesClient(transport=zones_transport)
+        self.machines_client = compute_v1.MachineTypesClient(transport=machine_types_transport)
+
+        if insecure:
+            self.channel = grpc.insecure_channel(billing_endpoint)
+        else:
+            self.channel = CloudCatalogGrpcTransport.create_channel(billing_endpoint, credentials=credentials)
+        self.catalog_client = billing_v1.CloudCatalogClient(
+            transport=CloudCatalogGrpcTransport(host=billing_endpoint, channel=self.channel)
+        )
+        # grpc.aio channels are bound to an event loop, so the async client is created on first use in a loop
+        self._async_catalog_client: Optional[billing_v1.CloudCatalogAsyncClient] = None
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def reset_request_budget(self):
+        self.requests_made = 0
+
+    def _spend_request(self):
+        with self._requests_lock:
+            if self.request_budget is not None and self.requests_made >= self.request_budget:
+                raise RequestBudgetExceeded(
+                    f'Request budget of {self.request_budget} API requests per run is exhausted'
+                )
+            self.requests_made += 1
+
+    def _on_retryable_error(self, exc: Exception):
+        if self.logger is not None:
+            self.logger.warning(f'[GCPClientPool] Retrying after transient error: {exc}')
+        # every retry is another API request
+        self._spend_request()
+
+    def iter_pages(
+        self,
+        method: Callable,
+        request: Any,
+        items_field: str,
+        page_size_field: str = 'page_size',
+        page_token: Optional[str] = None,
+    ) -> Iterator[Tuple[List[Any], str]]:
+        """
+        Requests pages one by one.
+
+        :param method: client list method, e.g. `catalog_client.list_skus`
+        :param request: list request. It's copied, the original request isn't changed.
+        :param items_field: response field with page items (`skus`, `items`)
+        :param page_size_field: request field with page size (`page_size`, `max_results`)
+        :param page_token: page token to resume listing from
+        :return: iterator over (page items, next page token). Empty token means the last page.
+        """
+        request = type(request)(request)
+        if self.page_size:
+            setattr(request, page_size_field, self.page_size)
+        if page_token:
+            request.page_token = page_token
+        while True:
+            self._spend_request()
+            # pager fetches exactly one (the first) page on creation
+            page = method(request=request, retry=self.retry, timeout=self.timeout)
+            next_page_token = page.next_page_token
+            yield list(getattr(page, items_field)), next_page_token
+            if not next_page_token:
+                return
+            request.page_token = next_page_token
+
+    def paginate(
+        self,
+        method: Callable,
+        request: Any,
+        items_field: str,
+        page_size_field: str = 'page_size',
+        page_token: Optional[str] = None,
+    ) -> Iterator[Any]:
+        for items, _ in self.iter_pages(method, request, items_field, page_size_field, page_token):
+            yield from items
+
+    def list_regions(self, project: str) -> Iterator[compute_v1.Region]:
+        return self.paginate(
+            self.regions_client.list,
+            compute_v1.ListRegionsRequest(project=project),
+            items_field='items',
+            page_size_field='max_results'
+        )
+
+    def list_zones(self, project: str) -> Iterator[compute_v1.Zone]:
+        return self.paginate(
+            self.zones_client.list,
+            compute_v1.ListZonesRequest(project=project),
+            items_field='items',
+            page_size_field='max_results'
+        )
+
+    def list_machine_types(self, project: str, zone: str) -> Iterator[compute_v1.MachineType]:
+        return self.paginate(
+            self.machines_client.list,
+            compute_v1.ListMachineTypesRequest(project=project, zone=zone),
+            items_field='items',
+            page_size_field='max_results'
+        )
+
+    def iter_sku_pages(
+        self,
+        service_name: str,
+        page_token: Optional[str] = None,
+    ) -> Iterator[Tuple[List[billing_v1.Sku], str]]:
+        request = billing_v1.ListSkusRequest(parent=service_name)
+        return self.iter_pages(
+            self.catalog_client.list_skus,
+            request,
+            items_field='skus',
+            page_token=page_token
+        )
+
+    def paginate_skus(self, service_name: str, page_token: Optional[str] = None) -> Iterator[billing_v1.Sku]:
+        for skus, _ in self.iter_sku_pages(service_name, page_token):
+            yield from skus
+
+    def get_currency_conversion_rate(self, service_name: str, currency_code: str) -> float:
+        """
+        Requests a single SKU in the currency and returns its conversion rate from USD.
+        The catalog uses the same rate for all SKUs of a request.
+        """
+        self._spend_request()
+        page = self.catalog_client.list_skus(
+            request=billing_v1.ListSkusRequest(parent=service_name, currency_code=currency_code, page_size=1),
+            retry=self.retry,
+            timeout=self.timeout
+        )
+        for sku in page.skus:
+            return sku.pricing_info[0].currency_conversion_rate
+        raise ValueError(f'{service_name} has no SKUs')
+
+    # region async API
+
+    @property
+    def async_catalog_client(self) -> billing_v1.CloudCatalogAsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._async_catalog_client is None or self._async_loop is not loop:
+            if self._insecure:
+                channel = grpc.aio.insecure_channel(self._billing_endpoint)
+            else:
+                channel = CloudCatalogGrpcAsyncIOTransport.create_channel(
+                    self._billing_endpoint, credentials=self.credentials
+                )
+            self._async_catalog_client = billing_v1.CloudCatalogAsyncClient(
+                transport=CloudCatalogGrpcAsyncIOTransport(host=self._billing_endpoint, channel=channel)
+            )
+            self._async_loop = loop
+        return self._async_catalog_client
+
+    async def aiter_pages(
+        self,
+        method: Callable,
+        request: Any,
+        items_field: str,
+        page_size_field: str = 'page_size',
+        page_token: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[List[Any], str]]:
+        """
+        Async version of `iter_pages` for async client methods.
+        """
+        request = type(request)(request)
+        if self.page_size:
+            setattr(request, page_size_field, self.page_size)
+        if page_token:
+            request.page_token = page_token
+        while True:
+            self._spend_request()
+            page = await method(request=request, retry=self.async_retry, timeout=self.timeout)
+            next_page_token = page.next_page_token
+            yield list(getattr(page, items_field)), next_page_token
+            if not next_page_token:
+                return
+            request.page_token = next_page_token
+
+    def aiter_sku_pages(
+        self,
+        service_name: str,
+        page_token: Optional[str] = None,
+    ) -> AsyncIterator[Tuple[List[billing_v1.Sku], str]]:
+        request = billing_v1.ListSkusRequest(parent=service_name)
+        return self.aiter_pages(
+            self.async_catalog_client.list_skus,
+            request,
+            items_field='skus',
+            page_token=page_token
+        )
+
+    async def apaginate_skus(self, service_name: str, page_token: Optional[str] = None) -> AsyncIterator[billing_v1.Sku]:
+        async for skus, _ in self.aiter_sku_pages(service_name, page_token):
+            for sku in skus:
+                yield sku
+
+    async def alist_regions(self, project: str) -> List[compute_v1.Region]:
+        return await asyncio.to_thread(lambda: list(self.list_regions(project)))
+
+    async def alist_zones(self, project: str) -> List[compute_v1.Zone]:
+        return await asyncio.to_thread(lambda: list(self.list_zones(project)))
+
+    async def alist_machine_types(self, project: str, zone: str) -> List[compute_v1.MachineType]:
+        return await asyncio.to_thread(lambda: list(self.list_machine_types(project, zone)))
+
+    # endregion
+
+    def close(self):
+        self.regions_client.transport.close()
+        self.zones_client.transport.close()
+        self.machines_client.transport.close()
+        self.channel.close()
+
+
+__all__ = [
+    'GCPClientPool',
+    'is_retryable_error'
+]
@@ -0,0 +1,251 @@
+import fnmatch
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from gcp_compute_machines.constants import *
+from gcp_compute_machines.providers.scraper.models import ScrapedMachineInfoModel
+from gcp_compute_machines.providers.scraper.unit_rates import UnitRatesTable, nice
+
+USAGE_TYPES: List[UsageType] = [OnDemandUsage, SpotUsage, CommitmentOneYearUsage, CommitmentThreeYearsUsage]
+
+LOCAL_SSD_PARTITION_GB = 375
+
+# machine family -> attachable GPU -> allowed GPU counts
+# https://cloud.google.com/compute/docs/gpus#n1-gpus
+ATTACHABLE_GPUS: Dict[str, Dict[str, Tuple[int, ...]]] = {
+    'n1': {
+        'NVIDIA_T4': (1, 2, 4),
+        'NVIDIA_V100': (1, 2, 4, 8),
+        'NVIDIA_P100': (1, 2, 4),
+        'NVIDIA_P4': (1, 2, 4),
+    },
+}
+
+# allowed numbers of 375 GB LocalSSD partitions for machines with optional LocalSSD
+# https://cloud.google.com/compute/docs/disks/local-ssd#choose_number_local_ssds
+LOCAL_SSD_PARTITIONS: Tuple[int, ...] = (0, 1, 2, 3, 4, 5, 6, 7, 8, 16, 24)
+
+
+class MachineConfiguration(NamedTuple):
+    machine_type: str
+    region: str
+    usage_type: str
+    gpu: Optional[str] = None
+    gpu_count: int = 0
+    local_ssd_partitions: int = 0
+
+
+class PricedConfiguration(NamedTuple):
+    configuration: MachineConfiguration
+    # hourly price
+    price: float
+
+
+class CombinationPricer:
+    """
+    Prices machine + attachable GPU + LocalSSD combinations on demand from resolved unit rates.
+
+    The scraper prices only the default GPU and LocalSSD of every machine type. Every other
+    combination is computed only when it's requested (or enumerated), base machine prices and
+    add-on prices are memoized per (machine type, region, usage type) and (add-on, region, usage type).
+    """
+
+    def __init__(
+        self,
+        unit_rates: UnitRatesTable,
+        machines: Dict[str, dict],
+        general_machines_info: Dict[str, ScrapedMachineInfoModel],
+        attachable_gpus: Optional[Dict[str, Dict[str, Sequence[int]]]] = None,
+        local_ssd_partitions: Sequence[int] = LOCAL_SSD_PARTITIONS,
+    ):
+        """
+        :param machines: `InstanceScraper.machines`, machine type -> {cpu, ram, regions}
+        :param general_machines_info: `InstanceScraper.general_machines_info`
+        :param attachable_gpus: machine family -> GPU -> allowed counts, `ATTACHABLE_GPUS` by default
+        :param local_ssd_partitions: allowed numbers of LocalSSD partitions
+        """
+        self.unit_rates = unit_rates
+        self.machines = machines
+        self.general_machines_info = general_machines_info
+        self.attachable_gpus = ATTACHABLE_GPUS if attachable_gpus is None else attachable_gpus
+        self.local_ssd_partitions = tuple(local_ssd_partitions)
+        # (machine type, region, usage type) -> price of the machine with its default GPU and LocalSSD
+        self._base_prices: Dict[Tuple[str, str, str], Optional[float]] = {}
+        # (gpu, region, usage type) -> GPU hourly rate
+        self._gpu_prices: Dict[Tuple[str, str, str], Optional[float]] = {}
+        # machine type -> allowed (gpu, count) pairs
+        self._gpu_options: Dict[str, List[Tuple[Optional[str], int]]] = {}
+
+    def __len__(self) -> int:
+        """
+        :return: number of memoized base prices
+        """
+        return len(self._base_prices)
+
+    def clear(self):
+        self._base_prices.clear()
+        self._gpu_prices.clear()
+        self._gpu_options.clear()
+
+    # region options
+
+    def gpu_options(self, machine_type: str) -> List[Tuple[Optional[str], int]]:
+        """
+        :return: (gpu, count) pairs the machine type can be configured with, (None, 0) included
+        """
+        if machine_type in self._gpu_options:
+            return self._gpu_options[machine_type]
+        options = [(None, 0)]
+        info = self.general_machines_info.get(machine_type)
+        # machines with built-in GPUs can't attach more
+        if info is not None and info.gpu_support and not info.gpu_count_by_default:
+            for gpu, counts in self.attachable_gpus.get(machine_type.split('-')[0], {}).items():
+                options.extend((gpu, count) for count in counts)
+        self._gpu_options[machine_type] = options
+        return options
+
+    def local_ssd_options(self, machine_type: str) -> Tuple[int, ...]:
+        """
+        :return: allowed numbers of optional LocalSSD partitions
+        """
+        info = self.general_machines_info.get(machine_type)
+        # LocalSSD enabled by default has a fixed size, it's priced in the base price
+        if info is None or not info.local_ssd_support or info.local_ssd_enabled_by_default:
+            return (0,)
+        return self.local_ssd_partitions
+
+    # endregion
+
+    # region pricing
+
+    def _base_price(self, machine_type: str, region: str, usage_type: str) -> Optional[float]:
+        key = (machine_type, region, usage_type)
+        if key in self._base_prices:
+            return self._base_prices[key]
+        price = None
+        machine = self.machines.get(machine_type)
+        info = self.general_machines_info.get(machine_type)
+        if machine is not None and info is not None:
+            default_gpu = info.default_gpu if info.gpu_support and info.gpu_count_by_default else None
+            price = self.unit_rates.quote(
+                machine_type.split('-')[0],
+                region,
+                usage_type,
+                cpu=machine['cpu'],
+                ram=machine['ram'],
+                gpu=default_gpu,
+                gpu_count=info.gpu_count_by_default if default_gpu else 0,
+                local_ssd_gb=(info.local_ssd_default_size or 0) if info.local_ssd_enabled_by_default else 0
+            )
+        self._base_prices[key] = price
+        return price
+
+    def _gpu_price(self, gpu: str, region: str, usage_type: str) -> Optional[float]:
+        key = (gpu, region, usage_type)
+        if key not in self._gpu_prices:
+            self._gpu_prices[key] = self.unit_rates.get_gpu_rate(gpu, region, usage_type)
+        return self._gpu_prices[key]
+
+    def price(self, configuration: MachineConfiguration) -> Optional[float]:
+        """
+        :return: hourly price or None if the configuration isn't supported or any unit rate is unknown
+        """
+        machine_type, region, usage_type, gpu, gpu_count, local_ssd_partitions = configuration
+        price = self._base_price(machine_type, region, usage_type)
+        if price is None:
+            return None
+        if gpu is not None and gpu_count:
+            if (gpu, gpu_count) not in self.gpu_options(machine_type):
+                return None
+            gpu_rate = self._gpu_price(gpu, region, usage_type)
+            if gpu_rate is None:
+                return None
+            price += gpu_count * gpu_rate
+        if local_ssd_partitions:
+            if local_ssd_partitions not in self.local_ssd_options(machine_type):
+                return None
+            local_ssd_rate = self.unit_rates.get_local_ssd_rate(region, usage_type)
+            if local_ssd_rate is None:
+                return None
+            price += local_ssd_partitions * LOCAL_SSD_PARTITION_GB * local_ssd_rate
+        return nice(price)
+
+    def quote(
+        self,
+        machine_type: str,
+        region: str,
+        usage_type: UsageType,
+        gpu: Optional[str] = None,
+        gpu_count: int = 0,
+        local_ssd_partitions: int = 0,
+    ) -> Optional[float]:
+        return self.price(MachineConfiguration(machine_type, region, usage_type, gpu, gpu_count, local_ssd_partitions))
+
+    # endregion
+
+    def iter_configurations(
+        self,
+        machine_types: Optional[Iterable[str]] = None,
+        regions: Optional[Iterable[str]] = None,
+        usage_types: Optional[Iterable[str]] = None,
+        gpus: Optional[Iterable[Optional[str]]] = None,
+        min_gpu_count: int = 0,
+        local_ssd_partitions: Optional[Iterable[int]] = None,
+        max_price: Optional[float] = None,
+    ) -> Iterator[PricedConfiguration]:
+        """
+        Lazily enumerates priced configurations matching the filters.
+        Configurations with unknown unit rates are skipped.
+
+        :param machine_types: machine type patterns, e.g. ['n1-standard-*']
+        :param regions: region patterns, e.g. ['europe-*']
+        :param gpus: GPU names, None for configurations without attached GPUs
+        :param min_gpu_count: min number of attached GPUs
+        :param local_ssd_partitions: allowed numbers of optional LocalSSD partitions
+        :param max_price: max hourly price
+        """
+        machine_types = None if machine_types is None else list(machine_types)
+        regions = None if regions is None else list(regions)
+        usage_types = USAGE_TYPES if usage_types is None else list(usage_types)
+        gpus = None if gpus is None else set(gpus)
+        local_ssd_partitions = None if local_ssd_partitions is None else set(local_ssd_partitions)
+
+        for machine_type in sorted(self.machines):
+            if machine_types is not None and not any(fnmatch.fnmatchcase(machine_type, x) for x in machine_types):
+                continue
+            gpu_options = [
+                (gpu, count) for gpu, count in self.gpu_options(machine_type)
+                if count >= min_gpu_count and (gpus is None or gpu in gpus)
+            ]
+            local_ssd_options = [
+                x for x in self.local_ssd_options(machine_type)
+                if local_ssd_partitions is None or x in local_ssd_partitions
+            ]
+            if not gpu_options or not local_ssd_options:
+                continue
+            for region in sorted(self.machines[machine_type].get('regions') or []):
+                if regions is not None and not any(fnmatch.fnmatchcase(region, x) for x in regions):
+                    continue
+                for usage_type in usage_types:
+                    base_price = self._base_price(machine_type, region, usage_type)
+                    # add-ons only increase the price
+                    if base_price is None or (max_price is not None and base_price > max_price):
+                        continue
+                    for gpu, gpu_count in gpu_options:
+                        for partitions in local_ssd_options:
+                            configuration = MachineConfiguration(
+                                machine_type, region, usage_type, gpu, gpu_count, partitions
+                            )
+                            price = self.price(configuration)
+                            if price is None or (max_price is not None and price > max_price):
+                                continue
+                            yield PricedConfiguration(configuration, price)
+
+
+__all__ = [
+    'ATTACHABLE_GPUS',
+    'CombinationPricer',
+    'LOCAL_SSD_PARTITION_GB',
+    'LOCAL_SSD_PARTITIONS',
+    'MachineConfiguration',
+    'PricedConfiguration'
+]
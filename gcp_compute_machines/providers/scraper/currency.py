@@ -0,0 +1,92 @@
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import yaml
+
+from gcp_compute_machines.providers.scraper.unit_rates import nice
+
+# currency of the catalog prices if the request has no currency code
+BASE_CURRENCY = 'USD'
+
+
+def currency_column(usage_type: str, currency: str) -> str:
+    """
+    :return: flat pricing data column of a usage type price in a currency, e.g. `ondemand_eur`
+    """
+    return f'{usage_type}_{currency.lower()}'
+
+
+class CurrencyRates:
+    """
+    Conversion rates from USD, the currency the scraper prices are calculated in.
+
+    The Cloud Billing catalog converts all prices of a request in another currency with one rate
+    (`PricingInfo.currency_conversion_rate`), so converting USD prices gives the same result
+    as paging the catalog once per currency.
+    """
+
+    def __init__(self, rates: Optional[Dict[str, float]] = None, last_time_updated: Optional[int] = None):
+        """
+        :param rates: currency code -> rate from USD
+        """
+        self.rates: Dict[str, float] = {}
+        for currency, rate in (rates or {}).items():
+            self.set_rate(currency, rate)
+        self.last_time_updated = last_time_updated
+
+    def __len__(self) -> int:
+        return len(self.rates)
+
+    def __contains__(self, currency: str) -> bool:
+        return currency.upper() == BASE_CURRENCY or currency.upper() in self.rates
+
+    def set_rate(self, currency: str, rate: float):
+        self.rates[currency.upper()] = rate
+        self.last_time_updated = int(datetime.now().timestamp())
+
+    def get_rate(self, currency: str) -> Optional[float]:
+        currency = currency.upper()
+        if currency == BASE_CURRENCY:
+            return 1.0
+        return self.rates.get(currency)
+
+    def missing(self, currencies: Iterable[str]) -> List[str]:
+        return [x.upper() for x in currencies if x not in self]
+
+    def convert(self, price: Optional[float], currency: str) -> Optional[float]:
+        """
+        :param price: USD price
+        """
+        rate = self.get_rate(currency)
+        if rate is None:
+            raise ValueError(f'There is no {currency} conversion rate. Known currencies: {sorted(self.rates)}')
+        return None if price is None else nice(price * rate)
+
+    def to_dict(self) -> dict:
+        return {
+            'metadata': {
+                'base_currency': BASE_CURRENCY,
+                'last_time_updated': self.last_time_updated
+            },
+            'rates': dict(self.rates)
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CurrencyRates':
+        return cls(data['rates'], last_time_updated=data.get('metadata', {}).get('last_time_updated'))
+
+    def dump(self, file_path: str):
+        with open(file_path, 'w') as file:
+            yaml.dump(self.to_dict(), file)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'CurrencyRates':
+        with open(file_path, 'r') as file:
+            return cls.from_dict(yaml.safe_load(file))
+
+
+__all__ = [
+    'BASE_CURRENCY',
+    'CurrencyRates',
+    'currency_column'
+]
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from pydantic import field_validator, Field
+from pydantic import ConfigDict, field_validator, Field
 
 from gcp_compute_machines.providers.base.models.base_machine_info_model import GCPMachineType
 
@@ -14,6 +14,8 @@ class ScrapedMachineInfoModel(GCPMachineType):
     # https://cloud.google.com/compute/docs/instances/nested-virtualization/overview
     nested_virtualization: bool = Field(alias='nested_virtualization_support')
 
+    # prices in extra currencies (`ondemand_eur`, ...) are kept as extra fields
+    model_config = ConfigDict(extra='allow')
 
     @field_validator('tier1_network_bandwidth', mode='before')
     @classmethod
@@ -2,3 +2,4 @@ from .compute_machine_sku_model import ComputeFamilySKUModel
 from .gpus_info_model import GPUInfoModel
 from .sku_regex_mapping_model import SKURegexMappingModel
 from .storage_sku_model import StorageSKUModel
+from .sku_record import CATALOG_USAGE_TYPES, PRICED_RESOURCE_GROUPS, SKURecord, SKUCatalog
@@ -0,0 +1,172 @@
+import sys
+from typing import Any, Dict, FrozenSet, Iterable, List, NamedTuple, Optional, Tuple
+
+from gcp_compute_machines.constants import *
+
+# Cloud Billing catalog usage type -> pricing usage type
+CATALOG_USAGE_TYPES: Dict[str, UsageType] = {
+    'OnDemand': OnDemandUsage,
+    'Preemptible': SpotUsage,
+    'Commit1Yr': CommitmentOneYearUsage,
+    'Commit3Yr': CommitmentThreeYearsUsage,
+}
+
+# Resource groups which are used for pricing. SKUs from other groups (SSD, PD, network, ...) are dropped while paging.
+PRICED_RESOURCE_GROUPS: FrozenSet[str] = frozenset({
+    'CPU',
+    'RAM',
+    'GPU',
+    'N1Standard',
+    'F1Micro',
+    'G1Small',
+    'LocalSSD',
+})
+
+
+class SKURecord(NamedTuple):
+    """
+    Catalog SKU reduced to the fields used for pricing.
+    """
+    sku_id: str
+    description: str
+    # interned region names, the same frozenset object is shared by all SKUs with the same regions
+    regions: FrozenSet[str]
+    # unit price of the first pricing tier
+    price: float
+
+
+class SKUCatalog:
+    """
+    Compact storage of Compute Engine SKUs: usage type -> list of `SKURecord`.
+
+    Records are built straight from the catalog pages, so the full SKU messages are never kept.
+    """
+
+    def __init__(self):
+        self.skus: Dict[UsageType, List[SKURecord]] = {usage_type: [] for usage_type in CATALOG_USAGE_TYPES.values()}
+        self._regions: Dict[Tuple[str, ...], FrozenSet[str]] = {}
+        # usage type -> sku_id -> record, built on the first lookup
+        self._ids: Dict[UsageType, Dict[str, SKURecord]] = {}
+
+    def __len__(self) -> int:
+        return sum(len(records) for records in self.skus.values())
+
+    def __getitem__(self, usage_type: UsageType) -> List[SKURecord]:
+        return self.skus[usage_type]
+
+    def _regions_set(self, regions: Iterable[str]) -> FrozenSet[str]:
+        key = tuple(regions)
+        result = self._regions.get(key)
+        if result is None:
+            result = self._regions[key] = frozenset(sys.intern(region) for region in key)
+        return result
+
+    @staticmethod
+    def accepts(resource_group: str, usage_type: str) -> bool:
+        return resource_group in PRICED_RESOURCE_GROUPS and usage_type in CATALOG_USAGE_TYPES
+
+    def add_record(
+        self,
+        usage_type: UsageType,
+        sku_id: str,
+        description: str,
+        regions: Iterable[str],
+        price: float
+    ) -> SKURecord:
+        record = SKURecord(sku_id, description, self._regions_set(regions), price)
+        self.skus[usage_type].append(record)
+        self._ids.pop(usage_type, None)
+        return record
+
+    def find(self, usage_type: UsageType, sku_id: str) -> Optional[SKURecord]:
+        """
+        :return: the record with the provided id, None if there is no such SKU
+        """
+        ids = self._ids.get(usage_type)
+        if ids is None:
+            ids = self._ids[usage_type] = {record.sku_id: record for record in self.skus[usage_type]}
+        return ids.get(sku_id)
+
+    def update(self, other: 'SKUCatalog'):
+        """
+        Adds all records of another catalog.
+        """
+        for usage_type, records in other.skus.items():
+            for record in records:
+                self.add_record(usage_type, *record)
+
+    def add(self, sku: Any) -> Optional[SKURecord]:
+        """
+        Adds a catalog SKU (`billing_v1.Sku`).
+
+        :return: the new record or None if the SKU is not used for pricing or has no pricing tiers
+        """
+        category = sku.category
+        if not self.accepts(category.resource_group, category.usage_type):
+            return None
+        tiered_rates = sku.pricing_info[0].pricing_expression.tiered_rates
+        if len(tiered_rates) == 0:
+            return None
+        unit_price = tiered_rates[0].unit_price
+        return self.add_record(
+            CATALOG_USAGE_TYPES[category.usage_type],
+            sku.sku_id,
+            sku.description,
+            sku.service_regions,
+            unit_price.units + unit_price.nanos * 10 ** (-9)
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            usage_type: [
+                {
+                    'sku_id': record.sku_id,
+                    'description': record.description,
+                    'regions': sorted(record.regions),
+                    'price': record.price,
+                }
+                for record in records
+            ]
+            for usage_type, records in self.skus.items()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SKUCatalog':
+        """
+        Loads `to_dict` output. The nested format of the older `gcp_sku.yaml` dumps
+        (resource group -> catalog usage type -> SKU name -> SKU) is supported as well.
+        """
+        catalog = cls()
+        if any(group in data for group in PRICED_RESOURCE_GROUPS):
+            for resource_group, usage_types in data.items():
+                for usage_type, skus in usage_types.items():
+                    if not catalog.accepts(resource_group, usage_type):
+                        continue
+                    for sku in skus.values():
+                        catalog.add_record(
+                            CATALOG_USAGE_TYPES[usage_type],
+                            sku['sku_id'],
+                            sku['description'],
+                            sku['regions'],
+                            sku['pricing']['unit_price_units'] + sku['pricing']['unit_price_nanos'] * 10 ** (-9)
+                        )
+            return catalog
+
+        for usage_type, records in data.items():
+            for record in records:
+                catalog.add_record(
+                    usage_type,
+                    record['sku_id'],
+                    record['description'],
+                    record['regions'],
+                    record['price']
+                )
+        return catalog
+
+
+__all__ = [
+    'CATALOG_USAGE_TYPES',
+    'PRICED_RESOURCE_GROUPS',
+    'SKURecord',
+    'SKUCatalog'
+]
@@ -0,0 +1,109 @@
+from typing import Dict, FrozenSet, Iterable, List, Optional
+
+from gcp_compute_machines.constants import *
+from gcp_compute_machines.tools.zone_index import zone_region
+
+# usage types of the scraped machines, SUD is calculated from on-demand prices
+SCOPE_USAGE_TYPES = (OnDemandUsage, 'sud', SpotUsage, CommitmentOneYearUsage, CommitmentThreeYearsUsage)
+
+
+def machine_family(machine_name: str) -> str:
+    return machine_name.split('-')[0]
+
+
+def _as_set(values: Optional[Iterable[str]]) -> Optional[FrozenSet[str]]:
+    return None if values is None else frozenset(values)
+
+
+class ScrapeScope:
+    """
+    Regions, machine families (`n2`, `c3`, ...) and usage types a scraper run is limited to.
+    None means no limit.
+    """
+
+    def __init__(
+        self,
+        regions: Optional[Iterable[str]] = None,
+        families: Optional[Iterable[str]] = None,
+        usage_types: Optional[Iterable[str]] = None,
+    ):
+        self.regions = _as_set(regions)
+        self.families = _as_set(families)
+        self.usage_types = _as_set(usage_types)
+        if self.usage_types is not None:
+            unknown = self.usage_types - set(SCOPE_USAGE_TYPES)
+            if unknown:
+                raise ValueError(f'Unknown usage types: {sorted(unknown)}. Supported usage types: {SCOPE_USAGE_TYPES}')
+        # catalog usage types to price, on-demand is priced for SUD as well
+        usage_types = set(SCOPE_USAGE_TYPES if self.usage_types is None else self.usage_types)
+        if 'sud' in usage_types:
+            usage_types.add(OnDemandUsage)
+        self.priced_usage_types: List[UsageType] = [x for x in SCOPE_USAGE_TYPES if x in usage_types and x != 'sud']
+
+    @property
+    def is_full(self) -> bool:
+        return self.regions is None and self.families is None and self.usage_types is None
+
+    def accepts_usage_type(self, usage_type: str) -> bool:
+        if usage_type == 'sud':
+            return self.usage_types is None or 'sud' in self.usage_types
+        return usage_type in self.priced_usage_types
+
+    def accepts_region(self, region: str) -> bool:
+        return self.regions is None or region in self.regions
+
+    def accepts_regions(self, regions: Iterable[str]) -> bool:
+        """
+        True if any of the regions (e.g. SKU service regions) is in the scope.
+        """
+        return self.regions is None or not self.regions.isdisjoint(regions)
+
+    def accepts_zone(self, zone: str) -> bool:
+        return self.regions is None or zone_region(zone) in self.regions
+
+    def accepts_family(self, family: str) -> bool:
+        return self.families is None or family in self.families
+
+    def accepts_machine(self, machine_name: str) -> bool:
+        return self.families is None or machine_family(machine_name) in self.families
+
+    def filter_machines(self, machines: Dict[str, dict]) -> Dict[str, dict]:
+        """
+        Keeps machines (scraper `machines` format) of the scope families and drops zones out of the scope regions.
+        """
+        if self.regions is None and self.families is None:
+            return machines
+        result = {}
+        for name, machine in machines.items():
+            if not self.accepts_machine(name):
+                continue
+            zones = [x for x in machine['zones'] if self.accepts_zone(x)]
+            if zones:
+                result[name] = {
+                    **machine,
+                    'zones': zones,
+                    'regions': [x for x in machine['regions'] if self.accepts_region(x)],
+                }
+        return result
+
+    def to_dict(self) -> dict:
+        return {
+            'regions': None if self.regions is None else sorted(self.regions),
+            'families': None if self.families is None else sorted(self.families),
+            'usage_types': None if self.usage_types is None else sorted(self.usage_types),
+        }
+
+    def __repr__(self) -> str:
+        def _format(values):
+            return 'all' if values is None else sorted(values)
+        return (
+            f'ScrapeScope(regions={_format(self.regions)}, families={_format(self.families)}, '
+            f'usage_types={_format(self.usage_types)})'
+        )
+
+
+__all__ = [
+    'SCOPE_USAGE_TYPES',
+    'ScrapeScope',
+    'machine_family'
+]
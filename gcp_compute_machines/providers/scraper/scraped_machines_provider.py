@@ -1,6 +1,14 @@
+from typing import Dict, Iterable, Optional, Sequence
+
+from gcp_compute_machines.constants import UsageType
 from gcp_compute_machines.providers.base import GCPMachinesProvider
+from gcp_compute_machines.providers.scraper.combination_pricer import CombinationPricer
+from gcp_compute_machines.providers.scraper.currency import CurrencyRates
 from gcp_compute_machines.providers.scraper.models import ScrapedMachineInfoModel
 from gcp_compute_machines.providers.scraper.scraper import InstanceScraper
+from gcp_compute_machines.providers.scraper.sku_pins import SKUPins
+from gcp_compute_machines.providers.scraper.unit_rates import UnitRatesTable
+from gcp_compute_machines.tools.zone_index import ZoneAvailabilityIndex
 
 
 class GCPMachinesScraper(GCPMachinesProvider):
@@ -9,14 +17,24 @@ class GCPMachinesScraper(GCPMachinesProvider):
         self,
         gpc_project_name: str,
         gcp_sa_account_path: str,
-
+        page_size: Optional[int] = None,
+        request_budget: Optional[int] = None,
+        log_level: str = 'DEBUG',
+        checkpoint_dir: Optional[str] = None,
     ):
+        """
+        :param checkpoint_dir: checkpoint stage outputs of every run there, see `InstanceScraper`
+        """
         self._gcp_project_name = gpc_project_name
         self._gcp_sa_account_path = gcp_sa_account_path
 
         self._scraper = InstanceScraper(
             gcp_project=self._gcp_project_name,
-            sa_path=self._gcp_sa_account_path
+            sa_path=self._gcp_sa_account_path,
+            page_size=page_size,
+            request_budget=request_budget,
+            log_level=log_level,
+            checkpoint_dir=checkpoint_dir
         )
 
     def fetch_gcp_machines(
@@ -24,15 +42,146 @@ class GCPMachinesScraper(GCPMachinesProvider):
         dump: bool,
         load: bool,
         *args,
+        stages: Optional[Iterable[str]] = None,
+        regions: Optional[Iterable[str]] = None,
+        families: Optional[Iterable[str]] = None,
+        usage_types: Optional[Iterable[str]] = None,
+        run_id: Optional[str] = None,
+        currencies: Optional[Iterable[str]] = None,
+        sku_pins_path: Optional[str] = None,
         **kwargs
     ) -> list[ScrapedMachineInfoModel]:
+        """
+        :param stages: scraper stages to run (see `InstanceScraper.STAGES`), all by default
+        :param regions: limit the run to these regions, see `InstanceScraper.set_scope` for `families`
+            and `usage_types` too
+        :param run_id: checkpointed run to resume, requires `checkpoint_dir`
+        :param currencies: extra currencies of the prices, e.g. `['EUR', 'GBP']` adds `ondemand_eur`, ... fields
+        :param sku_pins_path: price the mappings through the SKU ids pinned in this file and update it
+        """
         self._scraper.run(
             dump=dump,
-            load=load
+            load=load,
+            stages=stages,
+            regions=regions,
+            families=families,
+            usage_types=usage_types,
+            run_id=run_id,
+            currencies=currencies,
+            sku_pins_path=sku_pins_path
         )
         return self._scraper.flat_pricing_data
 
-    def dump_pricing_info(self, file_path: str):
+    async def afetch_gcp_machines(
+        self,
+        dump: bool,
+        load: bool,
+        *args,
+        max_concurrency: int = 8,
+        stages: Optional[Iterable[str]] = None,
+        regions: Optional[Iterable[str]] = None,
+        families: Optional[Iterable[str]] = None,
+        usage_types: Optional[Iterable[str]] = None,
+        run_id: Optional[str] = None,
+        currencies: Optional[Iterable[str]] = None,
+        sku_pins_path: Optional[str] = None,
+        **kwargs
+    ) -> list[ScrapedMachineInfoModel]:
+        await self._scraper.arun(
+            dump=dump,
+            load=load,
+            max_concurrency=max_concurrency,
+            stages=stages,
+            regions=regions,
+            families=families,
+            usage_types=usage_types,
+            run_id=run_id,
+            currencies=currencies,
+            sku_pins_path=sku_pins_path
+        )
+        return self._scraper.flat_pricing_data
+
+    @property
+    def run_id(self) -> Optional[str]:
+        return self._scraper.run_id
+
+    @property
+    def currency_rates(self) -> CurrencyRates:
+        return self._scraper.currency_rates
+
+    @property
+    def sku_pins(self) -> SKUPins:
+        return self._scraper.sku_pins
+
+    def _loaded_machines(self) -> list[ScrapedMachineInfoModel]:
+        return self._scraper.flat_pricing_data
+
+    def dump_pricing_info(
+        self,
+        file_path: str,
+        partition_by: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False
+    ):
+        """
+        :param partition_by: `region`, `family` or `series`. If set, `file_path` is a directory
+            with one dump per partition and a manifest.
+        """
         self._scraper.dump_flat_pricing_data(
-            flat_pricing_data_file_path=file_path
+            flat_pricing_data_file_path=file_path,
+            partition_by=partition_by,
+            max_workers=max_workers,
+            use_processes=use_processes
+        )
+
+    @property
+    def zone_availability(self) -> ZoneAvailabilityIndex:
+        return self._scraper.zone_availability
+
+    @property
+    def unit_rates(self) -> UnitRatesTable:
+        return self._scraper.unit_rates
+
+    def quote(
+        self,
+        family: str,
+        region: str,
+        usage_type: UsageType,
+        cpu: float,
+        ram: float,
+        gpu: Optional[str] = None,
+        gpu_count: int = 0,
+        local_ssd_gb: float = 0,
+    ) -> Optional[float]:
+        """
+        Calculates hourly price of an arbitrary machine shape using unit rates resolved by the last run.
+        """
+        return self.unit_rates.quote(
+            family=family,
+            region=region,
+            usage_type=usage_type,
+            cpu=cpu,
+            ram=ram,
+            gpu=gpu,
+            gpu_count=gpu_count,
+            local_ssd_gb=local_ssd_gb
+        )
+
+    def combination_pricer(self, attachable_gpus: Optional[Dict[str, Dict[str, Sequence[int]]]] = None) -> CombinationPricer:
+        """
+        Creates a pricer of machine + attachable GPU + LocalSSD combinations on top of the last run unit rates.
+        Its prices are memoized, create a new one after the next run.
+
+        :param attachable_gpus: machine family -> GPU -> allowed counts, `ATTACHABLE_GPUS` by default
+        """
+        return CombinationPricer(
+            self.unit_rates,
+            self._scraper.machines,
+            self._scraper.general_machines_info,
+            attachable_gpus=attachable_gpus
+        )
+
+    def dump_unit_rates(self, file_path: str):
+        self._scraper.dump_unit_rates(
+            unit_rates_file_path=file_path
         )
@@ -1,3 +1,4 @@
+import asyncio
 import csv
 import loguru
 import yaml
@@ -9,16 +10,18 @@ from datetime import datetime
 from gcp_compute_machines.providers.scraper.models import *
 from gcp_compute_machines.exceptions import ZeroSKURegexMatch, MultipleSKURegexMatch
 from gcp_compute_machines.constants import *
+from gcp_compute_machines.providers.scraper.unit_rates import UnitRatesTable, nice
+from gcp_compute_machines.providers.scraper.scope import SCOPE_USAGE_TYPES, ScrapeScope
+from gcp_compute_machines.providers.scraper.currency import CurrencyRates, currency_column
+from gcp_compute_machines.providers.scraper.checkpoints import RunCheckpoints
+from gcp_compute_machines.providers.scraper.sku_pins import SKUPins, sku_mapping_key
+from gcp_compute_machines.tools.zone_index import ZoneAvailabilityIndex
+from gcp_compute_machines.dumps.partitioned import write_partitioned_dump
+from gcp_compute_machines.dumps.binary import BINARY_SNAPSHOT_EXTENSION, write_binary_snapshot
 
-from google.cloud import \
-    billing_v1, \
-    compute_v1
 from google.oauth2 import service_account
-from typing import Optional, List, Dict, Any
-
-
-def nice(number: float, digits=5) -> float:
-    return round(number, digits)
+from gcp_compute_machines.providers.scraper.clients import GCPClientPool
+from typing import Optional, List, Dict, Any, Iterable, Tuple
 
 
 class InstanceScraper:
@@ -36,17 +39,31 @@ class InstanceScraper:
 
     GCP_INSTANCES_DATA = 'gcp_instances.yaml'
     GCP_SKU_DATA = 'gcp_sku.yaml'
+    GCP_CURRENCY_RATES_DATA = 'gcp_currency_rates.yaml'
     GCP_COMPUTE_ENGINE_SERVICE_NAME = 'services/6F81-5844-456A'
+    STAGES = SCRAPER_STAGES
 
     def __init__(
         self,
         gcp_project: str,
-        sa_path: str,
+        sa_path: Optional[str] = None,
         logger: Optional[Any] = None,
         log_level: str = 'DEBUG',  # used only if logger is None
         data_dir: Optional[str] = None,
         machine_families: Optional[List[str]] = None,
+        page_size: Optional[int] = None,
+        request_budget: Optional[int] = None,
+        client_pool: Optional[GCPClientPool] = None,
+        checkpoint_dir: Optional[str] = None,
     ):
+        """
+        :param sa_path: service account file. Can be omitted only if `client_pool` is provided.
+        :param page_size: page size for all list requests. API default is used if None.
+        :param request_budget: max number of API requests (retries included) per run
+        :param client_pool: shared GCP clients. Created from `sa_path` if None.
+        :param checkpoint_dir: if set, stage outputs of every run are checkpointed into `<checkpoint_dir>/<run_id>/`
+            and a run started with the id of a failed one resumes it.
+        """
 
         if logger is None:
             self.logger = loguru.logger
@@ -56,16 +73,31 @@ class InstanceScraper:
             self.logger = logger
         self.gcp_project = gcp_project
 
-        self.credentials = service_account.Credentials.from_service_account_file(sa_path)
-        self.regions_client = compute_v1.RegionsClient(credentials=self.credentials)
-        self.zones_client = compute_v1.ZonesClient(credentials=self.credentials)
-        self.machines_client = compute_v1.MachineTypesClient(credentials=self.credentials)
+        if client_pool is None:
+            if sa_path is None:
+                raise ValueError('Either sa_path or client_pool should be provided.')
+            client_pool = GCPClientPool(
+                credentials=service_account.Credentials.from_service_account_file(sa_path),
+                page_size=page_size,
+                request_budget=request_budget,
+                logger=self.logger
+            )
+        self.clients = client_pool
+        self.credentials = self.clients.credentials
+        self.regions_client = self.clients.regions_client
+        self.zones_client = self.clients.zones_client
+        self.machines_client = self.clients.machines_client
 
         if machine_families is None:
             self.machine_families = self.SUPPORTED_MACHINE_TYPES
         else:
             self.machine_families = machine_families
         self.data_dir = self.DEFAULT_DATA_DIR if data_dir is None else data_dir
+        self.checkpoint_dir = checkpoint_dir
+        self.checkpoints: Optional[RunCheckpoints] = None
+        # extra currencies of the flat pricing data, prices are calculated in USD
+        self.currencies: List[str] = []
+        self.currency_rates = CurrencyRates()
 
         # Load GPU skus mapping
         self.gpus: Dict[str, GPUInfoModel] = {}
@@ -81,20 +113,22 @@ class InstanceScraper:
         self.__load_machine_families_info()
 
         self.pricing_data = {}
+        self.unit_rates = UnitRatesTable()
         self.flat_pricing_data: List[ScrapedMachineInfoModel] = []
         self.regions = []
         self.zones = []
         self.machines = {}
-        self.on_demand_skus = []
-        self.spot_skus = []
-        self.cud1_skus = []
-        self.cud3_skus = []
-        self.skus = {
-            OnDemandUsage: [],
-            SpotUsage: [],
-            CommitmentOneYearUsage: [],
-            CommitmentThreeYearsUsage: [],
-        }
+        self.zone_availability = ZoneAvailabilityIndex({})
+        self._set_skus(SKUCatalog())
+        # SKU ids resolved by the mapping regexes, see `get_sku_pins`
+        self.sku_pins = SKUPins()
+        # usage type -> SKUs unknown to the pins, matched against the pinned mappings regexes
+        self._new_skus: Dict[UsageType, List[SKURecord]] = {}
+        # pinned -> number of mappings resolved by pinned SKU ids, regex -> by regex
+        self._sku_resolutions: Dict[str, int] = {'pinned': 0, 'regex': 0}
+        self.scope = ScrapeScope()
+        # usage type -> pattern of the SKU descriptions used by the scope families, None if families are not limited
+        self._scope_sku_patterns: Optional[Dict[str, re.Pattern]] = None
 
     def __load_gpu_info(self):
         with open(os.path.join(self.data_dir, 'gpu-skus-mapping.yaml'), 'r') as file:
@@ -140,159 +174,280 @@ class InstanceScraper:
 
     def get_regions(self) -> List[str]:
         self.logger.debug('[GetRegions] Started')
-        regions_request = compute_v1.ListRegionsRequest(
-            project=self.gcp_project
-        )
-        page_result = self.regions_client.list(request=regions_request)
-        self.regions = []
-        for response in page_result:
-            self.regions.append(response.name)
+        self.regions = self._load_checkpoint('regions')
+        if self.regions is None:
+            self.regions = [
+                response.name for response in self.clients.list_regions(self.gcp_project)
+                if self.scope.accepts_region(response.name)
+            ]
+            self._save_checkpoint('regions', self.regions)
+        self.logger.info(f'[GetRegions] Loaded {len(self.regions)} regions: {self.regions}')
+        return self.regions
+
+    async def aget_regions(self) -> List[str]:
+        self.logger.debug('[GetRegions] Started')
+        self.regions = await asyncio.to_thread(self._load_checkpoint, 'regions')
+        if self.regions is None:
+            self.regions = [
+                response.name for response in await self.clients.alist_regions(self.gcp_project)
+                if self.scope.accepts_region(response.name)
+            ]
+            await asyncio.to_thread(self._save_checkpoint, 'regions', self.regions)
         self.logger.info(f'[GetRegions] Loaded {len(self.regions)} regions: {self.regions}')
         return self.regions
 
     def get_zones(self):
         self.logger.debug('[GetZones] Started.')
-        zone_types_request = compute_v1.ListZonesRequest(
-            project=self.gcp_project
-        )
-        page_result = self.zones_client.list(request=zone_types_request)
-        self.zones = []
-        for response in page_result:
-            self.zones.append(response.name)
+        self.zones = self._load_checkpoint('zones')
+        if self.zones is None:
+            self.zones = [
+                response.name for response in self.clients.list_zones(self.gcp_project)
+                if self.scope.accepts_zone(response.name)
+            ]
+            self._save_checkpoint('zones', self.zones)
         self.logger.info(f'[GetZones] Loaded {len(self.zones)} zones: {self.zones}')
         return self.zones
 
-    def get_machine_types(
-        self,
-        load=False,
-        dump=False
-    ):
-        self.logger.info('[GetMachineTypes] Started')
-        self.machines = {}
+    async def aget_zones(self):
+        self.logger.debug('[GetZones] Started.')
+        self.zones = await asyncio.to_thread(self._load_checkpoint, 'zones')
+        if self.zones is None:
+            self.zones = [
+                response.name for response in await self.clients.alist_zones(self.gcp_project)
+                if self.scope.accepts_zone(response.name)
+            ]
+            await asyncio.to_thread(self._save_checkpoint, 'zones', self.zones)
+        self.logger.info(f'[GetZones] Loaded {len(self.zones)} zones: {self.zones}')
+        return self.zones
 
+    def _load_machine_types(self, load: bool) -> bool:
         if load and os.path.exists(self.GCP_INSTANCES_DATA):
             self.logger.info(f'[GetMachineTypes] Loading from file {self.GCP_INSTANCES_DATA}')
             with open(self.GCP_INSTANCES_DATA, 'r') as file:
-                self.machines = yaml.safe_load(file)
+                self.machines = self.scope.filter_machines(yaml.safe_load(file))
+                self.zone_availability = ZoneAvailabilityIndex.from_scraped_machines(self.machines)
                 self.logger.info('[GetMachineTypes] Loaded from file. Done')
-                return self.machines
+                return True
+        return False
 
-        for zone in self.zones:
-            self.logger.debug(f'Processing machines from zone: {zone}')
-            request = compute_v1.ListMachineTypesRequest(
-                project=self.gcp_project,
-                zone=zone,
-            )
-            page_result = self.machines_client.list(request=request)
-            for response in page_result:
-                if response.name not in self.machines:
-                    self.machines[response.name] = {
-                        'cpu': response.guest_cpus,
-                        'ram': response.memory_mb / 1024,
-                        'zones': [zone]
-                    }
-                else:
-                    self.machines[response.name]['zones'].append(zone)
+    @staticmethod
+    def _machine_type_records(machine_types: Iterable[Any]) -> List[list]:
+        return [[response.name, response.guest_cpus, response.memory_mb] for response in machine_types]
 
+    def _add_zone_machine_types(self, zone: str, machine_types: List[list]):
+        """
+        :param machine_types: [name, vCPUs, memory MB] records of the zone
+        """
+        for name, guest_cpus, memory_mb in machine_types:
+            if not self.scope.accepts_machine(name):
+                continue
+            if name not in self.machines:
+                self.machines[name] = {
+                    'cpu': guest_cpus,
+                    'ram': memory_mb / 1024,
+                    'zones': [zone]
+                }
+            else:
+                self.machines[name]['zones'].append(zone)
+
+    def _finalize_machine_types(self, dump: bool):
         for machine in self.machines:
             self.machines[machine]['regions'] = list(set(['-'.join(x.split('-')[:2]) for x in self.machines[machine]['zones']]))
 
+        self.zone_availability = ZoneAvailabilityIndex.from_scraped_machines(self.machines)
+
         self.logger.info(f'[GetMachineTypes] Machines: {self.machines.keys()}')
         if dump:
             self.logger.info(f'[GetMachineTypes] Saving instances into {self.GCP_INSTANCES_DATA}')
             with open(self.GCP_INSTANCES_DATA, 'w') as file:
                 yaml.dump(self.machines, file)
         self.logger.info('[GetMachineTypes] Done')
+
+    def get_machine_types(
+        self,
+        load=False,
+        dump=False
+    ):
+        self.logger.info('[GetMachineTypes] Started')
+        self.machines = {}
+
+        if self._load_machine_types(load):
+            return self.machines
+
+        for zone in self.zones:
+            machine_types = self._load_checkpoint(f'machine-types/{zone}')
+            if machine_types is None:
+                self.logger.debug(f'Processing machines from zone: {zone}')
+                machine_types = self._machine_type_records(self.clients.list_machine_types(self.gcp_project, zone))
+                self._save_checkpoint(f'machine-types/{zone}', machine_types)
+            self._add_zone_machine_types(zone, machine_types)
+
+        self._finalize_machine_types(dump)
+        return self.machines
+
+    async def aget_machine_types(
+        self,
+        load=False,
+        dump=False,
+        max_concurrency: int = 8
+    ):
+        """
+        Async version of `get_machine_types`. Zones are listed concurrently.
+        """
+        self.logger.info('[GetMachineTypes] Started')
+        self.machines = {}
+
+        if await asyncio.to_thread(self._load_machine_types, load):
+            return self.machines
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _list_machine_types(zone: str):
+            machine_types = await asyncio.to_thread(self._load_checkpoint, f'machine-types/{zone}')
+            if machine_types is not None:
+                return machine_types
+            async with semaphore:
+                self.logger.debug(f'Processing machines from zone: {zone}')
+                machine_types = self._machine_type_records(
+                    await self.clients.alist_machine_types(self.gcp_project, zone)
+                )
+            await asyncio.to_thread(self._save_checkpoint, f'machine-types/{zone}', machine_types)
+            return machine_types
+
+        zones_machine_types = await asyncio.gather(*[_list_machine_types(zone) for zone in self.zones])
+        # merge in zones order to get the same result as the sync version
+        for zone, machine_types in zip(self.zones, zones_machine_types):
+            self._add_zone_machine_types(zone, machine_types)
+
+        await asyncio.to_thread(self._finalize_machine_types, dump)
         return self.machines
 
+    def _set_skus(self, skus_data: SKUCatalog):
+        self.sku_catalog = skus_data
+        self.skus = skus_data.skus
+        self.on_demand_skus = self.skus[OnDemandUsage]
+        self.spot_skus = self.skus[SpotUsage]
+        self.cud1_skus = self.skus[CommitmentOneYearUsage]
+        self.cud3_skus = self.skus[CommitmentThreeYearsUsage]
 
     def init_skus(self, load=False, dump=False):
-        skus_data = self.get_skus_data(load, dump)
-
-        def _get_usage_type_skus(usage_type: str):
-            return list(skus_data['CPU'].get(usage_type, {}).values()) + \
-                   list(skus_data['RAM'].get(usage_type, {}).values()) + \
-                   list(skus_data['GPU'].get(usage_type, {}).values()) + \
-                   list(skus_data['N1Standard'].get(usage_type, {}).values()) + \
-                   list(skus_data['F1Micro'].get(usage_type, {}).values()) + \
-                   list(skus_data['G1Small'].get(usage_type, {}).values()) + \
-                   list(skus_data['LocalSSD'].get(usage_type, {}).values())
-
-        self.on_demand_skus = _get_usage_type_skus('OnDemand')
-        self.spot_skus = _get_usage_type_skus('Preemptible')
-        self.cud1_skus = _get_usage_type_skus('Commit1Yr')
-        self.cud3_skus = _get_usage_type_skus('Commit3Yr')
-        self.skus[OnDemandUsage] = self.on_demand_skus
-        self.skus[SpotUsage] = self.spot_skus
-        self.skus[CommitmentOneYearUsage] = self.cud1_skus
-        self.skus[CommitmentThreeYearsUsage] = self.cud3_skus
-
-    def get_skus_data(self, load=False, dump=False):
-        self.logger.info('[GetSkusData] Started')
-        unique_sku_groups = set()
+        self._set_skus(self.get_skus_data(load, dump))
+
+    async def ainit_skus(self, load=False, dump=False):
+        self._set_skus(await self.aget_skus_data(load, dump))
+
+    def _load_skus_data(self, load: bool) -> Optional[SKUCatalog]:
         if load and os.path.exists(self.GCP_SKU_DATA):
             self.logger.info(f'[GetSkusData] Loading from {self.GCP_SKU_DATA}')
             with open(self.GCP_SKU_DATA, 'r') as file:
-                return yaml.safe_load(file)
-
-        client = billing_v1.CloudCatalogClient(credentials=self.credentials)
-
-        compute_engine_service_name = self.GCP_COMPUTE_ENGINE_SERVICE_NAME
-        # Initialize request argument(s)
-        skus = {
-            'CPU': {},
-            'GPU': {},
-            'RAM': {},
-            'N1Standard': {},
-            'F1Micro': {},
-            'G1Small': {},
-            'LocalSSD': {},
-            'SSD': {}
-        }
+                skus = SKUCatalog.from_dict(yaml.load(file, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader)))
+            if self.scope.is_full:
+                return skus
+            scoped_skus = SKUCatalog()
+            for usage_type, records in skus.skus.items():
+                for record in records:
+                    if self._scope_accepts_sku(usage_type, record.description, record.regions):
+                        scoped_skus.add_record(usage_type, *record)
+            return scoped_skus
+        return None
+
+    def _scope_accepts_sku(self, usage_type: UsageType, description: str, regions: Iterable[str]) -> bool:
+        if not self.scope.accepts_usage_type(usage_type) or not self.scope.accepts_regions(regions):
+            return False
+        if self._scope_sku_patterns is None:
+            return True
+        pattern = self._scope_sku_patterns.get(usage_type)
+        return pattern is not None and pattern.search(description) is not None
+
+    def _add_sku(self, skus: SKUCatalog, response: Any, unique_sku_groups: set):
+        category = response.category
+        unique_sku_groups.add(category.resource_group)
+        if not skus.accepts(category.resource_group, category.usage_type):
+            return
+        if not self._scope_accepts_sku(
+            CATALOG_USAGE_TYPES[category.usage_type], response.description, response.service_regions
+        ):
+            return
+        tiered_rates = response.pricing_info[0].pricing_expression.tiered_rates
+        # We should not see the warnings below for CPU and RAM
+        if len(tiered_rates) != 1:
+            self.logger.warning(f'[GetSkusData] {response.description}')
+        skus.add(response)
+
+    def _add_sku_page(self, skus: SKUCatalog, page: List[Any], next_page_token: str, unique_sku_groups: set):
+        if self.checkpoints is None:
+            for response in page:
+                self._add_sku(skus, response, unique_sku_groups)
+            return
+        page_skus = SKUCatalog()
+        for response in page:
+            self._add_sku(page_skus, response, unique_sku_groups)
+        self.checkpoints.save_page('skus', page_skus.to_dict(), next_page_token)
+        skus.update(page_skus)
 
-        request = billing_v1.ListSkusRequest(
-            parent=compute_engine_service_name
-        )
-        page_result = client.list_skus(request=request)
+    def _load_sku_pages_checkpoint(self) -> Tuple[SKUCatalog, Optional[str]]:
+        """
+        :return: SKUs of the checkpointed pages and the page token to continue from (see `RunCheckpoints.load_pages`)
+        """
+        skus = SKUCatalog()
+        if self.checkpoints is None:
+            return skus, None
+        pages, page_token = self.checkpoints.load_pages('skus')
+        for page in pages:
+            skus.update(SKUCatalog.from_dict(page))
+        if pages:
+            self.logger.info(
+                f'[Checkpoint] Loaded {len(pages)} SKU pages of run {self.checkpoints.run_id}, '
+                f'{"paging is complete" if page_token == "" else "paging is resumed"}'
+            )
+        return skus, page_token
 
-        # Handle the response
-        for response in page_result:
-            unique_sku_groups.add(response.category.resource_group)
-            if response.category.resource_group not in skus:
-                continue
-            sku_pricing_info = response.pricing_info[0]
-            # We should not see the warnings below for CPU and RAM
-            if len(sku_pricing_info.pricing_expression.tiered_rates) > 1:
-                self.logger.warning(f'[GetSkusData] {response.description}')
-            if len(sku_pricing_info.pricing_expression.tiered_rates) == 0:
-                self.logger.warning(f'[GetSkusData] {response.description}')
-                continue
-            if response.category.usage_type not in skus[response.category.resource_group]:
-                skus[response.category.resource_group][response.category.usage_type] = {}
-            skus[response.category.resource_group][response.category.usage_type][response.name] = {
-                'name': response.name,
-                'sku_id': response.sku_id,
-                'description': response.description,
-                'usage_unit': sku_pricing_info.pricing_expression.usage_unit,
-                'usage_unit_description': sku_pricing_info.pricing_expression.usage_unit_description,
-                'base_unit': sku_pricing_info.pricing_expression.base_unit,
-                'base_unit_description': sku_pricing_info.pricing_expression.base_unit_description,
-                'base_unit_conversion_factor': sku_pricing_info.pricing_expression.base_unit_conversion_factor,
-                'display_quantity': sku_pricing_info.pricing_expression.display_quantity,
-                'pricing': {
-                    'start_usage_amount': sku_pricing_info.pricing_expression.tiered_rates[0].start_usage_amount,
-                    'unit_price_currency_code': sku_pricing_info.pricing_expression.tiered_rates[0].unit_price.currency_code,
-                    'unit_price_units': sku_pricing_info.pricing_expression.tiered_rates[0].unit_price.units,
-                    'unit_price_nanos': sku_pricing_info.pricing_expression.tiered_rates[0].unit_price.nanos,
-                },
-                'regions': list(response.service_regions)
-            }
-        self.logger.debug(unique_sku_groups)
+    def _dump_skus_data(self, skus: SKUCatalog, dump: bool):
         if dump:
             self.logger.info(f'[GetSkusData] Saving skus data into file {self.GCP_SKU_DATA}')
             with open(self.GCP_SKU_DATA, 'w') as file:
-                yaml.dump(skus, file)
+                yaml.dump(skus.to_dict(), file, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper))
         self.logger.info('[GetSkusData] Done')
+
+    def get_skus_data(self, load=False, dump=False) -> SKUCatalog:
+        """
+        Pages through the Compute Engine SKUs and keeps a compact record (see `SKURecord`) for every SKU
+        used for pricing. SKUs of the other resource groups are dropped right away.
+        """
+        self.logger.info('[GetSkusData] Started')
+        unique_sku_groups = set()
+        skus = self._load_skus_data(load)
+        if skus is not None:
+            return skus
+
+        skus, page_token = self._load_sku_pages_checkpoint()
+        if page_token != '':
+            for page, next_page_token in self.clients.iter_sku_pages(self.GCP_COMPUTE_ENGINE_SERVICE_NAME, page_token):
+                self._add_sku_page(skus, page, next_page_token, unique_sku_groups)
+        self.logger.debug(unique_sku_groups)
+        self.logger.info(f'[GetSkusData] Kept {len(skus)} SKUs')
+        self._dump_skus_data(skus, dump)
+        return skus
+
+    async def aget_skus_data(self, load=False, dump=False) -> SKUCatalog:
+        """
+        Async version of `get_skus_data` on top of the async catalog client.
+        """
+        self.logger.info('[GetSkusData] Started')
+        unique_sku_groups = set()
+        skus = await asyncio.to_thread(self._load_skus_data, load)
+        if skus is not None:
+            return skus
+
+        skus, page_token = await asyncio.to_thread(self._load_sku_pages_checkpoint)
+        if page_token != '':
+            async for page, next_page_token in self.clients.aiter_sku_pages(
+                self.GCP_COMPUTE_ENGINE_SERVICE_NAME, page_token
+            ):
+                self._add_sku_page(skus, page, next_page_token, unique_sku_groups)
+        self.logger.debug(unique_sku_groups)
+        self.logger.info(f'[GetSkusData] Kept {len(skus)} SKUs')
+        await asyncio.to_thread(self._dump_skus_data, skus, dump)
         return skus
 
     def get_machine_cost(self, machine_family: str, machine_name: str, usage_type: UsageType):
@@ -307,10 +462,9 @@ class InstanceScraper:
             self.logger.debug(
                 f"[GetPricing({usage_type})] {usage_type} pricing is not supported for machine family {machine_family}")
             return
-        machine_skus = list(
-            filter(lambda x: re.search(instance_price_regex, x['description']), self.skus[usage_type]))
+        machine_skus = self._match_skus('instance', machine_family, usage_type, instance_price_regex)
         for region in machine['regions']:
-            instance_region_sku = list(filter(lambda x: region in x['regions'], machine_skus))
+            instance_region_sku = list(filter(lambda x: region in x.regions, machine_skus))
             if len(instance_region_sku) == 0:
                 continue
             price = self.calculate_regional_instance_price(
@@ -323,12 +477,51 @@ class InstanceScraper:
                 self.pricing_data[machine_family][machine_name]['regions'][region] = {}
             self.pricing_data[machine_family][machine_name]['regions'][region][usage_type] = nice(price)
 
+    def _match_skus(self, kind: str, name: str, usage_type: UsageType, regex: str) -> List[SKURecord]:
+        """
+        SKUs of a mapping regex. Pinned mappings are resolved by SKU id lookups, and only the SKUs unknown
+        to the pins are matched against the regex. The whole catalog is matched if the mapping isn't pinned
+        or any of its pinned SKUs is gone.
+
+        :param kind: mapping kind, see `sku_mapping_key`
+        """
+        key = sku_mapping_key(kind, name)
+        pinned = self.sku_pins.get(key, usage_type, regex)
+        if pinned is not None:
+            sku_ids = list(dict.fromkeys(
+                sku_id for region, ids in pinned.items() if self.scope.accepts_region(region) for sku_id in ids
+            ))
+            records = [self.sku_catalog.find(usage_type, sku_id) for sku_id in sku_ids]
+            missing = [sku_id for sku_id, record in zip(sku_ids, records) if record is None]
+            if not missing:
+                pattern = re.compile(regex)
+                new_records = [x for x in self._get_new_skus(usage_type) if pattern.search(x.description)]
+                if new_records:
+                    records.extend(new_records)
+                    self.sku_pins.pin(key, usage_type, regex, records, self.scope.accepts_region)
+                self._sku_resolutions['pinned'] += 1
+                return records
+            self.logger.info(f'[SKUPins] Pinned {key} ({usage_type}) SKUs {missing} are gone, resolving by regex')
+
+        records = [x for x in self.skus[usage_type] if re.search(regex, x.description)]
+        self.sku_pins.pin(key, usage_type, regex, records, self.scope.accepts_region)
+        self._sku_resolutions['regex'] += 1
+        return records
+
+    def _get_new_skus(self, usage_type: UsageType) -> List[SKURecord]:
+        new_skus = self._new_skus.get(usage_type)
+        if new_skus is None:
+            new_skus = self._new_skus[usage_type] = [
+                x for x in self.skus[usage_type] if not self.sku_pins.is_known(usage_type, x.sku_id)
+            ]
+        return new_skus
+
     def calculate_regional_sku_price(
         self,
         region: str,
         available_skus: list
     ) -> float:
-        regional_skus = list(filter(lambda x: region in x['regions'], available_skus))
+        regional_skus = list(filter(lambda x: region in x.regions, available_skus))
         if len(regional_skus) == 0:
             raise ZeroSKURegexMatch()
         if len(regional_skus) != 1:
@@ -338,51 +531,11 @@ class InstanceScraper:
                 #  For now, I decided that selecting SKU with the lowest price is the best strategy.
                 self.logger.warning(f'Using the SKU with the lowest price in order to resolve SKU conflict.')
                 return min(
-                    [x['pricing']['unit_price_units'] + x['pricing']['unit_price_nanos'] * 10 ** (-9) for x in regional_skus]
+                    [x.price for x in regional_skus]
                 )
             raise MultipleSKURegexMatch()
         regional_sku = regional_skus[0]
-        return regional_sku['pricing']['unit_price_units'] + regional_sku['pricing']['unit_price_nanos'] * 10 ** (-9)
-
-    def calculate_regional_cpu_price(
-        self,
-        machine_name: str,
-        cpu: float,
-        region: str,
-        available_skus: list
-    ) -> Optional[float]:
-        try:
-            return cpu * self.calculate_regional_sku_price(region, available_skus)
-        except ZeroSKURegexMatch:
-            self.logger.warning(
-                f'Zero CPU SKUs are found for machine {machine_name} in region {region}'
-            )
-            return None
-        except MultipleSKURegexMatch:
-            self.logger.error(
-                f'Multiple CPU SKUs are found for machine {machine_name} in region {region}'
-            )
-            return None
-
-    def calculate_regional_ram_price(
-        self,
-        machine_name: str,
-        ram: float,
-        region: str,
-        available_skus: list
-    ) -> Optional[float]:
-        try:
-            return ram * self.calculate_regional_sku_price(region, available_skus)
-        except ZeroSKURegexMatch:
-            self.logger.warning(
-                f'Zero RAM SKUs are found for machine {machine_name} in region {region}'
-            )
-            return None
-        except MultipleSKURegexMatch:
-            self.logger.error(
-                f'Multiple RAM SKUs are found for machine {machine_name} in region {region}'
-            )
-            return None
+        return regional_sku.price
 
     def calculate_regional_instance_price(
         self,
@@ -403,45 +556,72 @@ class InstanceScraper:
             )
             return None
 
-    def calculate_regional_gpu_price(
+    def _resolve_regional_rates(
         self,
-        machine_name: str,
-        gpus: float,
-        region: str,
+        sku_kind: str,
+        name: str,
         available_skus: list
-    ) -> Optional[float]:
-        try:
-            return gpus * self.calculate_regional_sku_price(region, available_skus)
-        except ZeroSKURegexMatch:
-            self.logger.warning(
-                f'Zero GPU SKUs are found for machine {machine_name} in region {region}'
-            )
-            return None
-        except MultipleSKURegexMatch:
-            self.logger.error(
-                f'Multiple GPU SKUs are found for machine {machine_name} in region {region}'
-            )
-            return None
+    ) -> Dict[str, float]:
+        """
+        Resolves SKU unit price for every region covered by the provided SKUs.
 
-    def calculate_regional_local_ssd_price(
-        self,
-        machine_name: str,
-        local_ssd: float,
-        region: str,
-        available_skus: list
-    ) -> Optional[float]:
-        try:
-            return local_ssd * self.calculate_regional_sku_price(region, available_skus)
-        except ZeroSKURegexMatch:
-            self.logger.warning(
-                f'Zero LocalSSD SKUs are found for machine {machine_name} in region {region}'
-            )
-            return None
-        except MultipleSKURegexMatch:
-            self.logger.error(
-                f'Multiple LocalSSD SKUs are found for machine {machine_name} in region {region}'
-            )
-            return None
+        :return: region -> unit price
+        """
+        rates = {}
+        for region in sorted(set(region for sku in available_skus for region in sku.regions)):
+            if not self.scope.accepts_region(region):
+                continue
+            try:
+                rates[region] = self.calculate_regional_sku_price(region, available_skus)
+            except MultipleSKURegexMatch:
+                self.logger.error(
+                    f'Multiple {sku_kind} SKUs are found for {name} in region {region}'
+                )
+        return rates
+
+    def _calculate_unit_rates(self, usage_type: UsageType):
+        """
+        Resolves (family, region) -> (vCPU, RAM GB), GPU and LocalSSD GB hourly rates for provided usage type
+        and saves them into `self.unit_rates`.
+        """
+        self.logger.info(f'[GetUnitRates({usage_type})] Started')
+
+        local_ssd_price_regex = self.storage['LocalSSD'].skus.get_usage_type(usage_type)
+        if local_ssd_price_regex is not None:
+            local_ssd_skus = self._match_skus('storage', 'LocalSSD', usage_type, local_ssd_price_regex)
+            for region, rate in self._resolve_regional_rates('LocalSSD', 'LocalSSD', local_ssd_skus).items():
+                # LocalSSD SKU provides pricing per month.
+                self.unit_rates.set_local_ssd_rate(region, usage_type, rate / AVG_HOURS_PER_MONTH)
+
+        for gpu_name, gpu_info in self.gpus.items():
+            gpu_price_regex = gpu_info.skus.get_usage_type(usage_type)
+            if gpu_price_regex is None:
+                continue
+            gpu_skus = self._match_skus('gpu', gpu_name, usage_type, gpu_price_regex)
+            for region, rate in self._resolve_regional_rates('GPU', gpu_name, gpu_skus).items():
+                self.unit_rates.set_gpu_rate(gpu_name, region, usage_type, rate)
+
+        for machine_family, family_skus in self.machine_family_sku.items():
+            # f1/g1 machines are priced per instance
+            if family_skus.instance is not None or not self.scope.accepts_family(machine_family):
+                continue
+            cpu_price_regex = family_skus.cpu.get_usage_type(usage_type)
+            ram_price_regex = family_skus.ram.get_usage_type(usage_type)
+            if cpu_price_regex is None or ram_price_regex is None:
+                continue
+
+            # CPU and RAM skus are common for the whole family
+            family_cpu_skus = self._match_skus('cpu', machine_family, usage_type, cpu_price_regex)
+            family_ram_skus = self._match_skus('ram', machine_family, usage_type, ram_price_regex)
+            cpu_rates = self._resolve_regional_rates('CPU', machine_family, family_cpu_skus)
+            ram_rates = self._resolve_regional_rates('RAM', machine_family, family_ram_skus)
+            for region in cpu_rates:
+                if region in ram_rates:
+                    self.unit_rates.set_family_rate(
+                        machine_family, region, usage_type, cpu_rates[region], ram_rates[region]
+                    )
+
+        self.logger.info(f'[GetUnitRates({usage_type})] Done')
 
     def _calculate_pricing(self, usage_type: UsageType):
         """
@@ -456,13 +636,13 @@ class InstanceScraper:
         """
         self.logger.info(f'[GetPricing({usage_type})] Started')
         machines = self.machines
+        self._sku_resolutions = {'pinned': 0, 'regex': 0}
 
-        local_ssd_price_regex = self.storage['LocalSSD'].skus.get_usage_type(usage_type)
-        local_ssd_skus = list(
-            filter(lambda x: re.search(local_ssd_price_regex, x['description']), self.skus[usage_type])
-        )
+        self._calculate_unit_rates(usage_type)
 
         for machine_family in self.machine_family_sku:
+            if not self.scope.accepts_family(machine_family):
+                continue
             if machine_family not in self.pricing_data:
                 self.pricing_data[machine_family] = {}
 
@@ -481,14 +661,6 @@ class InstanceScraper:
             if cpu_price_regex is None or ram_price_regex is None:
                 self.logger.debug(f"[GetPricing({usage_type})] {usage_type} pricing is not supported for machine family {machine_family}")
                 continue
-            self.logger.debug(cpu_price_regex)
-            self.logger.debug(ram_price_regex)
-
-            # CPU and RAM skus are common for the whole family
-            machine_cpu_skus = list(
-                filter(lambda x: re.search(cpu_price_regex, x['description']), self.skus[usage_type]))
-            machine_ram_skus = list(
-                filter(lambda x: re.search(ram_price_regex, x['description']), self.skus[usage_type]))
 
             for machine_name in family_machines:
                 self.logger.debug(f'[GetPricing({usage_type})] Processing {machine_name}...')
@@ -502,69 +674,43 @@ class InstanceScraper:
                         'regions': {},
                     }
                 machine = machines[machine_name]
-
-                _machine_general_info = self.general_machines_info[machine_name].model_dump(by_alias=True)
-
-                if (self.general_machines_info[machine_name].gpu_support and
-                        self.general_machines_info[machine_name].gpu_count_by_default):
-                    gpu_name = self.general_machines_info[machine_name].default_gpu
-                    gpu_price_regex = self.gpus[gpu_name].skus.get_usage_type(usage_type)
-                    machine_gpu_skus = list(
-                        filter(lambda x: re.search(gpu_price_regex, x['description']), self.skus[usage_type])
-                    )
-                else:
-                    machine_gpu_skus = None
+                machine_general_info = self.general_machines_info[machine_name]
 
                 for region in machine['regions']:
-                    price = 0
-
-                    cpu_price = self.calculate_regional_cpu_price(
-                        machine_name=machine_name,
-                        cpu=machine['cpu'],
-                        region=region,
-                        available_skus=machine_cpu_skus
-                    )
-                    if cpu_price is None:
-                        continue
-                    price += cpu_price
-
-                    ram_price = self.calculate_regional_ram_price(
-                        machine_name=machine_name,
-                        ram=machine['ram'],
-                        region=region,
-                        available_skus=machine_ram_skus
-                    )
-                    if ram_price is None:
-                        continue
-                    price += ram_price
-
-                    if (self.general_machines_info[machine_name].gpu_support and
-                            self.general_machines_info[machine_name].gpu_count_by_default):
-                        gpu_price = self.calculate_regional_gpu_price(
-                            machine_name=machine_name,
-                            gpus=self.general_machines_info[machine_name].gpu_count_by_default,
-                            region=region,
-                            available_skus=machine_gpu_skus
-                        )
-                        if gpu_price:
-                            price += gpu_price
-
-                    if (self.general_machines_info[machine_name].local_ssd_support and
-                            self.general_machines_info[machine_name].local_ssd_enabled_by_default):
-                        local_ssd_price = self.calculate_regional_local_ssd_price(
-                            machine_name=machine_name,
-                            local_ssd=self.general_machines_info[machine_name].local_ssd_default_size,
-                            region=region,
-                            available_skus=local_ssd_skus
+                    family_rate = self.unit_rates.get_family_rate(machine_family, region, usage_type)
+                    if family_rate is None:
+                        self.logger.warning(
+                            f'Zero CPU/RAM SKUs are found for machine {machine_name} in region {region}'
                         )
-                        if local_ssd_price:
-                            # LocalSSD SKU provides pricing per month. That's local_ssd_price should be divided
-                            price += local_ssd_price / AVG_HOURS_PER_MONTH
+                        continue
+                    price = machine['cpu'] * family_rate[0] + machine['ram'] * family_rate[1]
+
+                    if machine_general_info.gpu_support and machine_general_info.gpu_count_by_default:
+                        gpu_rate = self.unit_rates.get_gpu_rate(machine_general_info.default_gpu, region, usage_type)
+                        if gpu_rate:
+                            price += machine_general_info.gpu_count_by_default * gpu_rate
+                        else:
+                            self.logger.warning(
+                                f'Zero GPU SKUs are found for machine {machine_name} in region {region}'
+                            )
+
+                    if machine_general_info.local_ssd_support and machine_general_info.local_ssd_enabled_by_default:
+                        local_ssd_rate = self.unit_rates.get_local_ssd_rate(region, usage_type)
+                        if local_ssd_rate:
+                            price += machine_general_info.local_ssd_default_size * local_ssd_rate
+                        else:
+                            self.logger.warning(
+                                f'Zero LocalSSD SKUs are found for machine {machine_name} in region {region}'
+                            )
 
                     if region not in self.pricing_data[machine_family][machine_name]['regions']:
                         self.pricing_data[machine_family][machine_name]['regions'][region] = {}
                     self.pricing_data[machine_family][machine_name]['regions'][region][usage_type] = nice(price)
 
+        self.logger.info(
+            f'[GetPricing({usage_type})] SKU mappings resolved by pinned ids: {self._sku_resolutions["pinned"]}, '
+            f'by regex: {self._sku_resolutions["regex"]}'
+        )
         self.logger.info(f'[GetPricing({usage_type})] Done')
         return self.flat_pricing_data
 
@@ -619,17 +765,53 @@ class InstanceScraper:
 
     def dump_flat_pricing_data(
         self,
-        flat_pricing_data_file_path: str = 'flat_gcp_machines_pricing.yaml'
+        flat_pricing_data_file_path: str = 'flat_gcp_machines_pricing.yaml',
+        partition_by: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        use_processes: bool = False
     ):
+        """
+        :param partition_by: `region`, `family` or `series`. If set, `flat_pricing_data_file_path` is a directory
+            with one dump per partition and a manifest, see `write_partitioned_dump`.
+            A `.gcpm` file path is written as a memory-mappable binary snapshot, see `write_binary_snapshot`.
+        """
         metadata = {
             'last_time_updated': int(datetime.now().timestamp())
         }
+        if self.currencies:
+            metadata['currency_rates'] = {x: self.currency_rates.get_rate(x) for x in self.currencies}
+        if partition_by is None and flat_pricing_data_file_path.lower().endswith(BINARY_SNAPSHOT_EXTENSION):
+            write_binary_snapshot(
+                flat_pricing_data_file_path,
+                [x.model_dump() for x in self.flat_pricing_data],
+                metadata=metadata,
+                zones=self.zone_availability.to_dict()
+            )
+            return
+        if partition_by is not None:
+            write_partitioned_dump(
+                flat_pricing_data_file_path,
+                [x.model_dump() for x in self.flat_pricing_data],
+                partition_by=partition_by,
+                metadata=metadata,
+                zones=self.zone_availability.to_dict(),
+                max_workers=max_workers,
+                use_processes=use_processes
+            )
+            return
         with open(flat_pricing_data_file_path, 'w') as file:
             yaml.dump({
                 'metadata': metadata,
-                'machines': [x.model_dump() for x in self.flat_pricing_data]
+                'machines': [x.model_dump() for x in self.flat_pricing_data],
+                'zones': self.zone_availability.to_dict()
             }, file)
 
+    def dump_unit_rates(
+        self,
+        unit_rates_file_path: str = 'gcp_unit_rates.yaml'
+    ):
+        self.unit_rates.dump(unit_rates_file_path)
+
     def dump_pricing_info(
         self,
         raw_pricing_data_file_path: str = 'raw_gcp_machines_pricing.yaml',
@@ -649,12 +831,113 @@ class InstanceScraper:
         with open(flat_pricing_data_file_path, 'w') as file:
             yaml.dump({
                 'metadata': metadata,
-                'machines': [x.model_dump() for x in self.flat_pricing_data]
+                'machines': [x.model_dump() for x in self.flat_pricing_data],
+                'zones': self.zone_availability.to_dict()
             }, file)
 
 
+    def calculate_pricing(self):
+        # results of the previous run must not leak into the new one
+        self.pricing_data = {}
+        self.unit_rates.clear()
+        self._new_skus = {}
+        passes = [
+            (usage_type, calculate) for usage_type, calculate in [
+                (OnDemandUsage, self.calculate_ondemand_pricing),
+                ('sud', self.calculate_sud_pricing),
+                (SpotUsage, self.calculate_spot_pricing),
+                (CommitmentOneYearUsage, self.calculate_cud1y_pricing),
+                (CommitmentThreeYearsUsage, self.calculate_cud3y_pricing),
+            ]
+            if self.scope.accepts_usage_type(usage_type)
+        ]
+        completed = self._load_pricing_checkpoint([usage_type for usage_type, _ in passes])
+        for usage_type, calculate in passes[completed:]:
+            calculate()
+            self._save_checkpoint(
+                f'pricing/{usage_type}',
+                {
+                    'pricing_data': self.pricing_data,
+                    'unit_rates': self.unit_rates.to_dict(),
+                    'sku_pins': self.sku_pins.to_dict()
+                }
+            )
+        if self.scope.is_full:
+            # all mappings were resolved against the catalog
+            for usage_type, records in self.skus.items():
+                self.sku_pins.set_known_sku_ids(usage_type, (x.sku_id for x in records))
+        self._make_flat_pricing_data()
+
+    def _load_pricing_checkpoint(self, usage_types: List[str]) -> int:
+        """
+        Restores the state after the last checkpointed pricing pass.
+
+        :return: number of completed passes
+        """
+        if self.checkpoints is None:
+            return 0
+        completed = 0
+        while completed < len(usage_types) and self.checkpoints.has(f'pricing/{usage_types[completed]}'):
+            completed += 1
+        if completed:
+            state = self.checkpoints.load(f'pricing/{usage_types[completed - 1]}')
+            self.pricing_data = state['pricing_data']
+            self.unit_rates = UnitRatesTable.from_dict(state['unit_rates'])
+            if 'sku_pins' in state:
+                self.sku_pins = SKUPins.from_dict(state['sku_pins'])
+            self.logger.info(
+                f'[Checkpoint] Loaded pricing passes {usage_types[:completed]} of run {self.checkpoints.run_id}'
+            )
+        return completed
+
+    def get_sku_pins(self, file_path: str) -> SKUPins:
+        """
+        Loads SKU ids pinned by the previous runs if the file exists. Pricing resolves the pinned mappings
+        by SKU ids and pins the others, see `SKUPins`.
+        """
+        if os.path.exists(file_path):
+            self.logger.info(f'[GetSKUPins] Loading from {file_path}')
+            self.sku_pins = SKUPins.load(file_path)
+        return self.sku_pins
+
+    def dump_sku_pins(self, file_path: str):
+        self.logger.info(f'[GetSKUPins] Saving {len(self.sku_pins)} pinned mappings into {file_path}')
+        self.sku_pins.dump(file_path)
+
+    def get_currency_rates(self, currencies: Iterable[str], load=False, dump=False) -> CurrencyRates:
+        """
+        Resolves conversion rates from USD for the currencies of the flat pricing data.
+        Rates are loaded from the cache file if `load` is set, the missing ones cost one single-SKU catalog
+        request per currency instead of paging the whole catalog in every currency.
+        """
+        self.currencies = [x.upper() for x in currencies]
+        if not self.currencies:
+            return self.currency_rates
+        self.logger.info('[GetCurrencyRates] Started')
+        rates = CurrencyRates()
+        if load and os.path.exists(self.GCP_CURRENCY_RATES_DATA):
+            self.logger.info(f'[GetCurrencyRates] Loading from file {self.GCP_CURRENCY_RATES_DATA}')
+            rates = CurrencyRates.load(self.GCP_CURRENCY_RATES_DATA)
+        for currency in rates.missing(self.currencies):
+            rate = self.clients.get_currency_conversion_rate(self.GCP_COMPUTE_ENGINE_SERVICE_NAME, currency)
+            self.logger.info(f'[GetCurrencyRates] {currency} rate: {rate}')
+            rates.set_rate(currency, rate)
+        if dump:
+            self.logger.info(f'[GetCurrencyRates] Saving rates into {self.GCP_CURRENCY_RATES_DATA}')
+            rates.dump(self.GCP_CURRENCY_RATES_DATA)
+        self.currency_rates = rates
+        self.logger.info('[GetCurrencyRates] Done')
+        return rates
+
     def _make_flat_pricing_data(self):
-        self.flat_pricing_data = []
+        # the list is replaced once it's complete, readers of the previous one never see a partial result
+        flat_pricing_data = []
+        # (usage type, currency column, rate) of every extra currency price column
+        conversions = [
+            (usage_type, currency_column(usage_type, currency), self.currency_rates.get_rate(currency))
+            for currency in self.currencies
+            for usage_type in SCOPE_USAGE_TYPES
+        ]
         for machine_family in self.pricing_data:
             for machine_name in self.pricing_data[machine_family]:
                 _machine_general_info = self.general_machines_info[machine_name].model_dump(by_alias=True)
@@ -662,25 +945,194 @@ class InstanceScraper:
                     _machine_general_info['region'] = region
                     for usage_type, price in self.pricing_data[machine_family][machine_name]['regions'][region].items():
                         _machine_general_info[usage_type] = price
+                    for usage_type, column, rate in conversions:
+                        price = _machine_general_info[usage_type]
+                        _machine_general_info[column] = None if price is None else nice(price * rate)
 
-                    self.flat_pricing_data.append(
+                    flat_pricing_data.append(
                         ScrapedMachineInfoModel(
                             **_machine_general_info,
                         )
                     )
+        self.flat_pricing_data = flat_pricing_data
+
+    def _load_checkpoint(self, name: str) -> Optional[Any]:
+        if self.checkpoints is None or not self.checkpoints.has(name):
+            return None
+        self.logger.debug(f'[Checkpoint] Loaded {name} of run {self.checkpoints.run_id}')
+        return self.checkpoints.load(name)
+
+    def _save_checkpoint(self, name: str, data: Any):
+        if self.checkpoints is not None:
+            self.checkpoints.save(name, data)
+
+    @property
+    def run_id(self) -> Optional[str]:
+        """
+        Id of the last checkpointed run, None if checkpoints are disabled.
+        """
+        return None if self.checkpoints is None else self.checkpoints.run_id
+
+    def set_scope(
+        self,
+        regions: Optional[Iterable[str]] = None,
+        families: Optional[Iterable[str]] = None,
+        usage_types: Optional[Iterable[str]] = None
+    ) -> ScrapeScope:
+        """
+        Limits the next runs to the provided regions, machine families (`n2`, `c3`, ...) and usage types
+        (`ondemand`, `sud`, `spot`, `cud1y`, `cud3y`). None means no limit.
+
+        Zones out of the scope regions are not listed, SKUs which can't price the scope are dropped while paging
+        and the pricing loops skip the other families and usage types.
+        """
+        scope = ScrapeScope(regions=regions, families=families, usage_types=usage_types)
+        if scope.families is not None:
+            unknown = scope.families - set(self.machine_family_sku)
+            if unknown:
+                raise ValueError(
+                    f'Unknown machine families: {sorted(unknown)}. Loaded families: {sorted(self.machine_family_sku)}'
+                )
+        self.scope = scope
+        self._scope_sku_patterns = None if scope.families is None else self._make_scope_sku_patterns()
+        return scope
+
+    def _make_scope_sku_patterns(self) -> Dict[str, re.Pattern]:
+        patterns = {}
+        for usage_type in self.scope.priced_usage_types:
+            regexes = []
+            for family in sorted(self.scope.families):
+                family_skus = self.machine_family_sku[family]
+                for skus in (family_skus.cpu, family_skus.ram, family_skus.instance):
+                    if skus is not None:
+                        regexes.append(skus.get_usage_type(usage_type))
+            # GPU and LocalSSD rates are kept for quotes and combinations of the scope families
+            regexes.extend(x.skus.get_usage_type(usage_type) for x in self.gpus.values())
+            regexes.extend(x.skus.get_usage_type(usage_type) for x in self.storage.values())
+            regexes = [x for x in regexes if x is not None]
+            if regexes:
+                patterns[usage_type] = re.compile('|'.join(f'(?:{x})' for x in regexes))
+        return patterns
+
+    def _start_run(
+        self,
+        dump: bool,
+        stages: Optional[Iterable[str]],
+        regions: Optional[Iterable[str]],
+        families: Optional[Iterable[str]],
+        usage_types: Optional[Iterable[str]],
+        run_id: Optional[str]
+    ) -> set:
+        stages = self._check_stages(stages)
+        scope = self.set_scope(regions=regions, families=families, usage_types=usage_types)
+        if not scope.is_full:
+            if dump:
+                raise ValueError('Scoped runs can not dump machine types and SKUs caches: the caches would be partial.')
+            self.logger.info(f'[Run] {scope}')
+
+        self.checkpoints = None
+        if self.checkpoint_dir is not None:
+            self.checkpoints = RunCheckpoints(self.checkpoint_dir, run_id, params={'scope': scope.to_dict()})
+            self.logger.info(
+                f'[Checkpoint] {"Resuming" if self.checkpoints.resumed else "Started"} run {self.checkpoints.run_id}'
+            )
+        elif run_id is not None:
+            raise ValueError('run_id is supported only if checkpoint_dir is set.')
+        self.clients.reset_request_budget()
+        return stages
+
+    def _finish_run(self):
+        if self.checkpoints is not None:
+            self.checkpoints.complete()
+            self.logger.info(f'[Checkpoint] Run {self.checkpoints.run_id} is completed')
+
+    def _check_stages(self, stages: Optional[Iterable[str]]) -> set:
+        stages = set(self.STAGES if stages is None else stages)
+        unknown = stages - set(self.STAGES)
+        if unknown:
+            raise ValueError(f'Unknown stages: {sorted(unknown)}. Supported stages: {self.STAGES}')
+        for stage, file_path in [('machine-types', self.GCP_INSTANCES_DATA), ('skus', self.GCP_SKU_DATA)]:
+            if stage not in stages and 'pricing' in stages and not os.path.exists(file_path):
+                raise FileNotFoundError(
+                    f'Stage {stage} is skipped, but its cache file {file_path} does not exist. Run it with dump=True first.'
+                )
+        return stages
 
     def run(
         self,
         dump=False,
-        load=False
+        load=False,
+        stages: Optional[Iterable[str]] = None,
+        regions: Optional[Iterable[str]] = None,
+        families: Optional[Iterable[str]] = None,
+        usage_types: Optional[Iterable[str]] = None,
+        run_id: Optional[str] = None,
+        currencies: Optional[Iterable[str]] = None,
+        sku_pins_path: Optional[str] = None
     ):
-        self.get_zones()
-        self.get_regions()
-        self.get_machine_types(load=load, dump=dump)
-        self.init_skus(load=load, dump=dump)
-        self.calculate_ondemand_pricing()
-        self.calculate_sud_pricing()
-        self.calculate_spot_pricing()
-        self.calculate_cud1y_pricing()
-        self.calculate_cud3y_pricing()
-        self._make_flat_pricing_data()
+        """
+        :param stages: stages to run (see `STAGES`), all by default.
+            Data of the skipped `machine-types` and `skus` stages is loaded from their cache files.
+        :param regions: regions to scrape, all by default. See `set_scope` for `families` and `usage_types` too.
+            Caches are filtered by the scope on load, and scoped runs can't dump them.
+        :param run_id: checkpointed run to resume (requires `checkpoint_dir`). A new run is started if None,
+            its id is available as `run_id`.
+        :param currencies: extra currencies of the flat pricing data (e.g. EUR, GBP), every price gets
+            a `<usage type>_<currency>` column. See `get_currency_rates`.
+        :param sku_pins_path: SKU pins file: mappings pinned there are priced by SKU ids, and the pins
+            of the run are saved back. See `SKUPins`.
+        """
+        stages = self._start_run(dump, stages, regions, families, usage_types, run_id)
+        if 'machine-types' in stages:
+            self.get_zones()
+            self.get_regions()
+            self.get_machine_types(load=load, dump=dump)
+        elif 'pricing' in stages:
+            self.get_machine_types(load=True)
+        if 'skus' in stages:
+            self.init_skus(load=load, dump=dump)
+        elif 'pricing' in stages:
+            self.init_skus(load=True)
+        if 'pricing' in stages:
+            self.get_currency_rates(currencies or [], load=load or 'skus' not in stages, dump=dump)
+            if sku_pins_path is not None:
+                self.get_sku_pins(sku_pins_path)
+            self.calculate_pricing()
+            if sku_pins_path is not None:
+                self.dump_sku_pins(sku_pins_path)
+        self._finish_run()
+
+    async def arun(
+        self,
+        dump=False,
+        load=False,
+        max_concurrency: int = 8,
+        stages: Optional[Iterable[str]] = None,
+        regions: Optional[Iterable[str]] = None,
+        families: Optional[Iterable[str]] = None,
+        usage_types: Optional[Iterable[str]] = None,
+        run_id: Optional[str] = None,
+        currencies: Optional[Iterable[str]] = None,
+        sku_pins_path: Optional[str] = None
+    ):
+        """
+        Async version of `run`. API calls don't block the event loop, pricing is calculated in a worker thread.
+        """
+        stages = self._start_run(dump, stages, regions, families, usage_types, run_id)
+        if 'machine-types' in stages:
+            await asyncio.gather(self.aget_zones(), self.aget_regions())
+            await self.aget_machine_types(load=load, dump=dump, max_concurrency=max_concurrency)
+        elif 'pricing' in stages:
+            await self.aget_machine_types(load=True)
+        if 'skus' in stages:
+            await self.ainit_skus(load=load, dump=dump)
+        elif 'pricing' in stages:
+            await self.ainit_skus(load=True)
+        if 'pricing' in stages:
+            await asyncio.to_thread(self.get_currency_rates, currencies or [], load or 'skus' not in stages, dump)
+            if sku_pins_path is not None:
+                await asyncio.to_thread(self.get_sku_pins, sku_pins_path)
+            await asyncio.to_thread(self.calculate_pricing)
+            if sku_pins_path is not None:
+                await asyncio.to_thread(self.dump_sku_pins, sku_pins_path)
+        await asyncio.to_thread(self._finish_run)
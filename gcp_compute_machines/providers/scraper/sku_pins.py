@@ -0,0 +1,117 @@
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+import yaml
+
+from gcp_compute_machines.constants import *
+from gcp_compute_machines.providers.scraper.models.skus.sku_record import SKURecord
+
+_Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+_Dumper = getattr(yaml, 'CSafeDumper', yaml.SafeDumper)
+
+
+def sku_mapping_key(kind: str, name: str) -> str:
+    """
+    :param kind: `cpu`, `ram`, `instance`, `gpu` or `storage`
+    :param name: machine family, GPU or storage name
+    :return: pins key of a SKU mapping, e.g. `cpu/c4`
+    """
+    return f'{kind}/{name}'
+
+
+class SKUPins:
+    """
+    SKU ids resolved by the mapping regexes: mapping key -> usage type -> {regex, regions: region -> SKU ids}.
+
+    Pinned mappings are priced by id lookups, so they survive rewording of the SKU descriptions. A mapping is
+    resolved by its regex again only if the regex is changed or any pinned SKU of the run regions is gone.
+    SKU ids of the catalog the pins were resolved against are kept too: only SKUs added to the catalog
+    later (e.g. new regions) are matched against the regexes of the pinned mappings. The known ids are
+    replaced by full runs only, a scoped run doesn't match its catalog against all mappings.
+    """
+
+    def __init__(
+        self,
+        pins: Optional[Dict[str, Dict[str, dict]]] = None,
+        known_sku_ids: Optional[Dict[str, Iterable[str]]] = None,
+        last_time_updated: Optional[int] = None
+    ):
+        self.pins: Dict[str, Dict[str, dict]] = pins or {}
+        # usage type -> ids of the SKUs which were matched against all mappings
+        self.known_sku_ids: Dict[str, Set[str]] = {k: set(v) for k, v in (known_sku_ids or {}).items()}
+        self.last_time_updated = last_time_updated
+
+    def __len__(self) -> int:
+        return sum(len(usage_types) for usage_types in self.pins.values())
+
+    def get(self, key: str, usage_type: UsageType, regex: str) -> Optional[Dict[str, List[str]]]:
+        """
+        :return: region -> pinned SKU ids, None if the mapping isn't pinned or is pinned with another regex
+        """
+        pin = self.pins.get(key, {}).get(usage_type)
+        if pin is None or pin['regex'] != regex:
+            return None
+        return pin['regions']
+
+    def pin(
+        self,
+        key: str,
+        usage_type: UsageType,
+        regex: str,
+        records: Iterable[SKURecord],
+        accepts_region: Callable[[str], bool]
+    ):
+        """
+        Pins SKUs resolved for the regions accepted by `accepts_region`, pins of the other regions are kept
+        if the regex is the same.
+        """
+        regions = {}
+        previous = self.get(key, usage_type, regex)
+        if previous is not None:
+            regions = {region: ids for region, ids in previous.items() if not accepts_region(region)}
+        for record in records:
+            for region in record.regions:
+                if accepts_region(region):
+                    ids = regions.setdefault(region, [])
+                    if record.sku_id not in ids:
+                        ids.append(record.sku_id)
+        self.pins.setdefault(key, {})[usage_type] = {'regex': regex, 'regions': dict(sorted(regions.items()))}
+        self.last_time_updated = int(datetime.now().timestamp())
+
+    def is_known(self, usage_type: UsageType, sku_id: str) -> bool:
+        return sku_id in self.known_sku_ids.get(usage_type, ())
+
+    def set_known_sku_ids(self, usage_type: UsageType, sku_ids: Iterable[str]):
+        self.known_sku_ids[usage_type] = set(sku_ids)
+
+    def to_dict(self) -> dict:
+        return {
+            'metadata': {
+                'last_time_updated': self.last_time_updated
+            },
+            'pins': self.pins,
+            'known_sku_ids': {k: sorted(v) for k, v in self.known_sku_ids.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'SKUPins':
+        return cls(
+            data['pins'],
+            known_sku_ids=data.get('known_sku_ids'),
+            last_time_updated=data.get('metadata', {}).get('last_time_updated')
+        )
+
+    def dump(self, file_path: str):
+        with open(file_path, 'w') as file:
+            yaml.dump(self.to_dict(), file, Dumper=_Dumper)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'SKUPins':
+        with open(file_path, 'r') as file:
+            return cls.from_dict(yaml.load(file, Loader=_Loader))
+
+
+__all__ = [
+    'SKUPins',
+    'sku_mapping_key'
+]
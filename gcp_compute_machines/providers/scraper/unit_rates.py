@@ -0,0 +1,169 @@
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+import yaml
+
+from gcp_compute_machines.constants import UsageType
+
+
+def nice(number: float, digits=5) -> float:
+    return round(number, digits)
+
+
+class UnitRatesTable:
+    """
+    Resolved hourly unit prices per machine family, GPU and LocalSSD.
+
+    Rates are kept exactly as the scraper resolved them from the SKU catalog:
+        * (family, region, usage_type) -> (vCPU hourly rate, RAM GB hourly rate)
+        * (gpu, region, usage_type) -> GPU hourly rate
+        * (region, usage_type) -> LocalSSD GB hourly rate
+
+    Every lookup is a single dict access, so any machine shape can be priced without
+    re-running the scrape or adding rows into the `*-machines.csv` mappings.
+    """
+
+    def __init__(self):
+        self.families: Dict[Tuple[str, str, str], Tuple[float, float]] = {}
+        self.gpus: Dict[Tuple[str, str, str], float] = {}
+        self.local_ssd: Dict[Tuple[str, str], float] = {}
+
+    def __len__(self) -> int:
+        return len(self.families) + len(self.gpus) + len(self.local_ssd)
+
+    def clear(self):
+        self.families.clear()
+        self.gpus.clear()
+        self.local_ssd.clear()
+
+    # region setters
+
+    def set_family_rate(self, family: str, region: str, usage_type: UsageType, vcpu_rate: float, ram_rate: float):
+        self.families[(family, region, usage_type)] = (vcpu_rate, ram_rate)
+
+    def set_gpu_rate(self, gpu: str, region: str, usage_type: UsageType, rate: float):
+        self.gpus[(gpu, region, usage_type)] = rate
+
+    def set_local_ssd_rate(self, region: str, usage_type: UsageType, rate: float):
+        self.local_ssd[(region, usage_type)] = rate
+
+    # endregion
+
+    # region getters
+
+    def get_family_rate(self, family: str, region: str, usage_type: UsageType) -> Optional[Tuple[float, float]]:
+        return self.families.get((family, region, usage_type))
+
+    def get_gpu_rate(self, gpu: str, region: str, usage_type: UsageType) -> Optional[float]:
+        return self.gpus.get((gpu, region, usage_type))
+
+    def get_local_ssd_rate(self, region: str, usage_type: UsageType) -> Optional[float]:
+        return self.local_ssd.get((region, usage_type))
+
+    # endregion
+
+    def quote(
+        self,
+        family: str,
+        region: str,
+        usage_type: UsageType,
+        cpu: float,
+        ram: float,
+        gpu: Optional[str] = None,
+        gpu_count: int = 0,
+        local_ssd_gb: float = 0,
+    ) -> Optional[float]:
+        """
+        Calculates hourly price of an arbitrary machine shape.
+
+        Custom machines are priced with `<family>-custom` rates when such a family is present in the
+        SKU mappings (e.g. `n2-custom`), otherwise pass the predefined family name.
+
+        :return: hourly price or None if any of the required unit rates is unknown
+        """
+        if gpu_count and gpu is None:
+            raise ValueError(f'gpu is required for gpu_count={gpu_count}')
+        family_rate = self.families.get((family, region, usage_type))
+        if family_rate is None:
+            return None
+        price = cpu * family_rate[0] + ram * family_rate[1]
+        if gpu_count:
+            gpu_rate = self.gpus.get((gpu, region, usage_type))
+            if gpu_rate is None:
+                return None
+            price += gpu_count * gpu_rate
+        if local_ssd_gb:
+            local_ssd_rate = self.local_ssd.get((region, usage_type))
+            if local_ssd_rate is None:
+                return None
+            price += local_ssd_gb * local_ssd_rate
+        return nice(price)
+
+    def to_dict(self) -> dict:
+        """
+        :return:
+            families:
+                family:
+                    region:
+                        usage_type: {vcpu: rate, ram: rate}
+            gpus:
+                gpu:
+                    region:
+                        usage_type: rate
+            local_ssd:
+                region:
+                    usage_type: rate
+        """
+        families = {}
+        for (family, region, usage_type), (vcpu_rate, ram_rate) in self.families.items():
+            families.setdefault(family, {}).setdefault(region, {})[usage_type] = {
+                'vcpu': vcpu_rate,
+                'ram': ram_rate
+            }
+        gpus = {}
+        for (gpu, region, usage_type), rate in self.gpus.items():
+            gpus.setdefault(gpu, {}).setdefault(region, {})[usage_type] = rate
+        local_ssd = {}
+        for (region, usage_type), rate in self.local_ssd.items():
+            local_ssd.setdefault(region, {})[usage_type] = rate
+        return {
+            'families': families,
+            'gpus': gpus,
+            'local_ssd': local_ssd
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'UnitRatesTable':
+        table = cls()
+        for family, regions in data.get('families', {}).items():
+            for region, usage_types in regions.items():
+                for usage_type, rates in usage_types.items():
+                    table.set_family_rate(family, region, usage_type, rates['vcpu'], rates['ram'])
+        for gpu, regions in data.get('gpus', {}).items():
+            for region, usage_types in regions.items():
+                for usage_type, rate in usage_types.items():
+                    table.set_gpu_rate(gpu, region, usage_type, rate)
+        for region, usage_types in data.get('local_ssd', {}).items():
+            for usage_type, rate in usage_types.items():
+                table.set_local_ssd_rate(region, usage_type, rate)
+        return table
+
+    def dump(self, file_path: str):
+        metadata = {
+            'last_time_updated': int(datetime.now().timestamp())
+        }
+        with open(file_path, 'w') as file:
+            yaml.dump({
+                'metadata': metadata,
+                'rates': self.to_dict()
+            }, file)
+
+    @classmethod
+    def load(cls, file_path: str) -> 'UnitRatesTable':
+        with open(file_path, 'r') as file:
+            return cls.from_dict(yaml.safe_load(file)['rates'])
+
+
+__all__ = [
+    'UnitRatesTable'
+]
@@ -0,0 +1,2 @@
+from .catalog import iter_sku_catalog, make_sku_catalog, make_machine_types
+from .fake_gcp_server import FakeCatalogServer, FakeComputeServer
@@ -0,0 +1,182 @@
+import csv
+import glob
+import hashlib
+import os
+from typing import Dict, Iterator, List, Optional
+
+import yaml
+from google.cloud import billing_v1
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'providers', 'scraper', 'mappings')
+DEFAULT_REGIONS = ['us-east1', 'us-central1', 'europe-west1', 'europe-west4', 'asia-northeast3']
+
+SKU_USAGE_TYPES = {
+    'ondemand': 'OnDemand',
+    'spot': 'Preemptible',
+    'cud1y': 'Commit1Yr',
+    'cud3y': 'Commit3Yr',
+}
+
+
+def _stable_fraction(seed: str) -> float:
+    return int(hashlib.md5(seed.encode()).hexdigest()[:8], 16) / 0xFFFFFFFF
+
+
+def _description(regex: str, region: str) -> str:
+    # 'C4 Instance Core.*' -> 'C4 Instance Core running in us-east1'
+    return regex.lstrip('^').replace('.*', f' running in {region} ', 1).replace('.*', ' ').strip()
+
+
+def make_sku(
+    sku_id: str,
+    description: str,
+    resource_group: str,
+    usage_type: str,
+    regions: List[str],
+    price: float,
+    usage_unit: str = 'h',
+) -> billing_v1.Sku:
+    units = int(price)
+    return billing_v1.Sku(
+        name=f'services/6F81-5844-456A/skus/{sku_id}',
+        sku_id=sku_id,
+        description=description,
+        category=billing_v1.Category(
+            service_display_name='Compute Engine',
+            resource_family='Compute',
+            resource_group=resource_group,
+            usage_type=usage_type,
+        ),
+        service_regions=regions,
+        pricing_info=[billing_v1.PricingInfo(
+            pricing_expression=billing_v1.PricingExpression(
+                usage_unit=usage_unit,
+                usage_unit_description=usage_unit,
+                base_unit='s',
+                base_unit_description='second',
+                base_unit_conversion_factor=3600,
+                display_quantity=1,
+                tiered_rates=[billing_v1.PricingExpression.TierRate(
+                    start_usage_amount=0,
+                    unit_price={
+                        'currency_code': 'USD',
+                        'units': units,
+                        'nanos': int(round((price - units) * 1e9)),
+                    }
+                )]
+            )
+        )]
+    )
+
+
+def iter_sku_catalog(
+    data_dir: Optional[str] = None,
+    regions: Optional[List[str]] = None,
+    noise_skus: int = 0,
+) -> Iterator[billing_v1.Sku]:
+    """
+    Generates a synthetic Compute Engine SKU catalog which satisfies every mapping regex from `data_dir`
+    with exactly one SKU per region and usage type. SKUs are created lazily, one at a time.
+
+    :param noise_skus: number of extra SKUs from resource groups that are not used for pricing
+    """
+    data_dir = DEFAULT_DATA_DIR if data_dir is None else data_dir
+    regions = DEFAULT_REGIONS if regions is None else regions
+    seen = set()
+
+    def add(resource_group: str, usage_type: str, regex: str, scale: float):
+        for region in regions:
+            description = _description(regex, region)
+            key = (resource_group, usage_type, description)
+            if key in seen:
+                continue
+            seen.add(key)
+            index = len(seen) - 1
+            yield make_sku(
+                sku_id=f'{index:04X}-{index * 7919 % 65536:04X}-FAKE',
+                description=description,
+                resource_group=resource_group,
+                usage_type=SKU_USAGE_TYPES[usage_type],
+                regions=[region],
+                price=scale * (0.5 + _stable_fraction(description + usage_type)),
+            )
+
+    for file_path in sorted(glob.glob(os.path.join(data_dir, '*-machines-sku.yaml'))):
+        with open(file_path, 'r') as file:
+            mappings = yaml.safe_load(file)
+        for family, mapping in mappings.items():
+            for kind, regexes in mapping.items():
+                if kind == 'instance':
+                    resource_group = 'F1Micro' if family == 'f1' else 'G1Small'
+                else:
+                    resource_group = kind.upper()
+                scale = {'cpu': 0.03, 'ram': 0.004}.get(kind, 0.01)
+                for usage_type, regex in regexes.items():
+                    if regex:
+                        yield from add(resource_group, usage_type, regex, scale)
+
+    for file_name, resource_group, scale in [
+        ('gpu-skus-mapping.yaml', 'GPU', 2.0),
+        ('storage-skus-mapping.yaml', 'LocalSSD', 0.08),
+    ]:
+        with open(os.path.join(data_dir, file_name), 'r') as file:
+            mappings = yaml.safe_load(file)
+        for mapping in mappings.values():
+            for usage_type, regex in mapping['skus'].items():
+                if regex:
+                    yield from add(resource_group, usage_type, regex, scale)
+
+    for i in range(noise_skus):
+        region = regions[i % len(regions)]
+        yield make_sku(
+            sku_id=f'NOISE-{i:06d}',
+            description=f'Storage PD Snapshot {i} in {region}',
+            resource_group=['SSD', 'PDStandard', 'PDSnapshot', 'NetworkEgress'][i % 4],
+            usage_type='OnDemand',
+            regions=[region],
+            price=0.04,
+            usage_unit='GiBy.mo',
+        )
+
+
+def make_sku_catalog(
+    data_dir: Optional[str] = None,
+    regions: Optional[List[str]] = None,
+    noise_skus: int = 0,
+) -> List[billing_v1.Sku]:
+    """
+    List version of `iter_sku_catalog`.
+    """
+    return list(iter_sku_catalog(data_dir=data_dir, regions=regions, noise_skus=noise_skus))
+
+
+def make_machine_types(
+    zones: List[str],
+    data_dir: Optional[str] = None,
+) -> Dict[str, List[dict]]:
+    """
+    Generates Compute Engine machine types per zone (in REST JSON format) for every machine from the CSV mappings.
+    """
+    data_dir = DEFAULT_DATA_DIR if data_dir is None else data_dir
+    machines = []
+    for file_path in sorted(glob.glob(os.path.join(data_dir, '*-machines.csv'))):
+        with open(file_path, 'r') as csv_file:
+            reader = csv.DictReader(csv_file)
+            for row in reader:
+                machines.append({
+                    'name': row['name'],
+                    'guestCpus': int(float(row['VCPUs'])),
+                    'memoryMb': int(float(row['ram']) * 1024),
+                })
+    return {
+        zone: [machine for machine in machines if _stable_fraction(machine['name'] + zone) > 0.1]
+        for zone in zones
+    }
+
+
+__all__ = [
+    'make_sku',
+    'iter_sku_catalog',
+    'make_sku_catalog',
+    'make_machine_types'
+]
@@ -0,0 +1,238 @@
+import json
+import threading
+from concurrent import futures
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import grpc
+from google.cloud import billing_v1
+
+LIST_SKUS_METHOD = '/google.cloud.billing.v1.CloudCatalog/ListSkus'
+
+
+class _FailureInjector:
+    """
+    Keeps per-page failure counters: {page_index: number of transient failures before success}.
+    """
+
+    def __init__(self, fail_pages: Optional[Dict[int, int]] = None):
+        self._fail_pages = dict(fail_pages or {})
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+
+    def should_fail(self, page_index: int) -> bool:
+        with self._lock:
+            self.requests += 1
+            if self._fail_pages.get(page_index, 0) > 0:
+                self._fail_pages[page_index] -= 1
+                self.failures += 1
+                return True
+            return False
+
+
+def _paginate(items: list, page_token: str, page_size: int, default_page_size: int):
+    start = int(page_token) if page_token else 0
+    size = page_size or default_page_size
+    page = items[start:start + size]
+    next_page_token = str(start + size) if start + size < len(items) else ''
+    return start // size, page, next_page_token
+
+
+def _convert_sku(sku: billing_v1.Sku, currency_code: str, rate: float) -> billing_v1.Sku:
+    sku = billing_v1.Sku.deserialize(billing_v1.Sku.serialize(sku))
+    for pricing_info in sku.pricing_info:
+        pricing_info.currency_conversion_rate = rate
+        for tier in pricing_info.pricing_expression.tiered_rates:
+            price = (tier.unit_price.units + tier.unit_price.nanos * 10 ** (-9)) * rate
+            units = int(price)
+            tier.unit_price = {
+                'currency_code': currency_code,
+                'units': units,
+                'nanos': int(round((price - units) * 1e9)),
+            }
+    return sku
+
+
+class FakeCatalogServer:
+    """
+    Local gRPC server that implements CloudCatalog.ListSkus over a fixed list of SKUs.
+
+    Page tokens are item offsets. `fail_pages` makes the server answer UNAVAILABLE for
+    the given page indexes (page index -> number of failures) to exercise retries.
+    Requests with `currency_code` get prices converted with `currency_rates` (currency -> rate from USD).
+    """
+
+    def __init__(
+        self,
+        skus: List[billing_v1.Sku],
+        default_page_size: int = 5000,
+        fail_pages: Optional[Dict[int, int]] = None,
+        currency_rates: Optional[Dict[str, float]] = None,
+    ):
+        self.skus = skus
+        self.default_page_size = default_page_size
+        self.currency_rates = {'USD': 1.0, **(currency_rates or {})}
+        self.failures = _FailureInjector(fail_pages)
+        self.port: Optional[int] = None
+        self._server: Optional[grpc.Server] = None
+
+    @property
+    def address(self) -> str:
+        return f'localhost:{self.port}'
+
+    @property
+    def requests(self) -> int:
+        return self.failures.requests
+
+    def _list_skus(self, request: billing_v1.ListSkusRequest, context):
+        page_index, page, next_page_token = _paginate(
+            self.skus, request.page_token, request.page_size, self.default_page_size
+        )
+        if self.failures.should_fail(page_index):
+            context.abort(grpc.StatusCode.UNAVAILABLE, f'Injected failure for page {page_index}')
+        currency_code = request.currency_code or 'USD'
+        if currency_code not in self.currency_rates:
+            context.abort(grpc.StatusCode.INVALID_ARGUMENT, f'Unsupported currency {currency_code}')
+        if currency_code != 'USD':
+            page = [_convert_sku(x, currency_code, self.currency_rates[currency_code]) for x in page]
+        return billing_v1.ListSkusResponse(skus=page, next_page_token=next_page_token)
+
+    def start(self) -> 'FakeCatalogServer':
+        handler = grpc.method_handlers_generic_handler(
+            'google.cloud.billing.v1.CloudCatalog',
+            {
+                'ListSkus': grpc.unary_unary_rpc_method_handler(
+                    self._list_skus,
+                    request_deserializer=billing_v1.ListSkusRequest.deserialize,
+                    response_serializer=billing_v1.ListSkusResponse.serialize,
+                )
+            }
+        )
+        self._server = grpc.server(futures.ThreadPoolExecutor(max_workers=4))
+        self._server.add_generic_rpc_handlers((handler,))
+        self.port = self._server.add_insecure_port('localhost:0')
+        self._server.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.stop(None)
+            self._server = None
+
+    def __enter__(self) -> 'FakeCatalogServer':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+class FakeComputeServer:
+    """
+    Local HTTP server that implements Compute Engine REST list methods used by the scraper:
+    regions, zones and per-zone machine types.
+
+    :param machine_types: zone -> list of {'name', 'guestCpus', 'memoryMb'} dicts
+    """
+
+    def __init__(
+        self,
+        regions: List[str],
+        zones: List[str],
+        machine_types: Dict[str, List[dict]],
+        default_page_size: int = 500,
+        fail_pages: Optional[Dict[int, int]] = None,
+    ):
+        self.regions = regions
+        self.zones = zones
+        self.machine_types = machine_types
+        self.default_page_size = default_page_size
+        self.failures = _FailureInjector(fail_pages)
+        self.port: Optional[int] = None
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def address(self) -> str:
+        return f'localhost:{self.port}'
+
+    @property
+    def requests(self) -> int:
+        return self.failures.requests
+
+    def _resolve(self, path: str) -> Optional[list]:
+        parts = path.strip('/').split('/')
+        # compute/v1/projects/{project}/...
+        if len(parts) < 5 or parts[:3] != ['compute', 'v1', 'projects']:
+            return None
+        resource = parts[4:]
+        if resource == ['regions']:
+            return [{'name': region} for region in self.regions]
+        if resource == ['zones']:
+            return [{'name': zone} for zone in self.zones]
+        if len(resource) == 3 and resource[0] == 'zones' and resource[2] == 'machineTypes':
+            return self.machine_types.get(resource[1], [])
+        return None
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                items = server._resolve(url.path)
+                if items is None:
+                    return self._reply(404, {'error': {'code': 404, 'message': 'Not found'}})
+                page_index, page, next_page_token = _paginate(
+                    items,
+                    query.get('pageToken', [''])[0],
+                    int(query.get('maxResults', ['0'])[0]),
+                    server.default_page_size
+                )
+                if server.failures.should_fail(page_index):
+                    return self._reply(503, {'error': {'code': 503, 'message': 'Injected failure'}})
+                body = {'items': page}
+                if next_page_token:
+                    body['nextPageToken'] = next_page_token
+                return self._reply(200, body)
+
+            def _reply(self, status: int, body: dict):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> 'FakeComputeServer':
+        self._server = ThreadingHTTPServer(('localhost', 0), self._make_handler())
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> 'FakeComputeServer':
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+
+__all__ = [
+    'FakeCatalogServer',
+    'FakeComputeServer'
+]
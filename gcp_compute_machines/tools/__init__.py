@@ -0,0 +1,31 @@
+from gcp_compute_machines._lazy import lazy_exports
+
+# pandas (batch quotes) and pydantic are imported on the first access to the corresponding tool
+_LAZY_IMPORTS = {
+    'BatchQuoter': 'gcp_compute_machines.tools.batch_quote',
+    'BatchQuoteResult': 'gcp_compute_machines.tools.batch_quote',
+    'ZoneAvailabilityIndex': 'gcp_compute_machines.tools.zone_index',
+    'Reconciler': 'gcp_compute_machines.tools.reconciliation',
+    'ReconciliationReport': 'gcp_compute_machines.tools.reconciliation',
+    'PriceDelta': 'gcp_compute_machines.tools.reconciliation',
+    'SnapshotDiffer': 'gcp_compute_machines.tools.snapshot_diff',
+    'SnapshotDiff': 'gcp_compute_machines.tools.snapshot_diff',
+    'SnapshotChange': 'gcp_compute_machines.tools.snapshot_diff',
+    'diff_snapshots': 'gcp_compute_machines.tools.snapshot_diff',
+    'MappingCoverageAnalyzer': 'gcp_compute_machines.tools.mapping_coverage',
+    'MappingCoverageReport': 'gcp_compute_machines.tools.mapping_coverage',
+    'MappingIssue': 'gcp_compute_machines.tools.mapping_coverage',
+    'UnclaimedSKU': 'gcp_compute_machines.tools.mapping_coverage',
+    'MachineRankingIndex': 'gcp_compute_machines.tools.ranking',
+    'RankedMachine': 'gcp_compute_machines.tools.ranking',
+    'RegionSpatialIndex': 'gcp_compute_machines.tools.region_index',
+    'RegionMatch': 'gcp_compute_machines.tools.region_index',
+    'FleetOptimizer': 'gcp_compute_machines.tools.fleet_optimizer',
+    'FleetPlan': 'gcp_compute_machines.tools.fleet_optimizer',
+    'PlannedMachine': 'gcp_compute_machines.tools.fleet_optimizer',
+    'Workload': 'gcp_compute_machines.tools.fleet_optimizer',
+}
+
+__getattr__, __dir__ = lazy_exports(__name__, globals(), _LAZY_IMPORTS)
+
+__all__ = list(_LAZY_IMPORTS)
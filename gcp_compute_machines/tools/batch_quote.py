@@ -0,0 +1,181 @@
+from typing import Dict, Iterable, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+from pydantic import BaseModel, ConfigDict
+
+from gcp_compute_machines.providers.base.models.base_machine_info_model import GCPMachineType
+
+PRICE_COLUMNS = ['ondemand', 'spot', 'sud', 'cud1y', 'cud3y']
+
+ArrayLike = Union[Sequence, np.ndarray, pd.Series]
+
+
+class BatchQuoteResult(BaseModel):
+    """
+    Result of a batch quote.
+
+    `rows` keeps the input order and has the next columns:
+    machine_type, region, usage_type, hours, hourly_price, cost.
+    `hourly_price` and `cost` are NaN for rows that are missing in the pricing data.
+    """
+
+    rows: pd.DataFrame
+    total_cost: float
+    missing_rows: int
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    @property
+    def missing(self) -> pd.DataFrame:
+        return self.rows[self.rows['hourly_price'].isna()]
+
+    def costs_by(self, *columns: str) -> pd.Series:
+        """
+        Aggregates costs by the provided columns, e.g. `costs_by('region', 'usage_type')`.
+        """
+        return self.rows.groupby(list(columns), observed=True, sort=True)['cost'].sum()
+
+    @property
+    def costs_by_usage_type(self) -> Dict[str, float]:
+        return self.costs_by('usage_type').to_dict()
+
+    @property
+    def costs_by_region(self) -> Dict[str, float]:
+        return self.costs_by('region').to_dict()
+
+
+class BatchQuoter:
+    """
+    Prices whole fleets of (machine type, region, usage type, hours) entries in one vectorized pass.
+
+    Pricing rows are indexed once by a hashed integer key built from categorical codes of
+    machine name and region. A batch is encoded with the same categories, so the join
+    is a single `Index.get_indexer` call followed by numpy fancy indexing.
+    """
+
+    def __init__(self, machines: Iterable[GCPMachineType]):
+        names = []
+        regions = []
+        prices = []
+        for machine in machines:
+            names.append(machine.name)
+            regions.append(machine.region)
+            prices.append([getattr(machine, column) for column in PRICE_COLUMNS])
+
+        self._names = pd.Index(pd.unique(np.asarray(names, dtype=object)))
+        self._regions = pd.Index(pd.unique(np.asarray(regions, dtype=object)))
+        self._usage_types = pd.Index(PRICE_COLUMNS)
+
+        keys = self._encode(
+            self._names.get_indexer(names),
+            self._regions.get_indexer(regions)
+        )
+        # Duplicated (name, region) rows keep the first occurrence
+        unique_keys = ~pd.Index(keys).duplicated(keep='first')
+        self._keys = pd.Index(keys[unique_keys])
+        self._prices = np.array(prices, dtype=np.float64).reshape(-1, len(PRICE_COLUMNS))[unique_keys]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _encode(self, name_codes: np.ndarray, region_codes: np.ndarray) -> np.ndarray:
+        name_codes = np.asarray(name_codes, dtype=np.int64)
+        region_codes = np.asarray(region_codes, dtype=np.int64)
+        keys = name_codes * len(self._regions) + region_codes
+        # unknown names or regions never match any pricing row
+        keys[(name_codes < 0) | (region_codes < 0)] = -1
+        return keys
+
+    def hourly_prices(
+        self,
+        machine_types: ArrayLike,
+        regions: ArrayLike,
+        usage_types: Union[ArrayLike, str],
+    ) -> np.ndarray:
+        """
+        :return: hourly price per input row, NaN if the row is missing in the pricing data
+        """
+        keys = self._encode(
+            self._names.get_indexer(machine_types),
+            self._regions.get_indexer(regions)
+        )
+        row_indexes = self._keys.get_indexer(keys)
+        if isinstance(usage_types, str):
+            # -1 for an unknown usage type, like the per-row lookup
+            usage_indexes = np.full(len(row_indexes), self._usage_types.get_indexer([usage_types])[0], dtype=np.int64)
+        else:
+            usage_indexes = self._usage_types.get_indexer(usage_types)
+
+        found = (row_indexes >= 0) & (usage_indexes >= 0)
+        result = np.full(len(row_indexes), np.nan, dtype=np.float64)
+        result[found] = self._prices[row_indexes[found], usage_indexes[found]]
+        return result
+
+    def quote(
+        self,
+        machine_types: ArrayLike,
+        regions: ArrayLike,
+        usage_types: Union[ArrayLike, str],
+        hours: Union[ArrayLike, float, None] = None,
+    ) -> BatchQuoteResult:
+        """
+        Prices columnar input.
+
+        :param machine_types: machine type per row
+        :param regions: region per row
+        :param usage_types: usage type per row or a single usage type for all rows
+        :param hours: hours per row or a single value for all rows. Defaults to 1 hour.
+        """
+        hourly_prices = self.hourly_prices(machine_types, regions, usage_types)
+        size = len(hourly_prices)
+        if hours is None:
+            hours = 1.0
+        hours = np.broadcast_to(np.asarray(hours, dtype=np.float64), (size,))
+        if isinstance(usage_types, str):
+            usage_index = self._usage_types.get_indexer([usage_types])[0]
+            # an unknown usage type is kept as its own category, its rows are missing
+            usage_types = pd.Categorical.from_codes(
+                np.full(size, max(usage_index, 0)),
+                categories=PRICE_COLUMNS if usage_index >= 0 else [usage_types]
+            )
+
+        costs = hourly_prices * hours
+        rows = pd.DataFrame({
+            'machine_type': pd.Categorical(machine_types),
+            'region': pd.Categorical(regions),
+            'usage_type': pd.Categorical(usage_types),
+            'hours': hours,
+            'hourly_price': hourly_prices,
+            'cost': costs,
+        })
+        return BatchQuoteResult(
+            rows=rows,
+            total_cost=float(np.nansum(costs)),
+            missing_rows=int(np.isnan(hourly_prices).sum()),
+        )
+
+    def quote_frame(
+        self,
+        df: pd.DataFrame,
+        machine_type_column: str = 'machine_type',
+        region_column: str = 'region',
+        usage_type_column: str = 'usage_type',
+        hours_column: Optional[str] = 'hours',
+    ) -> BatchQuoteResult:
+        """
+        Prices a DataFrame. Hours column is optional, 1 hour is used if it's missing.
+        """
+        return self.quote(
+            machine_types=df[machine_type_column].to_numpy(),
+            regions=df[region_column].to_numpy(),
+            usage_types=df[usage_type_column].to_numpy(),
+            hours=df[hours_column].to_numpy() if hours_column in df else None,
+        )
+
+
+__all__ = [
+    'BatchQuoter',
+    'BatchQuoteResult',
+    'PRICE_COLUMNS'
+]
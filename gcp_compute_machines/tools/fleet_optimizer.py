@@ -0,0 +1,386 @@
+import math
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+import numpy as np
+from pydantic import BaseModel
+
+from gcp_compute_machines.constants import *
+from gcp_compute_machines.tools.reconciliation import get_field
+
+# the exact mode searches all partitions of the workloads, O(3^n)
+EXACT_MAX_WORKLOADS = 12
+# unplaced workloads tried when a new machine is filled by the heuristic
+DEFAULT_WINDOW = 64
+
+# GPU requirement keys: no GPU and a GPU of any model. Other keys are GPU models.
+NO_GPU = ''
+ANY_GPU = '*'
+
+
+class Workload(NamedTuple):
+    cpu: float
+    ram: float
+    gpu_count: int = 0
+    # GPU model (e.g. NVIDIA_L4), any model if None
+    gpu: Optional[str] = None
+    # allowed regions, all regions if None
+    regions: Optional[Tuple[str, ...]] = None
+    name: Optional[str] = None
+
+    @property
+    def gpu_key(self) -> str:
+        if not self.gpu_count:
+            return NO_GPU
+        return ANY_GPU if self.gpu is None else self.gpu
+
+
+class _Candidate(NamedTuple):
+    name: str
+    region: str
+    cpu: float
+    ram: float
+    gpu: Optional[str]
+    gpu_count: int
+    price: float
+
+
+class PlannedMachine(BaseModel):
+    machine_type: str
+    region: str
+    hourly_price: float
+    # positions of the packed workloads in the optimizer input
+    workloads: List[int]
+
+
+class FleetPlan(BaseModel):
+    usage_type: str
+    machines: List[PlannedMachine] = []
+    total_hourly_cost: float = 0.0
+    # positions of the workloads which don't fit into any machine of their regions
+    unplaced: List[int] = []
+    exact: bool = False
+
+    @property
+    def counts(self) -> Dict[Tuple[str, str], int]:
+        """
+        :return: (machine type, region) -> number of machines
+        """
+        counts = {}
+        for machine in self.machines:
+            key = (machine.machine_type, machine.region)
+            counts[key] = counts.get(key, 0) + 1
+        return counts
+
+
+def _as_workload(workload: Union[Workload, dict]) -> Workload:
+    if isinstance(workload, Workload):
+        return workload
+    workload = dict(workload)
+    if workload.get('regions') is not None:
+        workload['regions'] = tuple(workload['regions'])
+    return Workload(**workload)
+
+
+def _fits_gpu(candidate: _Candidate, gpu_key: str) -> bool:
+    if gpu_key == NO_GPU:
+        return True
+    if not candidate.gpu_count:
+        return False
+    return gpu_key == ANY_GPU or candidate.gpu == gpu_key
+
+
+class FleetOptimizer:
+    """
+    Chooses machine types and counts for a set of workloads with the lowest hourly cost of one usage type.
+
+    Candidates are pre-filtered once per (region, GPU requirement): machines without a price are dropped,
+    and so is every machine with a cheaper (or equally priced) alternative which has at least the same
+    vCPUs, RAM and GPUs.
+
+    The heuristic assigns every workload to the allowed region where its share of the best fitting machine
+    is the cheapest, then packs every (region, GPU requirement) group: workloads are taken from the biggest
+    one, and a new machine is the candidate with the lowest price per packed workloads value when it's filled
+    first-fit from the next `window` workloads. The exact mode searches the optimal partition of a few workloads.
+    """
+
+    def __init__(self, machines: Iterable[Any], usage_type: UsageType = OnDemandUsage):
+        """
+        :param machines: provider outputs (`GCPMachineType` models) or their dumped rows
+        """
+        self.usage_type = usage_type
+        self._candidates: Dict[str, List[_Candidate]] = {}
+        for machine in machines:
+            price = get_field(machine, usage_type)
+            region = get_field(machine, 'region')
+            cpu = get_field(machine, 'cpu_count')
+            ram = get_field(machine, 'ram')
+            if price is None or region is None or not cpu or not ram:
+                continue
+            gpu_count = get_field(machine, 'gpu_count_by_default') or 0
+            self._candidates.setdefault(region, []).append(_Candidate(
+                get_field(machine, 'name'),
+                region,
+                float(cpu),
+                float(ram),
+                get_field(machine, 'default_gpu') if gpu_count else None,
+                int(gpu_count),
+                float(price)
+            ))
+        self.regions: List[str] = sorted(self._candidates)
+        # (region, GPU key) -> pre-filtered candidates, cheapest first
+        self._buckets: Dict[Tuple[str, str], List[_Candidate]] = {}
+        # (region, GPU key) -> candidate columns: cpu, ram, gpu count, price
+        self._arrays: Dict[Tuple[str, str], Tuple[np.ndarray, ...]] = {}
+
+    def candidates(self, region: str, gpu_key: str = NO_GPU) -> List[_Candidate]:
+        """
+        :return: non-dominated machines of the region which satisfy the GPU requirement, cheapest first
+        """
+        key = (region, gpu_key)
+        result = self._buckets.get(key)
+        if result is None:
+            result = []
+            machines = sorted(
+                (x for x in self._candidates.get(region, []) if _fits_gpu(x, gpu_key)),
+                key=lambda x: (x.price, -x.cpu, -x.ram, -x.gpu_count, x.name)
+            )
+            for machine in machines:
+                if not any(
+                    x.cpu >= machine.cpu and x.ram >= machine.ram and x.gpu_count >= machine.gpu_count
+                    for x in result
+                ):
+                    result.append(machine)
+            self._buckets[key] = result
+            self._arrays[key] = tuple(
+                np.array([getattr(x, field) for x in result], dtype=np.float64)
+                for field in ('cpu', 'ram', 'gpu_count', 'price')
+            )
+        return result
+
+    def optimize(
+        self,
+        workloads: Sequence[Union[Workload, dict]],
+        exact: Optional[bool] = None,
+        window: int = DEFAULT_WINDOW,
+    ) -> FleetPlan:
+        """
+        :param workloads: `Workload` tuples or dicts with the same fields
+        :param exact: use the exact search, by default only for up to `EXACT_MAX_WORKLOADS` workloads
+        :param window: heuristic look-ahead, more workloads make machines fuller and packing slower
+        """
+        workloads = [_as_workload(x) for x in workloads]
+        if exact is None:
+            exact = len(workloads) <= EXACT_MAX_WORKLOADS
+        if exact:
+            if len(workloads) > EXACT_MAX_WORKLOADS:
+                raise ValueError(f'The exact mode supports up to {EXACT_MAX_WORKLOADS} workloads, got {len(workloads)}')
+            return self._optimize_exact(workloads)
+        return self._optimize_heuristic(workloads, window)
+
+    # region heuristic
+
+    def _assign_regions(self, workloads: List[Workload]) -> Tuple[List[Optional[str]], np.ndarray]:
+        """
+        :return: the cheapest allowed region of every workload (None if nothing fits) and the workload value:
+            its share of the best fitting machine of that region times the machine price
+        """
+        cpu = np.array([x.cpu for x in workloads], dtype=np.float64)
+        ram = np.array([x.ram for x in workloads], dtype=np.float64)
+        gpu = np.array([x.gpu_count for x in workloads], dtype=np.float64)
+        best_value = np.full(len(workloads), np.inf)
+        best_region: List[Optional[str]] = [None] * len(workloads)
+
+        # (GPU key, region) -> positions of the workloads allowed there
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        for i, workload in enumerate(workloads):
+            regions = self.regions if workload.regions is None else workload.regions
+            for region in regions:
+                groups.setdefault((workload.gpu_key, region), []).append(i)
+
+        for (gpu_key, region), positions in sorted(groups.items()):
+            if not self.candidates(region, gpu_key):
+                continue
+            machines_cpu, machines_ram, machines_gpu, prices = self._arrays[(region, gpu_key)]
+            positions = np.array(positions)
+            w_cpu, w_ram, w_gpu = cpu[positions, None], ram[positions, None], gpu[positions, None]
+            share = np.maximum(w_cpu / machines_cpu, w_ram / machines_ram)
+            if gpu_key != NO_GPU:
+                share = np.maximum(share, w_gpu / machines_gpu)
+            fits = (w_cpu <= machines_cpu) & (w_ram <= machines_ram) & (w_gpu <= machines_gpu)
+            values = np.where(fits, share * prices, np.inf).min(axis=1)
+            better = values < best_value[positions]
+            best_value[positions[better]] = values[better]
+            for i in positions[better]:
+                best_region[i] = region
+        return best_region, best_value
+
+    def _pack(
+        self,
+        workloads: List[Workload],
+        positions: List[int],
+        values: np.ndarray,
+        region: str,
+        gpu_key: str,
+        window: int,
+    ) -> List[PlannedMachine]:
+        candidates = self.candidates(region, gpu_key)
+        # biggest workloads first
+        remaining = sorted(positions, key=lambda i: (-values[i], i))
+        placed = set()
+        result = []
+        while remaining:
+            first = workloads[remaining[0]]
+            best = None
+            scanned_to = 1
+            for machine in candidates:
+                if first.cpu > machine.cpu or first.ram > machine.ram or first.gpu_count > machine.gpu_count:
+                    continue
+                free_cpu = machine.cpu - first.cpu
+                free_ram = machine.ram - first.ram
+                free_gpu = machine.gpu_count - first.gpu_count
+                packed = [remaining[0]]
+                value = values[remaining[0]]
+                k = 1
+                while k < len(remaining) and k <= window:
+                    i = remaining[k]
+                    workload = workloads[i]
+                    if workload.cpu <= free_cpu and workload.ram <= free_ram and workload.gpu_count <= free_gpu:
+                        free_cpu -= workload.cpu
+                        free_ram -= workload.ram
+                        free_gpu -= workload.gpu_count
+                        packed.append(i)
+                        value += values[i]
+                    k += 1
+                scanned_to = max(scanned_to, k)
+                score = machine.price / value
+                if best is None or score < best[0]:
+                    best = (score, machine, packed)
+            _, machine, packed = best
+            placed.update(packed)
+            result.append(PlannedMachine(
+                machine_type=machine.name, region=region, hourly_price=machine.price, workloads=packed
+            ))
+            remaining = [i for i in remaining[:scanned_to] if i not in placed] + remaining[scanned_to:]
+        return result
+
+    def _optimize_heuristic(self, workloads: List[Workload], window: int) -> FleetPlan:
+        regions, values = self._assign_regions(workloads)
+        groups: Dict[Tuple[str, str], List[int]] = {}
+        unplaced = []
+        for i, (workload, region) in enumerate(zip(workloads, regions)):
+            if region is None:
+                unplaced.append(i)
+            else:
+                groups.setdefault((region, workload.gpu_key), []).append(i)
+
+        machines = []
+        for (region, gpu_key), positions in sorted(groups.items()):
+            machines.extend(self._pack(workloads, positions, values, region, gpu_key, window))
+        return FleetPlan(
+            usage_type=self.usage_type,
+            machines=machines,
+            total_hourly_cost=math.fsum(x.hourly_price for x in machines),
+            unplaced=unplaced,
+        )
+
+    # endregion
+
+    # region exact
+
+    def _cheapest(self, regions: Iterable[str], cpu: float, ram: float, gpu_count: int, gpu_key: str):
+        best = None
+        for region in regions:
+            for machine in self.candidates(region, gpu_key):
+                if best is not None and machine.price >= best.price:
+                    break
+                if machine.cpu >= cpu and machine.ram >= ram and machine.gpu_count >= gpu_count:
+                    best = machine
+                    break
+        return best
+
+    def _optimize_exact(self, workloads: List[Workload]) -> FleetPlan:
+        all_regions = frozenset(self.regions)
+        allowed = [all_regions if x.regions is None else frozenset(x.regions) & all_regions for x in workloads]
+        placeable = [
+            i for i, workload in enumerate(workloads)
+            if self._cheapest(sorted(allowed[i]), workload.cpu, workload.ram, workload.gpu_count, workload.gpu_key)
+        ]
+        n = len(placeable)
+        size = 1 << n
+
+        # the cheapest single machine of every subset of the placeable workloads
+        machines: List[Optional[_Candidate]] = [None] * size
+        costs = [math.inf] * size
+        cpu, ram, gpu = [0.0] * size, [0.0] * size, [0] * size
+        regions: List[frozenset] = [all_regions] * size
+        # GPU key of a subset, None if the subset needs different GPU models
+        gpu_keys: List[Optional[str]] = [NO_GPU] * size
+        for mask in range(1, size):
+            low = mask & -mask
+            rest = mask ^ low
+            workload_position = placeable[low.bit_length() - 1]
+            workload = workloads[workload_position]
+            cpu[mask] = cpu[rest] + workload.cpu
+            ram[mask] = ram[rest] + workload.ram
+            gpu[mask] = gpu[rest] + workload.gpu_count
+            regions[mask] = regions[rest] & allowed[workload_position]
+            gpu_key, rest_key = workload.gpu_key, gpu_keys[rest]
+            if rest_key is None or gpu_key == NO_GPU:
+                gpu_keys[mask] = rest_key
+            elif rest_key in (NO_GPU, ANY_GPU, gpu_key):
+                gpu_keys[mask] = gpu_key if rest_key in (NO_GPU, ANY_GPU) else rest_key
+            elif gpu_key == ANY_GPU:
+                gpu_keys[mask] = rest_key
+            else:
+                gpu_keys[mask] = None
+            if gpu_keys[mask] is None or not regions[mask]:
+                continue
+            machine = self._cheapest(sorted(regions[mask]), cpu[mask], ram[mask], gpu[mask], gpu_keys[mask])
+            if machine is not None:
+                machines[mask] = machine
+                costs[mask] = machine.price
+
+        # optimal partition: the subset with the lowest workload is split off
+        best = [math.inf] * size
+        split = [0] * size
+        best[0] = 0.0
+        for mask in range(1, size):
+            low = mask & -mask
+            sub = mask
+            while sub:
+                if sub & low and costs[sub] + best[mask ^ sub] < best[mask]:
+                    best[mask] = costs[sub] + best[mask ^ sub]
+                    split[mask] = sub
+                sub = (sub - 1) & mask
+
+        planned = []
+        mask = size - 1
+        while mask:
+            sub = split[mask]
+            machine = machines[sub]
+            planned.append(PlannedMachine(
+                machine_type=machine.name,
+                region=machine.region,
+                hourly_price=machine.price,
+                workloads=[placeable[bit] for bit in range(n) if sub >> bit & 1]
+            ))
+            mask ^= sub
+        return FleetPlan(
+            usage_type=self.usage_type,
+            machines=planned,
+            total_hourly_cost=math.fsum(x.hourly_price for x in planned),
+            unplaced=sorted(set(range(len(workloads))) - set(placeable)),
+            exact=True,
+        )
+
+    # endregion
+
+
+__all__ = [
+    'ANY_GPU',
+    'EXACT_MAX_WORKLOADS',
+    'FleetOptimizer',
+    'FleetPlan',
+    'PlannedMachine',
+    'Workload'
+]
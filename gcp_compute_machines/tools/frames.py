@@ -0,0 +1,77 @@
+import operator
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from gcp_compute_machines.providers.base.models.base_machine_info_model import GCPMachineType
+
+PRICE_COLUMNS = ['ondemand', 'spot', 'sud', 'cud1y', 'cud3y']
+# low-cardinality text columns
+CATEGORICAL_COLUMNS = ['name', 'series', 'family', 'region', 'cpu_platforms']
+
+
+def _is_price_column(column: str) -> bool:
+    # prices in extra currencies are named `<usage type>_<currency>`, e.g. `ondemand_eur`
+    return column in PRICE_COLUMNS or column.rpartition('_')[0] in PRICE_COLUMNS
+
+
+def _model_columns(machines: Sequence[GCPMachineType]) -> List[str]:
+    columns = list(type(machines[0]).model_fields if machines else GCPMachineType.model_fields)
+    # extra fields of models which allow them, e.g. currency prices of the scraper models
+    extra = {}
+    for machine in machines:
+        if machine.model_extra:
+            extra.update(dict.fromkeys(machine.model_extra))
+    return columns + [x for x in extra if x not in columns]
+
+
+def machines_to_dataframe(
+    machines: Iterable[GCPMachineType],
+    columns: Optional[Sequence[str]] = None,
+    price_dtype: str = 'float64',
+) -> pd.DataFrame:
+    """
+    Builds a DataFrame column by column from model attributes, without `model_dump()` dicts per row.
+
+    :param columns: model fields, all fields of the models class and extra fields of the models by default
+    :param price_dtype: `float64` or `float32` for the price columns, missing prices are NaN
+    """
+    machines = machines if isinstance(machines, (list, tuple)) else list(machines)
+    if columns is None:
+        columns = _model_columns(machines)
+    fields = type(machines[0]).model_fields if machines else GCPMachineType.model_fields
+    data = {}
+    for column in columns:
+        if column in fields:
+            values = list(map(operator.attrgetter(column), machines))
+        else:
+            # extra fields can be missing in some models
+            values = [(x.model_extra or {}).get(column) for x in machines]
+        if _is_price_column(column):
+            # None -> NaN
+            data[column] = np.array(values, dtype=np.float64).astype(price_dtype, copy=False)
+        elif column in CATEGORICAL_COLUMNS:
+            data[column] = pd.Categorical(values)
+        else:
+            data[column] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def dataframe_to_arrow(frame: pd.DataFrame):
+    """
+    Converts a `machines_to_dataframe` frame into a `pyarrow.Table`.
+    Categorical columns become dictionary arrays, numeric columns reuse the numpy buffers.
+    """
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError('pyarrow is required for Arrow tables: pip install pyarrow') from e
+    return pyarrow.Table.from_pandas(frame, preserve_index=False)
+
+
+__all__ = [
+    'CATEGORICAL_COLUMNS',
+    'dataframe_to_arrow',
+    'machines_to_dataframe'
+]
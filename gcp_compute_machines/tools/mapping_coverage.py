@@ -0,0 +1,275 @@
+import bisect
+import csv
+import glob
+import os
+import re
+from typing import Dict, Iterable, List, Literal, Optional, Set, Tuple
+
+import yaml
+from pydantic import BaseModel
+
+from gcp_compute_machines.constants import *
+from gcp_compute_machines.providers.scraper.models.skus.sku_record import SKUCatalog, SKURecord
+
+DEFAULT_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'providers', 'scraper', 'mappings')
+USAGE_TYPES: List[UsageType] = [OnDemandUsage, SpotUsage, CommitmentOneYearUsage, CommitmentThreeYearsUsage]
+
+Loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# mapping name, component (cpu, ram, instance, gpu, local_ssd)
+MappingKey = Tuple[str, str]
+
+
+class MappingIssue(BaseModel):
+    kind: Literal['zero', 'multiple']
+    mapping: str
+    component: str
+    usage_type: str
+    # None if the regex matches no SKU at all
+    region: Optional[str] = None
+    regex: str
+    sku_ids: List[str] = []
+
+
+class UnclaimedSKU(BaseModel):
+    sku_id: str
+    description: str
+    usage_type: str
+    regions: List[str]
+
+
+class MappingCoverageReport(BaseModel):
+    mappings: int = 0
+    skus: int = 0
+    issues: List[MappingIssue] = []
+    # catalog SKUs which are not matched by any mapping regex of their usage type
+    unclaimed: List[UnclaimedSKU] = []
+    # machines from the machine types cache without a family mapping or CSV info
+    unmapped_machines: List[str] = []
+
+    @property
+    def zero_matches(self) -> List[MappingIssue]:
+        return [x for x in self.issues if x.kind == 'zero']
+
+    @property
+    def multiple_matches(self) -> List[MappingIssue]:
+        return [x for x in self.issues if x.kind == 'multiple']
+
+    @property
+    def is_complete(self) -> bool:
+        return not (self.issues or self.unmapped_machines)
+
+
+def _csv_flag(value: Optional[str]) -> bool:
+    return value not in (None, '', '0', 'false', 'False')
+
+
+class MappingCoverageAnalyzer:
+    """
+    Checks SKU regex mappings against a cached SKU catalog (`gcp_sku.yaml`) without calling GCP APIs.
+
+    Descriptions of one usage type are joined into one text, and every distinct regex scans it once
+    in C. So the cost doesn't grow with one `re.search` call per SKU and regex, as it does in a
+    scraper run. It's one pass per regex, not one pass of a combined alternation: `re` reports only
+    the first matching alternative at a position, and overlapping mappings are what the report is about. For every mapping the analyzer reports the regions with zero or multiple matching SKUs,
+    and it also reports catalog SKUs which no mapping claims.
+
+    Regions where a mapping is expected to match:
+    * with a machine types cache (`gcp_instances.yaml`): regions of the machines which need the mapping,
+      the same regions a scraper run prices;
+    * without it: regions where any usage type of the mapping matches a SKU.
+    """
+
+    def __init__(
+        self,
+        data_dir: Optional[str] = None,
+        machine_families: Optional[List[str]] = None,
+    ):
+        self.data_dir = DEFAULT_DATA_DIR if data_dir is None else data_dir
+        if machine_families is None:
+            machine_families = [
+                os.path.basename(x)[:-len('-machines-sku.yaml')]
+                for x in sorted(glob.glob(os.path.join(self.data_dir, '*-machines-sku.yaml')))
+            ]
+        self.machine_families = machine_families
+        # (mapping, component) -> usage type -> regex
+        self.mappings: Dict[MappingKey, Dict[str, str]] = {}
+        # machine name -> (default GPU, LocalSSD enabled by default)
+        self.machines_info: Dict[str, Tuple[Optional[str], bool]] = {}
+        self._load_mappings()
+
+    def _add_mapping(self, mapping: str, component: str, regexes: Optional[dict]):
+        if regexes:
+            self.mappings[(mapping, component)] = {k: v for k, v in regexes.items() if v}
+
+    def _load_mappings(self):
+        for machine_family in self.machine_families:
+            with open(os.path.join(self.data_dir, f'{machine_family}-machines-sku.yaml'), 'r') as file:
+                for family, components in yaml.load(file, Loader=Loader).items():
+                    for component, regexes in components.items():
+                        self._add_mapping(family, component, regexes)
+            with open(os.path.join(self.data_dir, f'{machine_family}-machines.csv'), 'r') as csv_file:
+                for row in csv.DictReader(csv_file):
+                    default_gpu = None
+                    if _csv_flag(row.get('gpu_support')) and _csv_flag(row.get('gpu_count_by_default')):
+                        default_gpu = row.get('default_gpu') or None
+                    self.machines_info[row['name']] = (
+                        default_gpu, _csv_flag(row.get('local_ssd_enabled_by_default'))
+                    )
+        for file_name, component in [('gpu-skus-mapping.yaml', 'gpu'), ('storage-skus-mapping.yaml', 'local_ssd')]:
+            with open(os.path.join(self.data_dir, file_name), 'r') as file:
+                for name, mapping in yaml.load(file, Loader=Loader).items():
+                    self._add_mapping(name, component, mapping['skus'])
+
+    @staticmethod
+    def _match_lines(pattern: re.Pattern, text: str, line_starts: List[int], lines: List[str]) -> List[int]:
+        """
+        :return: indexes of the lines matched by `pattern` (`re.search` semantics per line)
+        """
+        result = []
+        pos = 0
+        while True:
+            match = pattern.search(text, pos)
+            if match is None:
+                return result
+            line = bisect.bisect_right(line_starts, match.start()) - 1
+            # a match can run into the next line only through newline matching classes, recheck the line alone
+            if '\n' not in match.group() or re.search(pattern.pattern, lines[line]):
+                result.append(line)
+            if line + 1 == len(line_starts):
+                return result
+            pos = line_starts[line + 1]
+
+    def _match(self, records: List[SKURecord], regexes: Iterable[str]) -> Dict[str, List[int]]:
+        """
+        :return: regex -> indexes of matched records
+        """
+        lines = [record.description for record in records]
+        line_starts = []
+        offset = 0
+        for line in lines:
+            line_starts.append(offset)
+            offset += len(line) + 1
+        text = '\n'.join(lines)
+        return {
+            # MULTILINE: `^` and `$` anchor at every description in the joined text
+            regex: self._match_lines(re.compile(regex, re.MULTILINE), text, line_starts, lines) if lines else []
+            for regex in set(regexes)
+        }
+
+    def _is_mapped(self, machine_name: str) -> bool:
+        family = machine_name.split('-')[0]
+        return machine_name in self.machines_info and (
+            (family, 'cpu') in self.mappings or (family, 'instance') in self.mappings
+        )
+
+    def _expected_regions(self, machines: Dict[str, dict]) -> Dict[MappingKey, Set[str]]:
+        expected: Dict[MappingKey, Set[str]] = {}
+        for machine_name, machine in machines.items():
+            regions = set(machine.get('regions') or {'-'.join(x.split('-')[:2]) for x in machine['zones']})
+            family = machine_name.split('-')[0]
+            for component in ('cpu', 'ram', 'instance'):
+                if (family, component) in self.mappings:
+                    expected.setdefault((family, component), set()).update(regions)
+            default_gpu, local_ssd = self.machines_info.get(machine_name, (None, False))
+            if default_gpu:
+                expected.setdefault((default_gpu, 'gpu'), set()).update(regions)
+            if local_ssd:
+                expected.setdefault(('LocalSSD', 'local_ssd'), set()).update(regions)
+        return expected
+
+    def analyze(self, catalog: SKUCatalog, machines: Optional[Dict[str, dict]] = None) -> MappingCoverageReport:
+        """
+        :param catalog: cached SKUs, e.g. `SKUCatalog.from_dict` of `gcp_sku.yaml`
+        :param machines: machine types cache (`gcp_instances.yaml`) content
+        """
+        report = MappingCoverageReport(mappings=len(self.mappings), skus=len(catalog))
+
+        # usage type -> regex -> matched records
+        matches: Dict[str, Dict[str, List[SKURecord]]] = {}
+        for usage_type in USAGE_TYPES:
+            records = catalog[usage_type]
+            regexes = [x[usage_type] for x in self.mappings.values() if usage_type in x]
+            usage_matches = self._match(records, regexes)
+            matches[usage_type] = {
+                regex: [records[i] for i in lines] for regex, lines in usage_matches.items()
+            }
+            claimed = {i for lines in usage_matches.values() for i in lines}
+            report.unclaimed.extend(
+                UnclaimedSKU(
+                    sku_id=record.sku_id,
+                    description=record.description,
+                    usage_type=usage_type,
+                    regions=sorted(record.regions)
+                )
+                for i, record in enumerate(records) if i not in claimed
+            )
+
+        if machines is not None:
+            expected_regions = self._expected_regions(machines)
+            report.unmapped_machines = sorted(name for name in machines if not self._is_mapped(name))
+        else:
+            expected_regions = {
+                key: {
+                    region
+                    for usage_type, regex in regexes.items()
+                    for record in matches[usage_type][regex]
+                    for region in record.regions
+                }
+                for key, regexes in self.mappings.items()
+            }
+
+        for (mapping, component), regexes in sorted(self.mappings.items()):
+            regions = expected_regions.get((mapping, component), set())
+            for usage_type, regex in regexes.items():
+                if usage_type not in matches:
+                    continue
+                matched = matches[usage_type][regex]
+                if not matched and (regions or machines is None):
+                    report.issues.append(MappingIssue(
+                        kind='zero', mapping=mapping, component=component, usage_type=usage_type, regex=regex
+                    ))
+                    continue
+                region_skus: Dict[str, List[str]] = {}
+                for record in matched:
+                    for region in record.regions:
+                        region_skus.setdefault(region, []).append(record.sku_id)
+                for region in sorted(regions | set(region_skus)):
+                    sku_ids = region_skus.get(region, [])
+                    if len(sku_ids) > 1:
+                        kind = 'multiple'
+                    elif not sku_ids and region in regions:
+                        kind = 'zero'
+                    else:
+                        continue
+                    report.issues.append(MappingIssue(
+                        kind=kind,
+                        mapping=mapping,
+                        component=component,
+                        usage_type=usage_type,
+                        region=region,
+                        regex=regex,
+                        sku_ids=sku_ids
+                    ))
+        return report
+
+    def analyze_files(
+        self,
+        sku_file_path: str = 'gcp_sku.yaml',
+        machines_file_path: Optional[str] = None,
+    ) -> MappingCoverageReport:
+        with open(sku_file_path, 'r') as file:
+            catalog = SKUCatalog.from_dict(yaml.load(file, Loader=Loader))
+        machines = None
+        if machines_file_path is not None:
+            with open(machines_file_path, 'r') as file:
+                machines = yaml.load(file, Loader=Loader)
+        return self.analyze(catalog, machines)
+
+
+__all__ = [
+    'MappingCoverageAnalyzer',
+    'MappingCoverageReport',
+    'MappingIssue',
+    'UnclaimedSKU'
+]
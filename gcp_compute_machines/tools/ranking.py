@@ -0,0 +1,179 @@
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+
+from gcp_compute_machines.constants import *
+
+if TYPE_CHECKING:
+    from gcp_compute_machines.providers.base.models.base_machine_info_model import GCPMachineType
+
+USAGE_TYPES: List[UsageType] = [OnDemandUsage, SpotUsage, CommitmentOneYearUsage, CommitmentThreeYearsUsage]
+
+# best CoreMark score per hourly dollar first
+CoremarkPerDollar = 'coremark_per_dollar'
+# cheapest machine in low CO2 regions first, lower grid carbon intensity wins ties
+LowCarbonPrice = 'low_carbon_price'
+RANKING_METRICS = (CoremarkPerDollar, LowCarbonPrice)
+
+# (field, value), None for the whole dataset
+GroupKey = Optional[Tuple[str, str]]
+GROUP_FIELDS = ('region', 'series')
+
+Machine = Union['GCPMachineType', dict]
+
+
+class RankedMachine(NamedTuple):
+    machine: Machine
+    # metric value: CoreMark per dollar or hourly price
+    value: float
+
+
+def _getter(machines: Sequence[Machine]) -> Callable[[Machine, str], Any]:
+    if machines and isinstance(machines[0], dict):
+        return lambda machine, field: machine.get(field)
+    return lambda machine, field: getattr(machine, field, None)
+
+
+def _is_low_co2(value: Any) -> bool:
+    # gcloud-compute marks low CO2 regions with 1, dumps can keep it as a bool or a string
+    return value not in (None, '', 0, '0', False, 'false', 'False')
+
+
+class MachineRankingIndex:
+    """
+    Price-performance and carbon rankings of gcloud-compute machines.
+
+    Derived columns are computed once per machine: CoreMark per hourly dollar of every usage type
+    and the low CO2 region flag. For every (metric, usage type) the machines are sorted once, and the
+    sorted order is split into per-region and per-series lists, so `top` is a slice of a ready list.
+    """
+
+    def __init__(self, machines: Sequence[Machine]):
+        """
+        :param machines: `GcloudComputeMachineInfoModel` objects or their dumped rows
+        """
+        self.machines: List[Machine] = list(machines)
+        get = _getter(self.machines)
+        fields = {
+            field: [get(machine, field) for machine in self.machines]
+            for field in ('region', 'series', 'coremark_score', 'region_co2_kwh', 'region_low_co2', *USAGE_TYPES)
+        }
+
+        self.regions: List[str] = sorted({x for x in fields['region'] if x is not None})
+        self._series_column: List[Optional[str]] = fields['series']
+
+        # derived columns, aligned with `machines`
+        self.columns: Dict[str, list] = {
+            'low_co2': [_is_low_co2(x) for x in fields['region_low_co2']],
+        }
+        for usage_type in USAGE_TYPES:
+            self.columns[f'{CoremarkPerDollar}_{usage_type}'] = [
+                score / price if score and price else None
+                for score, price in zip(fields['coremark_score'], fields[usage_type])
+            ]
+
+        # (metric, usage type) -> group key -> machine positions, best first
+        self._indexes: Dict[Tuple[str, str], Dict[GroupKey, List[int]]] = {}
+        # (metric, usage type) -> metric value by position
+        self._values: Dict[Tuple[str, str], list] = {}
+        for usage_type in USAGE_TYPES:
+            values = self.columns[f'{CoremarkPerDollar}_{usage_type}']
+            order = sorted((i for i, x in enumerate(values) if x is not None), key=lambda i: -values[i])
+            self._add_index(CoremarkPerDollar, usage_type, values, order, fields)
+
+            prices = fields[usage_type]
+            co2 = fields['region_co2_kwh']
+            order = sorted(
+                (i for i, x in enumerate(prices) if x is not None and self.columns['low_co2'][i]),
+                key=lambda i: (prices[i], co2[i] is None, co2[i] or 0)
+            )
+            self._add_index(LowCarbonPrice, usage_type, prices, order, fields)
+
+    def _add_index(self, metric: str, usage_type: str, values: list, order: List[int], fields: Dict[str, list]):
+        # splitting the sorted order keeps every group sorted, no per-group sort
+        groups: Dict[GroupKey, List[int]] = {None: order}
+        for i in order:
+            for field in GROUP_FIELDS:
+                groups.setdefault((field, fields[field][i]), []).append(i)
+        self._indexes[(metric, usage_type)] = groups
+        self._values[(metric, usage_type)] = values
+
+    def __len__(self) -> int:
+        return len(self.machines)
+
+    def _positions(self, metric: str, usage_type: str, key: GroupKey) -> List[int]:
+        if metric not in RANKING_METRICS:
+            raise ValueError(f'Unsupported metric: {metric}. Supported metrics: {RANKING_METRICS}')
+        if usage_type not in USAGE_TYPES:
+            raise ValueError(f'Unsupported usage type: {usage_type}. Supported usage types: {USAGE_TYPES}')
+        return self._indexes[(metric, usage_type)].get(key, [])
+
+    def iter_ranked(
+        self,
+        metric: str = CoremarkPerDollar,
+        usage_type: str = OnDemandUsage,
+        region: Optional[str] = None,
+        series: Optional[str] = None,
+    ) -> Iterable[RankedMachine]:
+        """
+        Yields machines best first.
+
+        :param metric: `coremark_per_dollar` or `low_carbon_price`
+        :param region: only machines of the region
+        :param series: only machines of the series, e.g. 'n2'
+        """
+        if region is not None:
+            positions = self._positions(metric, usage_type, ('region', region))
+        elif series is not None:
+            positions = self._positions(metric, usage_type, ('series', series))
+        else:
+            positions = self._positions(metric, usage_type, None)
+        values = self._values[(metric, usage_type)]
+        for i in positions:
+            # region lists are short, the series is checked while walking one
+            if region is not None and series is not None and self._series_column[i] != series:
+                continue
+            yield RankedMachine(self.machines[i], values[i])
+
+    def top(
+        self,
+        k: int = 10,
+        metric: str = CoremarkPerDollar,
+        usage_type: str = OnDemandUsage,
+        region: Optional[str] = None,
+        series: Optional[str] = None,
+    ) -> List[RankedMachine]:
+        """
+        :return: `k` best machines by the metric, see `iter_ranked`
+        """
+        result = []
+        if k <= 0:
+            return result
+        for ranked in self.iter_ranked(metric, usage_type, region, series):
+            result.append(ranked)
+            if len(result) == k:
+                break
+        return result
+
+    def best_per_region(
+        self,
+        metric: str = CoremarkPerDollar,
+        usage_type: str = OnDemandUsage,
+        series: Optional[str] = None,
+    ) -> Dict[str, RankedMachine]:
+        """
+        :return: region -> best machine of the region
+        """
+        result = {}
+        for region in self.regions:
+            best = self.top(1, metric, usage_type, region=region, series=series)
+            if best:
+                result[region] = best[0]
+        return result
+
+
+__all__ = [
+    'CoremarkPerDollar',
+    'LowCarbonPrice',
+    'MachineRankingIndex',
+    'RANKING_METRICS',
+    'RankedMachine'
+]
@@ -0,0 +1,161 @@
+import math
+import sys
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+MachineKey = Tuple[str, str]
+
+DEFAULT_USAGE_TYPES = ['ondemand', 'spot', 'cud1y', 'cud3y']
+
+
+def get_field(row: Any, field: str) -> Any:
+    """
+    Reads a field from a pydantic model or from a plain dict (e.g. a row of a dump file).
+    """
+    if isinstance(row, dict):
+        return row.get(field)
+    return getattr(row, field, None)
+
+
+class PriceDelta(BaseModel):
+    name: str
+    region: str
+    usage_type: str
+    left: float
+    right: float
+
+    @property
+    def delta(self) -> float:
+        return self.right - self.left
+
+    @property
+    def relative_delta(self) -> float:
+        if self.left == 0:
+            return math.inf if self.right else 0.0
+        return self.delta / self.left
+
+
+class UsageTypeStats(BaseModel):
+    compared: int = 0
+    mismatched: int = 0
+    max_abs_delta: float = 0.0
+
+
+class ReconciliationReport(BaseModel):
+    matched_rows: int = 0
+    # rows which are present only in one of the sources
+    missing_in_left: List[MachineKey] = []
+    missing_in_right: List[MachineKey] = []
+    deltas: List[PriceDelta] = []
+    usage_types: Dict[str, UsageTypeStats] = {}
+
+    @property
+    def is_consistent(self) -> bool:
+        return not (self.missing_in_left or self.missing_in_right or self.deltas)
+
+
+class Reconciler:
+    """
+    Cross-checks prices of two providers outputs, e.g. `GCPMachinesScraper` (left) and
+    `GCloudComputeMachinesProvider` (right).
+
+    It's a hash join on (name, region): the left source is consumed once into a dict with price tuples only,
+    then the right source is streamed and probed row by row. Matched keys are removed right away, so time is
+    linear in both sources. Memory holds the left prices, plus the distinct keys of the right source
+    to skip its duplicates, and the reported keys missing in either source. Put the smaller source on the left.
+    """
+
+    def __init__(
+        self,
+        tolerance: float = 0.01,
+        absolute_tolerance: float = 1e-5,
+        usage_types: Optional[List[str]] = None,
+        regions: Optional[Iterable[str]] = None,
+    ):
+        """
+        :param tolerance: max allowed relative price delta
+        :param absolute_tolerance: price deltas below this value are ignored
+        :param usage_types: price fields to compare
+        :param regions: compare only the provided regions. All regions are compared if None.
+        """
+        self.tolerance = tolerance
+        self.absolute_tolerance = absolute_tolerance
+        self.usage_types = DEFAULT_USAGE_TYPES if usage_types is None else usage_types
+        self.regions = None if regions is None else set(regions)
+
+    def _key(self, row: Any) -> Optional[MachineKey]:
+        region = get_field(row, 'region')
+        # rows without a region can't be matched
+        if region is None or (self.regions is not None and region not in self.regions):
+            return None
+        return sys.intern(get_field(row, 'name')), sys.intern(region)
+
+    def _prices(self, row: Any) -> Tuple[Optional[float], ...]:
+        return tuple(get_field(row, usage_type) for usage_type in self.usage_types)
+
+    def _is_mismatch(self, left: float, right: float) -> bool:
+        delta = abs(right - left)
+        if delta <= self.absolute_tolerance:
+            return False
+        return delta > self.tolerance * abs(left)
+
+    def reconcile(self, left: Iterable[Any], right: Iterable[Any]) -> ReconciliationReport:
+        """
+        :param left: rows of the first source (models or dicts). Consumed into memory.
+        :param right: rows of the second source (models or dicts). Streamed.
+            Rows without a region are skipped in both sources.
+        """
+        report = ReconciliationReport(
+            usage_types={usage_type: UsageTypeStats() for usage_type in self.usage_types}
+        )
+        stats = [report.usage_types[usage_type] for usage_type in self.usage_types]
+
+        # build
+        left_prices: Dict[MachineKey, Tuple[Optional[float], ...]] = {}
+        for row in left:
+            key = self._key(row)
+            if key is not None:
+                left_prices.setdefault(key, self._prices(row))
+
+        # probe
+        seen_right = set()
+        for row in right:
+            key = self._key(row)
+            if key is None or key in seen_right:
+                continue
+            # duplicates of the right source are skipped, matched or not
+            seen_right.add(key)
+            prices = left_prices.pop(key, None)
+            if prices is None:
+                report.missing_in_left.append(key)
+                continue
+            report.matched_rows += 1
+            for usage_type, usage_stats, left_price, right_price in zip(
+                self.usage_types, stats, prices, self._prices(row)
+            ):
+                if left_price is None or right_price is None:
+                    continue
+                usage_stats.compared += 1
+                usage_stats.max_abs_delta = max(usage_stats.max_abs_delta, abs(right_price - left_price))
+                if self._is_mismatch(left_price, right_price):
+                    usage_stats.mismatched += 1
+                    report.deltas.append(PriceDelta(
+                        name=key[0],
+                        region=key[1],
+                        usage_type=usage_type,
+                        left=left_price,
+                        right=right_price
+                    ))
+
+        report.missing_in_right = list(left_prices)
+        return report
+
+
+__all__ = [
+    'Reconciler',
+    'ReconciliationReport',
+    'PriceDelta',
+    'UsageTypeStats',
+    'get_field'
+]
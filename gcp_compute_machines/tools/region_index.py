@@ -0,0 +1,190 @@
+import math
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from gcp_compute_machines.constants import *
+
+if TYPE_CHECKING:
+    from gcp_compute_machines.providers.base.models.base_machine_info_model import GCPMachineType
+
+EARTH_RADIUS_KM = 6371.0088
+USAGE_TYPES: List[UsageType] = [OnDemandUsage, SpotUsage, CommitmentOneYearUsage, CommitmentThreeYearsUsage]
+
+Machine = Union['GCPMachineType', dict]
+
+
+class RegionMatch(NamedTuple):
+    region: str
+    distance_km: float
+    # hourly price of the requested machine type, None if no machine type was requested
+    price: Optional[float] = None
+    machine: Optional[Machine] = None
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _field(machine: Machine, name: str):
+    return machine.get(name) if isinstance(machine, dict) else getattr(machine, name, None)
+
+
+class RegionSpatialIndex:
+    """
+    Haversine grid over region coordinates, linked to per machine type prices.
+
+    Regions are put into `cell_degrees` x `cell_degrees` lat/lng cells. A radius query visits only
+    the cells of the circle bounding box and checks the exact great-circle distance of their regions,
+    a k-nearest query repeats radius queries with a doubling radius. Machine rows are kept as
+    machine type -> region -> row, so the price filter looks up only the found regions.
+    """
+
+    def __init__(self, machines: Iterable[Machine], cell_degrees: float = 5.0):
+        """
+        :param machines: gcloud-compute machines (or their dumped rows) with `region_lat` / `region_lng`
+        """
+        self.cell_degrees = cell_degrees
+        self._lng_cells = math.ceil(360 / cell_degrees)
+        # region -> (lat, lng)
+        self.coordinates: Dict[str, Tuple[float, float]] = {}
+        # machine type -> region -> row
+        self._machines: Dict[str, Dict[str, Machine]] = {}
+        for machine in machines:
+            region = _field(machine, 'region')
+            lat, lng = _field(machine, 'region_lat'), _field(machine, 'region_lng')
+            if region is None or lat is None or lng is None:
+                continue
+            self.coordinates.setdefault(region, (lat, lng))
+            self._machines.setdefault(_field(machine, 'name'), {})[region] = machine
+
+        self._cells: Dict[Tuple[int, int], List[str]] = {}
+        for region, (lat, lng) in self.coordinates.items():
+            self._cells.setdefault(self._cell(lat, lng), []).append(region)
+
+    def __len__(self) -> int:
+        return len(self.coordinates)
+
+    def __contains__(self, region: str) -> bool:
+        return region in self.coordinates
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell_degrees), math.floor((lng % 360) / self.cell_degrees) % self._lng_cells
+
+    def _candidate_cells(self, lat: float, lng: float, radius_km: float) -> Iterable[Tuple[int, int]]:
+        # bounding box of the circle, http://janmatuschek.de/LatitudeLongitudeBoundingCoordinates
+        angular_radius = radius_km / EARTH_RADIUS_KM
+        lat_min = lat - math.degrees(angular_radius)
+        lat_max = lat + math.degrees(angular_radius)
+        lat_cells = range(math.floor(lat_min / self.cell_degrees), math.floor(lat_max / self.cell_degrees) + 1)
+        if lat_min <= -90 or lat_max >= 90 or angular_radius >= math.pi / 2:
+            # the circle covers a pole, all longitudes
+            lng_cells = range(self._lng_cells)
+        else:
+            delta_lng = math.degrees(math.asin(math.sin(angular_radius) / math.cos(math.radians(lat))))
+            if 2 * delta_lng + self.cell_degrees >= 360:
+                lng_cells = range(self._lng_cells)
+            else:
+                # the last cell is narrower if `cell_degrees` doesn't divide 360, so the cell count
+                # isn't derived from the width: walk from the first cell to the last one
+                first = self._cell(lat, lng - delta_lng)[1]
+                last = self._cell(lat, lng + delta_lng)[1]
+                count = (last - first) % self._lng_cells + 1
+                lng_cells = [(first + i) % self._lng_cells for i in range(count)]
+        for lat_cell in lat_cells:
+            for lng_cell in lng_cells:
+                yield lat_cell, lng_cell
+
+    def _regions_within(self, lat: float, lng: float, radius_km: float) -> List[Tuple[float, str]]:
+        result = []
+        for cell in self._candidate_cells(lat, lng, radius_km):
+            for region in self._cells.get(cell, ()):
+                distance = haversine_km(lat, lng, *self.coordinates[region])
+                if distance <= radius_km:
+                    result.append((distance, region))
+        return result
+
+    def _matches(
+        self,
+        candidates: Iterable[Tuple[float, str]],
+        machine_type: Optional[str],
+        usage_type: str,
+        max_price: Optional[float],
+    ) -> List[RegionMatch]:
+        if machine_type is None:
+            return [RegionMatch(region, distance) for distance, region in candidates]
+        if usage_type not in USAGE_TYPES:
+            raise ValueError(f'Unsupported usage type: {usage_type}. Supported usage types: {USAGE_TYPES}')
+        machines = self._machines.get(machine_type, {})
+        result = []
+        for distance, region in candidates:
+            machine = machines.get(region)
+            if machine is None:
+                continue
+            price = _field(machine, usage_type)
+            if price is None or (max_price is not None and price > max_price):
+                continue
+            result.append(RegionMatch(region, distance, price, machine))
+        return result
+
+    def within(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        machine_type: Optional[str] = None,
+        usage_type: str = OnDemandUsage,
+        max_price: Optional[float] = None,
+    ) -> List[RegionMatch]:
+        """
+        :param machine_type: only regions offering the machine type, e.g. 'n2-standard-4'
+        :param max_price: max hourly price of `usage_type`, requires `machine_type`
+        :return: regions within `radius_km` of the point, nearest first
+        """
+        candidates = sorted(self._regions_within(lat, lng, radius_km))
+        return self._matches(candidates, machine_type, usage_type, max_price)
+
+    def nearest(
+        self,
+        lat: float,
+        lng: float,
+        k: int = 1,
+        machine_type: Optional[str] = None,
+        usage_type: str = OnDemandUsage,
+        max_price: Optional[float] = None,
+    ) -> List[RegionMatch]:
+        """
+        :return: `k` nearest regions matching the filters, nearest first
+        """
+        if k <= 0 or not self.coordinates:
+            return []
+        half_circumference = math.pi * EARTH_RADIUS_KM
+        radius_km = self.cell_degrees * math.pi / 180 * EARTH_RADIUS_KM
+        while True:
+            # all regions within the radius are found, so k matches within it are the k nearest ones
+            matches = self.within(lat, lng, radius_km, machine_type, usage_type, max_price)
+            if len(matches) >= k or radius_km >= half_circumference:
+                return matches[:k]
+            radius_km *= 2
+
+    def cheapest_within(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        machine_type: str,
+        usage_type: str = OnDemandUsage,
+        max_price: Optional[float] = None,
+    ) -> Optional[RegionMatch]:
+        """
+        :return: the cheapest region offering the machine type within `radius_km`, nearer wins ties
+        """
+        matches = self.within(lat, lng, radius_km, machine_type, usage_type, max_price)
+        return min(matches, key=lambda x: (x.price, x.distance_km), default=None)
+
+
+__all__ = [
+    'RegionMatch',
+    'RegionSpatialIndex',
+    'haversine_km'
+]
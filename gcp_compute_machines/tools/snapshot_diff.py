@@ -0,0 +1,170 @@
+import argparse
+import json
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Literal, Optional, Tuple
+
+from pydantic import BaseModel
+
+from gcp_compute_machines.dumps.reader import iter_dump_rows
+from gcp_compute_machines.tools.reconciliation import MachineKey, get_field
+
+DEFAULT_USAGE_TYPES = ['ondemand', 'spot', 'sud', 'cud1y', 'cud3y']
+
+ChangeKind = Literal['added', 'removed', 'changed']
+
+
+class SnapshotChange(BaseModel):
+    kind: ChangeKind
+    name: str
+    region: str
+    # None for added/removed rows
+    usage_type: Optional[str] = None
+    old: Optional[float] = None
+    new: Optional[float] = None
+
+    @property
+    def delta(self) -> Optional[float]:
+        if self.old is None or self.new is None:
+            return None
+        return self.new - self.old
+
+
+class SnapshotDiff(BaseModel):
+    added: List[MachineKey] = []
+    removed: List[MachineKey] = []
+    changed: List[SnapshotChange] = []
+
+    @property
+    def is_empty(self) -> bool:
+        return not (self.added or self.removed or self.changed)
+
+
+class SnapshotDiffer:
+    """
+    Streams two pricing snapshots and emits added/removed rows and changed prices keyed by (name, region).
+
+    The old snapshot is reduced to a (name, region) -> price tuple dict, the new one is streamed and probed.
+    Memory is bounded by the key set, full rows are never kept.
+    """
+
+    def __init__(
+        self,
+        usage_types: Optional[List[str]] = None,
+        tolerance: float = 1e-9,
+    ):
+        """
+        :param usage_types: price fields to compare
+        :param tolerance: absolute price delta which isn't reported as a change
+        """
+        self.usage_types = DEFAULT_USAGE_TYPES if usage_types is None else usage_types
+        self.tolerance = tolerance
+
+    def _prices(self, row: Any) -> Tuple[Optional[float], ...]:
+        return tuple(get_field(row, usage_type) for usage_type in self.usage_types)
+
+    def _is_changed(self, old: Optional[float], new: Optional[float]) -> bool:
+        if old is None or new is None:
+            return old is not new
+        return abs(new - old) > self.tolerance
+
+    def iter_changes(self, old_rows: Iterable[Any], new_rows: Iterable[Any]) -> Iterator[SnapshotChange]:
+        """
+        Yields `changed` and `added` items while the new snapshot is streamed and `removed` items at the end.
+        """
+        old_prices: Dict[MachineKey, Tuple[Optional[float], ...]] = {}
+        for row in old_rows:
+            old_prices.setdefault(
+                (sys.intern(get_field(row, 'name')), sys.intern(get_field(row, 'region'))),
+                self._prices(row)
+            )
+
+        seen = set()
+        for row in new_rows:
+            name, region = get_field(row, 'name'), get_field(row, 'region')
+            key = (name, region)
+            if key in seen:
+                continue
+            seen.add(key)
+            prices = old_prices.pop(key, None)
+            if prices is None:
+                yield SnapshotChange(kind='added', name=name, region=region)
+                continue
+            for usage_type, old, new in zip(self.usage_types, prices, self._prices(row)):
+                if self._is_changed(old, new):
+                    yield SnapshotChange(
+                        kind='changed',
+                        name=name,
+                        region=region,
+                        usage_type=usage_type,
+                        old=old,
+                        new=new
+                    )
+
+        for name, region in old_prices:
+            yield SnapshotChange(kind='removed', name=name, region=region)
+
+    def diff(self, old_rows: Iterable[Any], new_rows: Iterable[Any]) -> SnapshotDiff:
+        result = SnapshotDiff()
+        for change in self.iter_changes(old_rows, new_rows):
+            if change.kind == 'added':
+                result.added.append((change.name, change.region))
+            elif change.kind == 'removed':
+                result.removed.append((change.name, change.region))
+            else:
+                result.changed.append(change)
+        return result
+
+    def diff_files(self, old_file_path: str, new_file_path: str) -> SnapshotDiff:
+        return self.diff(iter_dump_rows(old_file_path), iter_dump_rows(new_file_path))
+
+
+def diff_snapshots(
+    old_file_path: str,
+    new_file_path: str,
+    usage_types: Optional[List[str]] = None,
+    tolerance: float = 1e-9,
+) -> SnapshotDiff:
+    """
+    Compares two pricing dumps in any supported format.
+    """
+    return SnapshotDiffer(usage_types=usage_types, tolerance=tolerance).diff_files(old_file_path, new_file_path)
+
+
+def add_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument('old', help='old pricing dump')
+    parser.add_argument('new', help='new pricing dump')
+    parser.add_argument('--usage-types', nargs='+', default=None, help='price fields to compare')
+    parser.add_argument('--tolerance', type=float, default=1e-9, help='absolute price delta to ignore')
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Prints one JSON object per change.
+
+    :return: exit code: 0 if snapshots have the same prices, 1 otherwise
+    """
+    differ = SnapshotDiffer(usage_types=args.usage_types, tolerance=args.tolerance)
+    has_changes = False
+    for change in differ.iter_changes(iter_dump_rows(args.old), iter_dump_rows(args.new)):
+        has_changes = True
+        print(json.dumps(change.model_dump(exclude_none=True)))
+    return int(has_changes)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Diff two pricing snapshots')
+    add_arguments(parser)
+    sys.exit(run(parser.parse_args(argv)))
+
+
+__all__ = [
+    'SnapshotChange',
+    'SnapshotDiff',
+    'SnapshotDiffer',
+    'diff_snapshots'
+]
+
+
+if __name__ == '__main__':
+    main()
+
@@ -0,0 +1,173 @@
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    # providers import the GCP SDK, the index itself is used by the lightweight CLI commands
+    from gcp_compute_machines.providers.base.models.base_machine_info_model import GCPMachineType
+
+
+def zone_region(zone: str) -> str:
+    return '-'.join(zone.split('-')[:2])
+
+
+def _bits(bitset: int) -> Iterable[int]:
+    while bitset:
+        low_bit = bitset & -bitset
+        yield low_bit.bit_length() - 1
+        bitset ^= low_bit
+
+
+class ZoneAvailabilityIndex:
+    """
+    Compact machine x zone availability bitmap.
+
+    Zones and machines have fixed sorted orderings. Every machine keeps a bitset over zones and
+    every zone keeps a bitset over machines, so both "which zones offer machine X" and
+    "which machines exist in zone Z" are a single lookup and set queries across
+    machine (or zone) sets are plain AND/OR operations on integers.
+    """
+
+    def __init__(self, availability: Dict[str, Iterable[str]]):
+        """
+        :param availability: machine name -> zones where the machine is available
+        """
+        self.zones: List[str] = sorted(set(zone for zones in availability.values() for zone in zones))
+        self.machines: List[str] = sorted(availability)
+        self._zone_positions: Dict[str, int] = {zone: i for i, zone in enumerate(self.zones)}
+        self._machine_positions: Dict[str, int] = {machine: i for i, machine in enumerate(self.machines)}
+
+        self._machine_zones: Dict[str, int] = {}
+        zone_machines = [0] * len(self.zones)
+        for machine, zones in availability.items():
+            bitset = 0
+            machine_bit = 1 << self._machine_positions[machine]
+            for zone in zones:
+                position = self._zone_positions[zone]
+                bitset |= 1 << position
+                zone_machines[position] |= machine_bit
+            self._machine_zones[machine] = bitset
+        self._zone_machines: Dict[str, int] = dict(zip(self.zones, zone_machines))
+
+    def __len__(self) -> int:
+        return len(self.machines)
+
+    def __contains__(self, machine: str) -> bool:
+        return machine in self._machine_zones
+
+    # region constructors
+
+    @classmethod
+    def from_scraped_machines(cls, machines: Dict[str, dict]) -> 'ZoneAvailabilityIndex':
+        """
+        Builds index from `InstanceScraper.machines`.
+        """
+        return cls({name: machine['zones'] for name, machine in machines.items()})
+
+    @classmethod
+    def from_gcloud_compute_machines(cls, machines: Iterable['GCPMachineType']) -> 'ZoneAvailabilityIndex':
+        """
+        Builds index from gcloud-compute rows. Their `zones` field is a comma separated string.
+        """
+        availability: Dict[str, set] = {}
+        for machine in machines:
+            zones = availability.setdefault(machine.name, set())
+            if machine.zones:
+                zones.update(zone.strip() for zone in machine.zones.split(',') if zone.strip())
+        return cls(availability)
+
+    # endregion
+
+    # region bitsets
+
+    def zones_bitset(self, machine: str) -> int:
+        return self._machine_zones.get(machine, 0)
+
+    def machines_bitset(self, zone: str) -> int:
+        return self._zone_machines.get(zone, 0)
+
+    def _decode_zones(self, bitset: int) -> List[str]:
+        return [self.zones[i] for i in _bits(bitset)]
+
+    def _decode_machines(self, bitset: int) -> List[str]:
+        return [self.machines[i] for i in _bits(bitset)]
+
+    # endregion
+
+    # region queries
+
+    def zones_for(self, machine: str) -> List[str]:
+        return self._decode_zones(self.zones_bitset(machine))
+
+    def regions_for(self, machine: str) -> List[str]:
+        return sorted(set(zone_region(zone) for zone in self.zones_for(machine)))
+
+    def machines_in(self, zone: str) -> List[str]:
+        return self._decode_machines(self.machines_bitset(zone))
+
+    def is_available(self, machine: str, zone: str) -> bool:
+        position = self._zone_positions.get(zone)
+        if position is None:
+            return False
+        return bool(self.zones_bitset(machine) >> position & 1)
+
+    def zones_offering_all(self, machines: Iterable[str]) -> List[str]:
+        """
+        :return: zones where every provided machine type is available
+        """
+        bitset: Optional[int] = None
+        for machine in machines:
+            bitset = self.zones_bitset(machine) if bitset is None else bitset & self.zones_bitset(machine)
+        return self._decode_zones(bitset or 0)
+
+    def zones_offering_any(self, machines: Iterable[str]) -> List[str]:
+        """
+        :return: zones where at least one of the provided machine types is available
+        """
+        bitset = 0
+        for machine in machines:
+            bitset |= self.zones_bitset(machine)
+        return self._decode_zones(bitset)
+
+    def machines_in_all(self, zones: Iterable[str]) -> List[str]:
+        """
+        :return: machine types available in every provided zone
+        """
+        bitset: Optional[int] = None
+        for zone in zones:
+            bitset = self.machines_bitset(zone) if bitset is None else bitset & self.machines_bitset(zone)
+        return self._decode_machines(bitset or 0)
+
+    def machines_in_any(self, zones: Iterable[str]) -> List[str]:
+        """
+        :return: machine types available in at least one of the provided zones
+        """
+        bitset = 0
+        for zone in zones:
+            bitset |= self.machines_bitset(zone)
+        return self._decode_machines(bitset)
+
+    # endregion
+
+    def to_dict(self) -> dict:
+        """
+        :return:
+            zones: [zone, ...]
+            machines:
+                machine_type: hex bitset over `zones`
+        """
+        return {
+            'zones': self.zones,
+            'machines': {machine: hex(self._machine_zones[machine]) for machine in self.machines}
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'ZoneAvailabilityIndex':
+        zones = data['zones']
+        return cls({
+            machine: [zones[i] for i in _bits(int(bitset, 16))]
+            for machine, bitset in data['machines'].items()
+        })
+
+
+__all__ = [
+    'ZoneAvailabilityIndex'
+]
@@ -0,0 +1,118 @@
+import csv
+import io
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+
+from gcp_compute_machines.testing import FakeCatalogServer, FakeComputeServer, make_machine_types, make_sku_catalog
+from gcp_compute_machines.testing.catalog import DEFAULT_REGIONS
+
+ZONES = [f'{region}-{suffix}' for region in DEFAULT_REGIONS for suffix in 'bc']
+
+GCLOUD_COMPUTE_HEADER = [
+    'name', 'series', 'family', 'description', 'vCpus', 'memoryGB', 'availableCpuPlatform', 'acceleratorCount',
+    'bandwidth', 'tier1', 'month', 'monthSpot', 'month1yCud', 'month3yCud', 'region', 'zones', 'regionLat', 'regionLng',
+]
+
+
+@pytest.fixture(scope='session')
+def fake_servers():
+    """
+    Fake Cloud Billing catalog and Compute Engine servers with SKUs and machine types of the package mappings.
+    """
+    catalog = FakeCatalogServer(
+        make_sku_catalog(), default_page_size=200, currency_rates={'EUR': 0.92, 'GBP': 0.79}
+    ).start()
+    compute = FakeComputeServer(DEFAULT_REGIONS, ZONES, make_machine_types(ZONES)).start()
+    yield catalog, compute
+    catalog.stop()
+    compute.stop()
+
+
+@pytest.fixture
+def make_client_pool(fake_servers):
+    """
+    `GCPClientPool` factory on top of the fake servers.
+    """
+    from gcp_compute_machines.providers.scraper.clients import GCPClientPool
+
+    catalog, compute = fake_servers
+
+    def _make_client_pool(**kwargs):
+        return GCPClientPool(
+            AnonymousCredentials(),
+            compute_endpoint=compute.address,
+            billing_endpoint=catalog.address,
+            insecure=True,
+            retry_initial=0.01,
+            **kwargs
+        )
+
+    return _make_client_pool
+
+
+@pytest.fixture
+def make_scraper(make_client_pool, tmp_path, monkeypatch):
+    """
+    `InstanceScraper` factory on top of the fake servers. Cache files are written into a temporary directory.
+    """
+    from gcp_compute_machines.providers.scraper.scraper import InstanceScraper
+
+    monkeypatch.chdir(tmp_path)
+
+    def _make_scraper(request_budget=None, **kwargs):
+        return InstanceScraper(
+            gcp_project='fake',
+            client_pool=make_client_pool(request_budget=request_budget),
+            log_level='ERROR',
+            **kwargs
+        )
+
+    return _make_scraper
+
+
+def make_gcloud_compute_csv() -> str:
+    rows = []
+    for i, region in enumerate(DEFAULT_REGIONS):
+        for cpus in (2, 4, 8):
+            rows.append([
+                f'n2-standard-{cpus}', 'n2', 'General purpose',
+                # a quoted field with a line break
+                'Balanced price\nand performance' if cpus == 4 else '',
+                cpus, cpus * 4, 'Intel Cascade Lake', '', 10, '',
+                cpus * 25.0 * (1 + i / 10), cpus * 7.0, cpus * 16.0, cpus * 11.0,
+                region, f'{region}-b, {region}-c', 10.0 * i, -20.0 * i,
+            ])
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(GCLOUD_COMPUTE_HEADER)
+    writer.writerows(rows)
+    return buffer.getvalue()
+
+
+@pytest.fixture(scope='session')
+def gcloud_compute_url():
+    """
+    URL of a local HTTP server with gcloud-compute.com CSV data.
+    """
+    body = make_gcloud_compute_csv().encode()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/csv')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('localhost', 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f'http://localhost:{server.server_port}/machine-types-regions.csv'
+    server.shutdown()
+    server.server_close()
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gcp_compute_machines.benchmarks.fixtures import make_pricing_data
+from gcp_compute_machines.providers.base.models.base_machine_info_model import GCPMachineType
+from gcp_compute_machines.tools.batch_quote import PRICE_COLUMNS, BatchQuoter
+
+
+@pytest.fixture(scope='module')
+def machines():
+    return make_pricing_data(regions=3)
+
+
+@pytest.fixture(scope='module')
+def quoter(machines):
+    return BatchQuoter(machines)
+
+
+def _expected_price(machines, machine_type, region, usage_type):
+    for machine in machines:
+        if machine.name == machine_type and machine.region == region:
+            price = getattr(machine, usage_type)
+            return np.nan if price is None else price
+    return np.nan
+
+
+def test_quote_matches_row_lookups(machines, quoter):
+    rng = np.random.default_rng(0)
+    names = sorted({x.name for x in machines}) + ['unknown-type']
+    regions = sorted({x.region for x in machines}) + ['unknown-region']
+    size = 500
+    machine_types = rng.choice(names, size)
+    row_regions = rng.choice(regions, size)
+    usage_types = rng.choice(PRICE_COLUMNS, size)
+    hours = rng.uniform(0, 730, size)
+
+    result = quoter.quote(machine_types, row_regions, usage_types, hours)
+    expected = np.array([
+        _expected_price(machines, *row) for row in zip(machine_types, row_regions, usage_types)
+    ])
+    np.testing.assert_array_equal(result.rows['hourly_price'].to_numpy(), expected)
+    np.testing.assert_allclose(result.rows['cost'].to_numpy(), expected * hours)
+    assert result.missing_rows == int(np.isnan(expected).sum()) > 0
+    assert result.total_cost == pytest.approx(np.nansum(expected * hours))
+    assert list(result.rows['machine_type']) == list(machine_types)
+
+
+def test_single_usage_type_and_default_hours(machines, quoter):
+    result = quoter.quote(['n2-standard-4', 'c3-highmem-8'], ['us-east1', 'us-central1'], 'spot')
+    assert list(result.rows['hours']) == [1.0, 1.0]
+    assert list(result.rows['usage_type']) == ['spot', 'spot']
+    assert list(result.rows['hourly_price']) == [
+        _expected_price(machines, 'n2-standard-4', 'us-east1', 'spot'),
+        _expected_price(machines, 'c3-highmem-8', 'us-central1', 'spot'),
+    ]
+
+
+def test_quote_frame_and_aggregates(quoter):
+    df = pd.DataFrame({
+        'machine_type': ['n2-standard-4', 'n2-standard-4', 'e2-highcpu-2'],
+        'region': ['us-east1', 'us-central1', 'us-east1'],
+        'usage_type': ['ondemand', 'ondemand', 'cud3y'],
+        'hours': [10.0, 20.0, 30.0],
+    })
+    result = quoter.quote_frame(df)
+    assert result.costs_by_region == pytest.approx({
+        'us-central1': result.rows['cost'][1],
+        'us-east1': result.rows['cost'][0] + result.rows['cost'][2],
+    })
+    assert result.costs_by_usage_type.keys() == {'ondemand', 'cud3y'}
+    assert result.missing.empty
+
+    without_hours = quoter.quote_frame(df.drop(columns='hours'))
+    assert list(without_hours.rows['hours']) == [1.0, 1.0, 1.0]
+
+
+def test_duplicated_rows_keep_first_and_missing_prices_are_nan():
+    shape = dict(name='n2-standard-2', series='n2', family='General purpose', cpu_count=2, ram=8,
+                 network_bandwidth=10, region='us-east1')
+    machines = [
+        GCPMachineType(**shape, ondemand=1.0, spot=None),
+        GCPMachineType(**shape, ondemand=2.0, spot=0.5),
+    ]
+    quoter = BatchQuoter(machines)
+    assert len(quoter) == 1
+    prices = quoter.hourly_prices(['n2-standard-2'] * 2, ['us-east1'] * 2, ['ondemand', 'spot'])
+    assert prices[0] == 1.0
+    assert np.isnan(prices[1])
+
+
+def test_unknown_single_usage_type_is_missing(quoter):
+    machine_types = ['n2-standard-4', 'c3-highmem-8']
+    regions = ['us-east1', 'us-central1']
+    assert np.isnan(quoter.hourly_prices(machine_types, regions, 'cud5y')).all()
+    np.testing.assert_array_equal(
+        quoter.hourly_prices(machine_types, regions, 'cud5y'),
+        quoter.hourly_prices(machine_types, regions, ['cud5y', 'cud5y'])
+    )
+    result = quoter.quote(machine_types, regions, 'cud5y', hours=10)
+    assert result.missing_rows == 2
+    assert result.total_cost == 0
+    assert list(result.missing['usage_type']) == ['cud5y', 'cud5y']
@@ -0,0 +1,53 @@
+import pytest
+
+from gcp_compute_machines.dumps import BinarySnapshot, iter_dump_rows, write_binary_snapshot
+from gcp_compute_machines.providers.gcloud_compute import GCloudComputeMachinesProvider
+
+
+def test_round_trip_of_typed_columns(tmp_path):
+    rows = [
+        {'name': 'n2-standard-2', 'vcpus': 2, 'month': 48.5, 'tier1': True, 'description': 'Zürich\nrow'},
+        {'name': 'n2-standard-4', 'vcpus': None, 'month': None, 'tier1': None, 'description': None},
+        {'name': 'n2-standard-2', 'vcpus': -(2 ** 62), 'month': 7, 'tier1': False, 'description': ''},
+    ]
+    file_path = str(tmp_path / 'machines.gcpm')
+    write_binary_snapshot(file_path, rows, metadata={'origin': 'test'}, zones={'us-east1': ['us-east1-b']})
+
+    with BinarySnapshot(file_path) as snapshot:
+        assert len(snapshot) == 3
+        assert snapshot.columns == ['name', 'vcpus', 'month', 'tier1', 'description']
+        assert snapshot.metadata == {'origin': 'test'}
+        assert snapshot.zones == {'us-east1': ['us-east1-b']}
+        assert list(snapshot.iter_rows()) == rows
+        assert snapshot.row(2) == rows[2]
+        assert snapshot.column('month') == [48.5, None, 7.0]
+
+
+def test_rejects_mixed_columns(tmp_path):
+    with pytest.raises(TypeError):
+        write_binary_snapshot(str(tmp_path / 'machines.gcpm'), [{'vcpus': 2}, {'vcpus': '2'}])
+
+
+def test_scraper_dump_matches_yaml_dump(make_scraper, tmp_path):
+    scraper = make_scraper()
+    scraper.run()
+    scraper.dump_flat_pricing_data(str(tmp_path / 'machines.yaml'))
+    scraper.dump_flat_pricing_data(str(tmp_path / 'machines.gcpm'))
+
+    yaml_rows = list(iter_dump_rows(str(tmp_path / 'machines.yaml')))
+    assert len(yaml_rows) == len(scraper.flat_pricing_data)
+    assert list(iter_dump_rows(str(tmp_path / 'machines.gcpm'))) == yaml_rows
+    with BinarySnapshot(str(tmp_path / 'machines.gcpm')) as snapshot:
+        assert snapshot.zones == scraper.zone_availability.to_dict()
+
+
+def test_provider_dump_matches_yaml_dump(gcloud_compute_url, tmp_path):
+    provider = GCloudComputeMachinesProvider(log_level='ERROR', url=gcloud_compute_url)
+    provider.fetch_gcp_machines()
+    provider.dump_pricing_info(str(tmp_path / 'machines.yaml'))
+    provider.dump_pricing_info(str(tmp_path / 'machines.gcpm'))
+
+    yaml_rows = list(iter_dump_rows(str(tmp_path / 'machines.yaml')))
+    assert list(iter_dump_rows(str(tmp_path / 'machines.gcpm'))) == yaml_rows
+    with BinarySnapshot(str(tmp_path / 'machines.gcpm')) as snapshot:
+        assert snapshot.zones == provider.zone_availability.to_dict()
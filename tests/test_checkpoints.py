@@ -0,0 +1,56 @@
+import asyncio
+
+import pytest
+
+from gcp_compute_machines.exceptions import RequestBudgetExceeded
+from gcp_compute_machines.providers.scraper.checkpoints import RunCheckpoints
+
+
+def _run(scraper, use_async, **kwargs):
+    if use_async:
+        asyncio.run(scraper.arun(**kwargs))
+    else:
+        scraper.run(**kwargs)
+
+
+def _rows(scraper):
+    return [x.model_dump() for x in scraper.flat_pricing_data]
+
+
+@pytest.fixture
+def full_run(make_scraper):
+    scraper = make_scraper()
+    scraper.run()
+    return _rows(scraper), scraper.clients.requests_made
+
+
+@pytest.mark.parametrize('use_async', [False, True], ids=['sync', 'async'])
+@pytest.mark.parametrize('failure_point', [0.0, 0.3, 0.6, 0.9])
+def test_resumed_run_matches_full_run(make_scraper, full_run, tmp_path, failure_point, use_async):
+    rows, requests_made = full_run
+    budget = max(1, int(requests_made * failure_point))
+    checkpoint_dir = str(tmp_path / 'checkpoints')
+    failed = make_scraper(request_budget=budget, checkpoint_dir=checkpoint_dir)
+    with pytest.raises(RequestBudgetExceeded):
+        _run(failed, use_async)
+    assert RunCheckpoints.latest_run_id(checkpoint_dir) == failed.run_id
+
+    resumed = make_scraper(checkpoint_dir=checkpoint_dir)
+    _run(resumed, use_async, run_id=failed.run_id)
+    assert _rows(resumed) == rows
+    if use_async:
+        # pages of the concurrent listings which were in flight on the failure are requested again
+        assert resumed.clients.requests_made <= requests_made
+    else:
+        # pages listed before the failure are not requested again
+        assert resumed.clients.requests_made <= requests_made - budget + 1
+    assert RunCheckpoints.latest_run_id(checkpoint_dir) is None
+
+
+def test_run_can_not_be_resumed_with_another_scope(make_scraper, tmp_path):
+    checkpoint_dir = str(tmp_path / 'checkpoints')
+    failed = make_scraper(request_budget=1, checkpoint_dir=checkpoint_dir)
+    with pytest.raises(RequestBudgetExceeded):
+        failed.run()
+    with pytest.raises(ValueError):
+        make_scraper(checkpoint_dir=checkpoint_dir).run(run_id=failed.run_id, regions=['us-east1'])
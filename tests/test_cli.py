@@ -0,0 +1,80 @@
+import pytest
+import yaml
+
+from gcp_compute_machines import cli
+from gcp_compute_machines.testing.catalog import DEFAULT_REGIONS
+
+
+def _run(argv):
+    with pytest.raises(SystemExit) as exc_info:
+        cli.main(argv)
+    return exc_info.value.code
+
+
+def _machines(file_path):
+    with open(file_path) as file:
+        return yaml.safe_load(file)['machines']
+
+
+@pytest.fixture
+def fake_gcloud_compute(gcloud_compute_url, monkeypatch):
+    from gcp_compute_machines.providers.gcloud_compute import GCloudComputeMachinesProvider
+
+    monkeypatch.setattr(GCloudComputeMachinesProvider, 'DATA_URL', gcloud_compute_url)
+
+
+@pytest.fixture
+def fake_scraper(make_client_pool, tmp_path, monkeypatch):
+    """
+    Points `gcp-machines scrape scraper` to the fake servers.
+    """
+    from google.auth.credentials import AnonymousCredentials
+    from gcp_compute_machines.providers.scraper import scraper
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(
+        scraper.service_account.Credentials, 'from_service_account_file', lambda path: AnonymousCredentials()
+    )
+    monkeypatch.setattr(
+        scraper, 'GCPClientPool',
+        lambda credentials, **kwargs: make_client_pool(**kwargs)
+    )
+
+
+@pytest.mark.parametrize('use_async', [False, True])
+def test_scrape_gcloud_compute(fake_gcloud_compute, tmp_path, use_async):
+    output = tmp_path / 'gcloud.yaml'
+    argv = ['scrape', 'gcloud-compute', '-o', str(output)] + (['--async'] if use_async else [])
+    assert _run(argv) == 0
+    machines = _machines(output)
+    assert len(machines) == 3 * len(DEFAULT_REGIONS)
+    assert {x['region'] for x in machines} == set(DEFAULT_REGIONS)
+
+
+@pytest.mark.parametrize('use_async', [False, True])
+def test_scrape_scraper(fake_scraper, tmp_path, use_async):
+    output = tmp_path / 'flat.yaml'
+    argv = [
+        'scrape', 'scraper', '--project', 'fake', '--sa-path', 'sa.json', '-o', str(output),
+        '--regions', 'europe-west4', '--families', 'n2', '--usage-types', 'ondemand', 'spot',
+    ] + (['--async'] if use_async else [])
+    assert _run(argv) == 0
+    machines = _machines(output)
+    assert machines
+    assert {x['region'] for x in machines} == {'europe-west4'}
+    assert {x['series'] for x in machines} == {'n2'}
+    assert all(x['ondemand'] and x['spot'] for x in machines)
+
+
+def test_scrape_gcloud_compute_rejects_unit_rates(fake_gcloud_compute, tmp_path):
+    with pytest.raises(SystemExit, match='--unit-rates'):
+        cli.main(['scrape', 'gcloud-compute', '--unit-rates', str(tmp_path / 'rates.yaml')])
+
+
+def test_query(fake_gcloud_compute, tmp_path, capsys):
+    output = tmp_path / 'gcloud.yaml'
+    assert _run(['scrape', 'gcloud-compute', '-o', str(output)]) == 0
+    capsys.readouterr()
+    assert _run(['query', str(output), '--region', 'europe-*', '--min-cpu', '4', '--format', 'jsonl']) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2 * 2
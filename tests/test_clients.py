@@ -0,0 +1,109 @@
+import math
+
+import pytest
+from google.auth.credentials import AnonymousCredentials
+
+from gcp_compute_machines.exceptions import RequestBudgetExceeded
+from gcp_compute_machines.providers.scraper.clients import GCPClientPool
+from gcp_compute_machines.testing import FakeCatalogServer, FakeComputeServer, make_machine_types, make_sku_catalog
+
+SERVICE_NAME = 'services/6F81-5844-456A'
+ZONE = 'us-east1-b'
+
+
+@pytest.fixture(scope='module')
+def skus():
+    return make_sku_catalog()
+
+
+@pytest.fixture
+def start_servers(skus):
+    """
+    Starts fake servers with failures injected into the provided pages,
+    every server records the indexes of the requested pages into `pages`.
+    """
+    started = []
+
+    def _start_servers(catalog_fail_pages=None, compute_fail_pages=None):
+        catalog = FakeCatalogServer(skus, default_page_size=100, fail_pages=catalog_fail_pages)
+        compute = FakeComputeServer(
+            ['us-east1'], [ZONE], make_machine_types([ZONE]), default_page_size=40, fail_pages=compute_fail_pages
+        )
+        for server in (catalog, compute):
+            server.pages = []
+            should_fail = server.failures.should_fail
+
+            def _should_fail(page_index, server=server, should_fail=should_fail):
+                server.pages.append(page_index)
+                return should_fail(page_index)
+
+            server.failures.should_fail = _should_fail
+            started.append(server.start())
+        return catalog, compute
+
+    yield _start_servers
+    for server in started:
+        server.stop()
+
+
+def _make_pool(catalog, compute, **kwargs):
+    return GCPClientPool(
+        AnonymousCredentials(),
+        compute_endpoint=compute.address,
+        billing_endpoint=catalog.address,
+        insecure=True,
+        retry_initial=0.01,
+        **kwargs
+    )
+
+
+def test_failed_page_is_retried_alone(start_servers, skus):
+    catalog, compute = start_servers(catalog_fail_pages={2: 2})
+    pool = _make_pool(catalog, compute)
+    pages = list(pool.iter_sku_pages(SERVICE_NAME))
+
+    pages_count = math.ceil(len(skus) / 100)
+    assert [x.sku_id for page, _ in pages for x in page] == [x.sku_id for x in skus]
+    assert catalog.pages == [0, 1, 2, 2, 2] + list(range(3, pages_count))
+    assert pool.requests_made == pages_count + 2
+    assert pages[-1][1] == ''
+
+
+def test_listing_resumes_from_page_token(start_servers, skus):
+    catalog, compute = start_servers()
+    pool = _make_pool(catalog, compute)
+    first_page, next_page_token = next(pool.iter_sku_pages(SERVICE_NAME))
+    rest = list(pool.paginate_skus(SERVICE_NAME, page_token=next_page_token))
+    assert [x.sku_id for x in first_page + rest] == [x.sku_id for x in skus]
+    assert catalog.pages == [0] + list(range(1, math.ceil(len(skus) / 100)))
+
+
+def test_compute_page_size_and_retries(start_servers):
+    catalog, compute = start_servers(compute_fail_pages={1: 1})
+    pool = _make_pool(catalog, compute, page_size=25)
+    machine_types = list(pool.list_machine_types('fake', ZONE))
+
+    expected = compute.machine_types[ZONE]
+    pages_count = math.ceil(len(expected) / 25)
+    assert [x.name for x in machine_types] == [x['name'] for x in expected]
+    assert compute.pages == [0, 1, 1] + list(range(2, pages_count))
+    assert pool.requests_made == pages_count + 1
+
+
+def test_request_budget(start_servers):
+    catalog, compute = start_servers()
+    pool = _make_pool(catalog, compute, request_budget=3)
+    with pytest.raises(RequestBudgetExceeded):
+        list(pool.paginate_skus(SERVICE_NAME))
+    assert catalog.pages == [0, 1, 2]
+
+    pool.reset_request_budget()
+    assert len(next(pool.iter_sku_pages(SERVICE_NAME))[0]) == 100
+
+
+def test_retries_spend_request_budget(start_servers):
+    catalog, compute = start_servers(catalog_fail_pages={0: 5})
+    pool = _make_pool(catalog, compute, request_budget=3)
+    with pytest.raises(RequestBudgetExceeded):
+        list(pool.paginate_skus(SERVICE_NAME))
+    assert catalog.pages == [0, 0, 0]
@@ -0,0 +1,93 @@
+import pytest
+
+from gcp_compute_machines.providers.scraper.combination_pricer import (
+    LOCAL_SSD_PARTITION_GB,
+    CombinationPricer,
+    MachineConfiguration,
+)
+
+
+@pytest.fixture
+def scraper(make_scraper):
+    scraper = make_scraper()
+    scraper.run()
+    return scraper
+
+
+@pytest.fixture
+def pricer(scraper):
+    return CombinationPricer(scraper.unit_rates, scraper.machines, scraper.general_machines_info)
+
+
+def test_base_prices_match_scraped_prices(scraper, pricer):
+    checked = 0
+    for family, machines in scraper.pricing_data.items():
+        for machine_type, machine in machines.items():
+            for region, prices in machine['regions'].items():
+                for usage_type in ('ondemand', 'spot', 'cud1y', 'cud3y'):
+                    # shared core machines are priced per instance, not by unit rates
+                    if usage_type in prices and family not in ('f1', 'g1'):
+                        assert pricer.quote(machine_type, region, usage_type) == pytest.approx(prices[usage_type])
+                        checked += 1
+    assert checked
+    assert len(pricer) == checked
+
+
+def test_attached_gpu_and_local_ssd(scraper, pricer):
+    machine_type = 'n1-standard-8'
+    region = sorted(scraper.machines[machine_type]['regions'])[0]
+    base = pricer.quote(machine_type, region, 'ondemand')
+    gpu_rate = scraper.unit_rates.get_gpu_rate('NVIDIA_T4', region, 'ondemand')
+    local_ssd_rate = scraper.unit_rates.get_local_ssd_rate(region, 'ondemand')
+
+    assert (None, 0) in pricer.gpu_options(machine_type)
+    assert ('NVIDIA_T4', 2) in pricer.gpu_options(machine_type)
+    price = pricer.quote(machine_type, region, 'ondemand', gpu='NVIDIA_T4', gpu_count=2, local_ssd_partitions=2)
+    assert price == pytest.approx(base + 2 * gpu_rate + 2 * LOCAL_SSD_PARTITION_GB * local_ssd_rate, abs=1e-4)
+
+    # unsupported GPU count and LocalSSD partitions
+    assert pricer.quote(machine_type, region, 'ondemand', gpu='NVIDIA_T4', gpu_count=3) is None
+    assert pricer.quote(machine_type, region, 'ondemand', local_ssd_partitions=9) is None
+    # machines with a built-in GPU can't attach more
+    assert pricer.gpu_options('a2-highgpu-1g') == [(None, 0)]
+    assert pricer.quote('unknown-type', region, 'ondemand') is None
+
+
+def test_iter_configurations_filters(scraper, pricer):
+    configurations = list(pricer.iter_configurations(
+        machine_types=['n1-standard-*'],
+        regions=['us-*'],
+        usage_types=['ondemand'],
+        gpus=['NVIDIA_T4'],
+        min_gpu_count=2,
+        local_ssd_partitions=[0, 1],
+    ))
+    assert configurations
+    for configuration, price in configurations:
+        assert configuration.machine_type.startswith('n1-standard-')
+        assert configuration.region.startswith('us-')
+        assert configuration.usage_type == 'ondemand'
+        assert configuration.gpu == 'NVIDIA_T4' and configuration.gpu_count >= 2
+        assert configuration.local_ssd_partitions in (0, 1)
+        assert pricer.price(configuration) == price
+
+    # the same configurations with fresh memoization, bounded by a max price
+    max_price = sorted(x.price for x in configurations)[len(configurations) // 2]
+    fresh = CombinationPricer(scraper.unit_rates, scraper.machines, scraper.general_machines_info)
+    bounded = list(fresh.iter_configurations(
+        machine_types=['n1-standard-*'],
+        regions=['us-*'],
+        usage_types=['ondemand'],
+        gpus=['NVIDIA_T4'],
+        min_gpu_count=2,
+        local_ssd_partitions=[0, 1],
+        max_price=max_price,
+    ))
+    assert bounded == [x for x in configurations if x.price <= max_price]
+
+
+def test_clear(pricer):
+    pricer.price(MachineConfiguration('n1-standard-8', 'us-east1', 'ondemand'))
+    assert len(pricer)
+    pricer.clear()
+    assert len(pricer) == 0
@@ -0,0 +1,65 @@
+import math
+
+import pytest
+
+from gcp_compute_machines.providers.scraper.currency import CurrencyRates, currency_column
+from gcp_compute_machines.providers.scraper.unit_rates import nice
+from gcp_compute_machines.tools.frames import machines_to_dataframe
+
+USAGE_TYPES = ['ondemand', 'spot', 'cud1y', 'cud3y']
+
+
+def test_currency_columns(make_scraper, fake_servers):
+    catalog, _ = fake_servers
+    rates = {x: catalog.currency_rates[x] for x in ('EUR', 'GBP')}
+    scraper = make_scraper()
+    scraper.run(currencies=['eur', 'GBP'])
+    assert scraper.currencies == ['EUR', 'GBP']
+
+    checked = 0
+    for machine in scraper.flat_pricing_data:
+        for currency, rate in rates.items():
+            for usage_type in USAGE_TYPES:
+                price = getattr(machine, usage_type)
+                converted = machine.model_extra[currency_column(usage_type, currency)]
+                assert converted == (None if price is None else nice(price * rate))
+                checked += price is not None
+    assert checked
+
+    frame = machines_to_dataframe(scraper.flat_pricing_data)
+    assert {'ondemand_eur', 'cud3y_gbp'} <= set(frame.columns)
+    assert frame['ondemand_eur'].dtype == 'float64'
+    for machine, converted in zip(scraper.flat_pricing_data, frame['spot_gbp']):
+        expected = machine.model_extra['spot_gbp']
+        assert math.isnan(converted) if expected is None else converted == expected
+
+
+def test_cached_rates_skip_catalog_requests(make_scraper, fake_servers):
+    catalog, _ = fake_servers
+    requests = catalog.requests
+    scraper = make_scraper()
+    scraper.get_currency_rates(['EUR'], dump=True)
+    # one single-SKU request per currency
+    assert catalog.requests == requests + 1
+    assert scraper.currency_rates.get_rate('EUR') == pytest.approx(catalog.currency_rates['EUR'])
+
+    loaded = make_scraper()
+    loaded.get_currency_rates(['EUR'], load=True)
+    assert catalog.requests == requests + 1
+    assert loaded.currency_rates.rates == scraper.currency_rates.rates
+
+    # only the missing currency is requested
+    loaded.get_currency_rates(['EUR', 'GBP'], load=True)
+    assert catalog.requests == requests + 2
+    assert loaded.currency_rates.get_rate('GBP') == pytest.approx(catalog.currency_rates['GBP'])
+
+
+def test_convert():
+    rates = CurrencyRates({'eur': 0.5})
+    assert 'EUR' in rates and 'usd' in rates and 'GBP' not in rates
+    assert rates.missing(['EUR', 'gbp']) == ['GBP']
+    assert rates.convert(1.23456, 'EUR') == nice(1.23456 * 0.5)
+    assert rates.convert(None, 'EUR') is None
+    assert rates.convert(2.0, 'USD') == 2.0
+    with pytest.raises(ValueError):
+        rates.convert(2.0, 'GBP')
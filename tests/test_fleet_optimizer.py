@@ -0,0 +1,110 @@
+import math
+import random
+
+import pytest
+
+from gcp_compute_machines.tools.fleet_optimizer import FleetOptimizer, Workload
+
+REGIONS = ['us-east1', 'europe-west4', 'asia-east1']
+GPUS = ['NVIDIA_L4', 'NVIDIA_T4']
+
+
+def _make_machines(rng):
+    machines = []
+    for region in REGIONS:
+        for cpu in (2, 4, 8, 16):
+            for ram_per_cpu in (1, 4, 8):
+                machines.append({
+                    'name': f'm-{cpu}-{ram_per_cpu}', 'region': region, 'cpu_count': cpu, 'ram': cpu * ram_per_cpu,
+                    'ondemand': round(cpu * rng.uniform(0.03, 0.05) + cpu * ram_per_cpu * rng.uniform(0.003, 0.006), 5),
+                })
+        for gpu in GPUS:
+            for gpu_count in (1, 2):
+                machines.append({
+                    'name': f'g-{gpu}-{gpu_count}', 'region': region, 'cpu_count': 8 * gpu_count,
+                    'ram': 32 * gpu_count, 'gpu_count_by_default': gpu_count, 'default_gpu': gpu,
+                    'ondemand': round(gpu_count * rng.uniform(0.6, 1.0), 5),
+                })
+    return machines
+
+
+def _make_workloads(rng, count):
+    workloads = []
+    for _ in range(count):
+        cpu = rng.choice([0.5, 1, 2, 3, 4, 6, 20])
+        gpu_count, gpu = 0, None
+        if rng.random() < 0.2:
+            gpu_count, gpu = rng.choice([1, 2]), rng.choice([None] + GPUS)
+        regions = None if rng.random() < 0.5 else tuple(rng.sample(REGIONS, rng.randint(1, 2)))
+        workloads.append(Workload(cpu, cpu * rng.choice([1, 2, 4, 8]), gpu_count, gpu, regions))
+    return workloads
+
+
+def _fits(machine, workloads):
+    return (
+        all(x.regions is None or machine['region'] in x.regions for x in workloads)
+        and sum(x.cpu for x in workloads) <= machine['cpu_count']
+        and sum(x.ram for x in workloads) <= machine['ram']
+        and sum(x.gpu_count for x in workloads) <= machine.get('gpu_count_by_default', 0)
+        and all(not x.gpu_count or x.gpu is None or x.gpu == machine.get('default_gpu') for x in workloads)
+    )
+
+
+def _cheapest_price(machines, workloads):
+    return min((x['ondemand'] for x in machines if _fits(x, workloads)), default=math.inf)
+
+
+def _partitions(items):
+    if not items:
+        yield []
+        return
+    first, rest = items[0], items[1:]
+    for partition in _partitions(rest):
+        yield [[first]] + partition
+        for i in range(len(partition)):
+            yield partition[:i] + [[first] + partition[i]] + partition[i + 1:]
+
+
+def _brute_force_cost(machines, workloads):
+    placeable = [x for x in workloads if _cheapest_price(machines, [x]) < math.inf]
+    return min(
+        math.fsum(_cheapest_price(machines, block) for block in partition)
+        for partition in _partitions(placeable)
+    )
+
+
+def _check_plan(plan, machines, workloads):
+    by_key = {(x['name'], x['region']): x for x in machines}
+    packed = []
+    for planned in plan.machines:
+        machine = by_key[(planned.machine_type, planned.region)]
+        assert _fits(machine, [workloads[i] for i in planned.workloads])
+        assert planned.hourly_price == machine['ondemand']
+        packed.extend(planned.workloads)
+    assert sorted(packed + plan.unplaced) == list(range(len(workloads)))
+    for i in plan.unplaced:
+        assert _cheapest_price(machines, [workloads[i]]) == math.inf
+
+
+@pytest.mark.parametrize('seed', range(30))
+def test_exact_mode_matches_brute_force(seed):
+    rng = random.Random(seed)
+    machines = _make_machines(rng)
+    workloads = _make_workloads(rng, rng.randint(1, 8))
+    optimizer = FleetOptimizer(machines)
+
+    exact = optimizer.optimize(workloads, exact=True)
+    assert exact.exact
+    _check_plan(exact, machines, workloads)
+    assert exact.total_hourly_cost == pytest.approx(_brute_force_cost(machines, workloads))
+
+    heuristic = optimizer.optimize(workloads, exact=False)
+    _check_plan(heuristic, machines, workloads)
+    assert heuristic.unplaced == exact.unplaced
+    assert heuristic.total_hourly_cost >= exact.total_hourly_cost - 1e-9
+
+
+def test_exact_mode_is_limited():
+    optimizer = FleetOptimizer(_make_machines(random.Random(0)))
+    with pytest.raises(ValueError):
+        optimizer.optimize([Workload(1, 1)] * 13, exact=True)
@@ -0,0 +1,17 @@
+import asyncio
+
+from gcp_compute_machines.providers.gcloud_compute import GCloudComputeMachinesProvider
+
+
+async def _alist(aiterator):
+    return [item async for item in aiterator]
+
+
+def test_all_readers_keep_quoted_line_breaks(gcloud_compute_url):
+    provider = GCloudComputeMachinesProvider(log_level='ERROR', url=gcloud_compute_url)
+    fetched = provider.fetch_gcp_machines()
+    assert 'Balanced price\nand performance' in {x.description for x in fetched}
+
+    assert list(provider.iter_gcp_machines()) == fetched
+    assert asyncio.run(provider.afetch_gcp_machines()) == fetched
+    assert asyncio.run(_alist(provider.aiter_gcp_machines())) == fetched
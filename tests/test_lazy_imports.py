@@ -0,0 +1,29 @@
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+
+@pytest.mark.parametrize('module_name', [
+    'gcp_compute_machines',
+    'gcp_compute_machines.providers',
+    'gcp_compute_machines.providers.scraper',
+    'gcp_compute_machines.tools',
+])
+def test_exports_resolve(module_name):
+    module = importlib.import_module(module_name)
+    for name in module.__all__:
+        assert getattr(module, name) is not None
+    assert set(module.__all__) <= set(dir(module))
+    with pytest.raises(AttributeError):
+        getattr(module, 'no_such_name')
+
+
+def test_package_import_is_lazy():
+    code = (
+        'import sys, gcp_compute_machines; '
+        'print(sorted(x for x in ("pandas", "httpx", "google.cloud.compute_v1") if x in sys.modules))'
+    )
+    output = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True).stdout
+    assert output.strip() == '[]'
@@ -0,0 +1,104 @@
+import re
+
+import yaml
+
+from gcp_compute_machines.providers.scraper.models.skus.sku_record import SKUCatalog
+from gcp_compute_machines.testing import make_sku_catalog
+from gcp_compute_machines.tools.mapping_coverage import USAGE_TYPES, MappingCoverageAnalyzer
+
+MACHINES_CSV_HEADER = 'name,series,family,VCPUs,ram,local_ssd_support,local_ssd_enabled_by_default,' \
+    'local_ssd_default_size,cpu_platforms,gpu_support,gpu_count_by_default,default_gpu,' \
+    'default_network_bandwidth,tier1_network_bandwidth,nested_virtualization_support'
+
+
+def _write_mappings(data_dir):
+    (data_dir / 'test-machines-sku.yaml').write_text(yaml.safe_dump({
+        'n9': {
+            'cpu': {'ondemand': 'N9 Instance Core.*', 'spot': 'Spot Preemptible N9 Instance Core.*'},
+            'ram': {'ondemand': 'N9 Instance Ram.*'},
+        },
+        'x9': {'cpu': {'ondemand': 'X9 Instance Core.*'}},
+    }))
+    (data_dir / 'test-machines.csv').write_text('\n'.join([
+        MACHINES_CSV_HEADER,
+        'n9-standard-2,n9,General purpose,2,8,1,1,375,,1,1,NVIDIA_T9,10,,0',
+        'x9-standard-2,x9,General purpose,2,8,0,0,,,0,0,,10,,0',
+    ]) + '\n')
+    (data_dir / 'gpu-skus-mapping.yaml').write_text(yaml.safe_dump({
+        'NVIDIA_T9': {'skus': {'ondemand': 'Nvidia T9 GPU running.*'}}
+    }))
+    (data_dir / 'storage-skus-mapping.yaml').write_text(yaml.safe_dump({
+        'LocalSSD': {'skus': {'ondemand': 'SSD backed Local Storage .*'}}
+    }))
+
+
+def _catalog():
+    catalog = SKUCatalog()
+    catalog.add_record('ondemand', 'cpu-1', 'N9 Instance Core running in Americas', ['us-east1', 'us-west1'], 0.03)
+    catalog.add_record('ondemand', 'cpu-2', 'N9 Instance Core running in Virginia', ['us-east1'], 0.04)
+    catalog.add_record('ondemand', 'ram-1', 'N9 Instance Ram running in Americas', ['us-east1', 'us-west1'], 0.004)
+    catalog.add_record('ondemand', 'gpu-1', 'Nvidia T9 GPU running in Americas', ['us-west1'], 0.35)
+    catalog.add_record('ondemand', 'ssd-1', 'SSD backed Local Storage in Americas', ['us-east1', 'us-west1'], 0.08)
+    catalog.add_record('ondemand', 'other', 'E9 Instance Core running in Americas', ['us-east1'], 0.02)
+    catalog.add_record('spot', 'spot-1', 'Spot Preemptible N9 Instance Core running in Americas', ['us-east1'], 0.01)
+    return catalog
+
+
+def test_issues_without_machines(tmp_path):
+    _write_mappings(tmp_path)
+    report = MappingCoverageAnalyzer(data_dir=str(tmp_path)).analyze(_catalog())
+
+    assert report.mappings == 5
+    assert report.skus == 7
+    assert [(x.mapping, x.component, x.usage_type, x.region, x.sku_ids) for x in report.multiple_matches] == [
+        ('n9', 'cpu', 'ondemand', 'us-east1', ['cpu-1', 'cpu-2'])
+    ]
+    # without machines the regions come from any usage type of the mapping, and a regex matching nothing is reported
+    assert [(x.mapping, x.usage_type, x.region) for x in report.zero_matches] == [
+        ('n9', 'spot', 'us-west1'),
+        ('x9', 'ondemand', None),
+    ]
+    assert [(x.sku_id, x.usage_type) for x in report.unclaimed] == [('other', 'ondemand')]
+    assert report.unmapped_machines == []
+    assert not report.is_complete
+
+
+def test_issues_for_machine_regions(tmp_path):
+    _write_mappings(tmp_path)
+    machines = {
+        'n9-standard-2': {'regions': ['us-east1', 'us-west1']},
+        'x9-standard-2': {'zones': ['europe-west4-a']},
+        'z9-standard-2': {'zones': ['us-east1-b']},
+    }
+    report = MappingCoverageAnalyzer(data_dir=str(tmp_path)).analyze(_catalog(), machines)
+
+    zero = {(x.mapping, x.component, x.usage_type, x.region) for x in report.zero_matches}
+    assert zero == {
+        # default GPU of n9-standard-2 has no SKU in us-east1
+        ('NVIDIA_T9', 'gpu', 'ondemand', 'us-east1'),
+        ('n9', 'cpu', 'spot', 'us-west1'),
+        ('x9', 'cpu', 'ondemand', None),
+    }
+    assert report.unmapped_machines == ['z9-standard-2']
+
+
+def test_analyze_files(tmp_path):
+    _write_mappings(tmp_path)
+    sku_file = tmp_path / 'gcp_sku.yaml'
+    sku_file.write_text(yaml.safe_dump(_catalog().to_dict()))
+    analyzer = MappingCoverageAnalyzer(data_dir=str(tmp_path))
+    assert analyzer.analyze_files(str(sku_file)) == analyzer.analyze(_catalog())
+
+
+def test_matches_per_description_search():
+    analyzer = MappingCoverageAnalyzer()
+    catalog = SKUCatalog()
+    for sku in make_sku_catalog():
+        catalog.add(sku)
+    for usage_type in USAGE_TYPES:
+        records = catalog[usage_type]
+        regexes = [x[usage_type] for x in analyzer.mappings.values() if usage_type in x]
+        assert analyzer._match(records, regexes) == {
+            regex: [i for i, record in enumerate(records) if re.search(regex, record.description)]
+            for regex in regexes
+        }
@@ -0,0 +1,43 @@
+import os
+
+import pytest
+
+from gcp_compute_machines.dumps import partitioned
+from gcp_compute_machines.dumps.partitioned import PartitionedDump, write_partitioned_dump
+
+
+def _rows(regions, price=1.0):
+    return [
+        {'name': f'n2-standard-{cpus}', 'region': region, 'family': 'General purpose', 'series': 'N2',
+         'vcpus': cpus, 'month': cpus * price}
+        for region in regions for cpus in (2, 4)
+    ]
+
+
+def test_rewrite_removes_stale_partitions(tmp_path):
+    write_partitioned_dump(str(tmp_path), _rows(['us-east1', 'europe-west4']))
+    write_partitioned_dump(str(tmp_path), _rows(['us-east1'], price=2.0))
+
+    assert sorted(os.listdir(tmp_path)) == sorted([partitioned.MANIFEST_FILE, 'us-east1.yaml'])
+    dump = PartitionedDump(str(tmp_path))
+    assert dump.partitions == ['us-east1']
+    assert [row['month'] for row in dump.iter_rows(verify=True)] == [4.0, 8.0]
+
+
+def test_failed_write_keeps_previous_dump(tmp_path, monkeypatch):
+    write_partitioned_dump(str(tmp_path), _rows(['us-east1', 'europe-west4']))
+    write_partition = partitioned._write_partition
+
+    def failing_write_partition(file_path, metadata, rows):
+        if rows[0]['region'] == 'europe-west4':
+            raise OSError('disk full')
+        return write_partition(file_path, metadata, rows)
+
+    monkeypatch.setattr(partitioned, '_write_partition', failing_write_partition)
+    with pytest.raises(OSError):
+        write_partitioned_dump(str(tmp_path), _rows(['us-east1', 'europe-west4'], price=2.0))
+
+    assert not [x for x in os.listdir(tmp_path) if x.endswith('.tmp')]
+    dump = PartitionedDump(str(tmp_path))
+    assert sorted(dump.partitions) == ['europe-west4', 'us-east1']
+    assert {row['month'] for row in dump.iter_rows(verify=True)} == {2.0, 4.0}
@@ -0,0 +1,87 @@
+import random
+
+import pytest
+
+from gcp_compute_machines.tools.ranking import CoremarkPerDollar, LowCarbonPrice, MachineRankingIndex
+
+REGIONS = ['us-east1', 'us-central1', 'europe-west4', 'asia-east1']
+SERIES = ['n2', 'c3', 'e2']
+USAGE_TYPES = ['ondemand', 'spot', 'cud1y', 'cud3y']
+
+
+def _machines(count=200, seed=0):
+    rng = random.Random(seed)
+    machines = []
+    for i in range(count):
+        machine = {
+            'name': f'machine-{i}',
+            'region': rng.choice(REGIONS),
+            'series': rng.choice(SERIES),
+            'coremark_score': rng.choice([None, rng.randint(1000, 100000)]),
+            'region_co2_kwh': rng.choice([None, rng.randint(50, 700)]),
+            'region_low_co2': rng.choice([0, 1, '1', 'false', True, None]),
+        }
+        for usage_type in USAGE_TYPES:
+            # rounded prices make ties
+            machine[usage_type] = rng.choice([None, rng.randint(1, 20) / 10])
+        machines.append(machine)
+    return machines
+
+
+def _expected(machines, metric, usage_type, region=None, series=None):
+    rows = [
+        x for x in machines
+        if x[usage_type] is not None
+        and (region is None or x['region'] == region)
+        and (series is None or x['series'] == series)
+    ]
+    if metric == CoremarkPerDollar:
+        ranked = [(x, x['coremark_score'] / x[usage_type]) for x in rows if x['coremark_score']]
+        return sorted(ranked, key=lambda x: -x[1])
+    ranked = [
+        (x, x[usage_type]) for x in rows if x['region_low_co2'] not in (None, 0, 'false', False)
+    ]
+    return sorted(ranked, key=lambda x: (x[1], x[0]['region_co2_kwh'] is None, x[0]['region_co2_kwh'] or 0))
+
+
+@pytest.mark.parametrize('metric', [CoremarkPerDollar, LowCarbonPrice])
+@pytest.mark.parametrize('usage_type', USAGE_TYPES)
+def test_rankings_match_sorted_rows(metric, usage_type):
+    machines = _machines()
+    index = MachineRankingIndex(machines)
+    assert len(index) == len(machines)
+    for region in [None, *REGIONS, 'unknown-region']:
+        for series in [None, *SERIES]:
+            expected = _expected(machines, metric, usage_type, region, series)
+            ranked = list(index.iter_ranked(metric, usage_type, region, series))
+            assert [(x.machine['name'], x.value) for x in ranked] == [(x['name'], value) for x, value in expected]
+            assert index.top(3, metric, usage_type, region, series) == ranked[:3]
+
+
+def test_best_per_region():
+    machines = _machines()
+    index = MachineRankingIndex(machines)
+    best = index.best_per_region(LowCarbonPrice, 'spot', series='n2')
+    assert set(best) <= set(REGIONS)
+    for region in REGIONS:
+        expected = _expected(machines, LowCarbonPrice, 'spot', region, 'n2')
+        if expected:
+            assert best[region].machine is expected[0][0]
+        else:
+            assert region not in best
+
+
+def test_machine_objects_and_arguments():
+    class Row:
+        def __init__(self, **kwargs):
+            self.__dict__.update(kwargs)
+
+    rows = [Row(**x) for x in _machines(20)]
+    index = MachineRankingIndex(rows)
+    assert [x.machine for x in index.top(5)] == [x.machine for x in index.iter_ranked()][:5]
+    assert index.top(0) == []
+    assert MachineRankingIndex([]).top() == []
+    with pytest.raises(ValueError):
+        index.top(metric='unknown')
+    with pytest.raises(ValueError):
+        index.top(usage_type='sud')
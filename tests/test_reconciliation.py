@@ -0,0 +1,31 @@
+from gcp_compute_machines.tools.reconciliation import Reconciler
+
+
+def _row(name, region, ondemand):
+    return {'name': name, 'region': region, 'ondemand': ondemand}
+
+
+def test_duplicate_right_rows_are_reported_once():
+    left = [_row('n2-standard-2', 'us-east1', 1.0), _row('n2-standard-4', 'us-east1', 2.0)]
+    right = [
+        _row('n2-standard-2', 'us-east1', 1.0),
+        _row('n2-standard-2', 'us-east1', 5.0),
+        _row('c4-standard-2', 'us-east1', 1.5),
+        _row('c4-standard-2', 'us-east1', 1.5),
+    ]
+    report = Reconciler(usage_types=['ondemand']).reconcile(left, right)
+
+    assert report.matched_rows == 1
+    assert report.deltas == []
+    assert report.missing_in_left == [('c4-standard-2', 'us-east1')]
+    assert report.missing_in_right == [('n2-standard-4', 'us-east1')]
+
+
+def test_rows_without_region_are_skipped():
+    left = [_row('n2-standard-2', None, 1.0), _row('n2-standard-2', 'us-east1', 1.0)]
+    right = [_row('n2-standard-2', 'us-east1', 1.0), _row('n2-standard-4', None, 2.0)]
+    report = Reconciler(usage_types=['ondemand']).reconcile(left, right)
+
+    assert report.matched_rows == 1
+    assert report.missing_in_left == []
+    assert report.missing_in_right == []
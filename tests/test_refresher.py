@@ -0,0 +1,118 @@
+import threading
+
+import pytest
+
+from gcp_compute_machines.providers.base.models.base_machine_info_model import GCPMachineType
+from gcp_compute_machines.providers.base.refresher import PricingSnapshot, SnapshotRefresher
+from gcp_compute_machines.providers.scraper.clients import RequestBudgetExceeded
+
+
+def _machines(price: float):
+    return [
+        GCPMachineType(
+            name=f'n2-standard-{cpus}', series='n2', family='General purpose', cpu_count=cpus, ram=cpus * 4,
+            network_bandwidth=10, region=region, ondemand=price * cpus
+        )
+        for cpus in (2, 4)
+        for region in ('us-east1', 'europe-west4')
+    ]
+
+
+class FlakyFetch:
+    """
+    Returns machines with growing prices, raises on the calls listed in `fail_calls`.
+    """
+
+    def __init__(self, fail_calls=()):
+        self.fail_calls = set(fail_calls)
+        self.calls = 0
+        self.called = threading.Condition()
+
+    def __call__(self):
+        with self.called:
+            self.calls += 1
+            self.called.notify_all()
+            call = self.calls
+        if call in self.fail_calls:
+            raise RuntimeError(f'call {call} failed')
+        return _machines(float(call))
+
+    def wait_for_calls(self, calls: int, timeout: float = 10):
+        with self.called:
+            assert self.called.wait_for(lambda: self.calls >= calls, timeout)
+
+
+def test_snapshot_is_immutable():
+    machines = _machines(1.0)
+    snapshot = PricingSnapshot(machines, version=3)
+    assert len(snapshot) == 4
+    assert list(snapshot) == machines
+    assert snapshot.get('n2-standard-4', 'europe-west4') is machines[3]
+    assert snapshot.get('n2-standard-4', 'asia-east1') is None
+    with pytest.raises(AttributeError):
+        snapshot.version = 4
+    with pytest.raises(TypeError):
+        snapshot.index[('n2-standard-8', 'us-east1')] = machines[0]
+
+
+def test_failed_refresh_keeps_last_good_snapshot():
+    fetch = FlakyFetch(fail_calls={2, 3})
+    refresher = SnapshotRefresher(fetch, interval=3600)
+    assert refresher.snapshot is None
+
+    assert refresher.refresh()
+    good = refresher.snapshot
+    assert good.version == 1
+    assert good.get('n2-standard-2', 'us-east1').ondemand == 2.0
+
+    assert not refresher.refresh()
+    assert not refresher.refresh()
+    assert refresher.snapshot is good
+    assert refresher.failures == 2
+    assert str(refresher.last_error) == 'call 3 failed'
+
+    assert refresher.refresh()
+    assert refresher.snapshot.version == 2
+    assert refresher.snapshot.get('n2-standard-2', 'us-east1').ondemand == 8.0
+    # readers holding the previous snapshot keep seeing its data
+    assert good.get('n2-standard-2', 'us-east1').ondemand == 2.0
+
+
+def test_failed_first_refresh_publishes_nothing():
+    refresher = SnapshotRefresher(FlakyFetch(fail_calls={1}), interval=3600)
+    assert not refresher.refresh()
+    assert refresher.snapshot is None
+    assert refresher.wait_for_snapshot(timeout=0.01) is None
+
+
+def test_background_refreshes_retry_after_failures():
+    fetch = FlakyFetch(fail_calls={2, 3})
+    with SnapshotRefresher(fetch, interval=0.01, retry_interval=0.01) as refresher:
+        assert refresher.is_running
+        assert refresher.wait_for_snapshot(timeout=10).version == 1
+        fetch.wait_for_calls(5)
+    assert not refresher.is_running
+    # calls 2 and 3 failed, every successful call published a snapshot
+    assert refresher.failures == 2
+    assert refresher.snapshot.version == fetch.calls - 2
+    assert refresher.snapshot.get('n2-standard-2', 'us-east1').ondemand == 2.0 * fetch.calls
+
+
+def test_scraper_refresh_failure_keeps_snapshot(make_scraper):
+    scraper = make_scraper()
+
+    def fetch():
+        scraper.run()
+        return scraper.flat_pricing_data
+
+    refresher = SnapshotRefresher(fetch, interval=3600)
+    assert refresher.refresh()
+    good = refresher.snapshot
+    assert len(good) == len(scraper.flat_pricing_data) > 0
+
+    # the next run runs out of API requests midway
+    scraper.clients.request_budget = 1
+    assert not refresher.refresh()
+    assert isinstance(refresher.last_error, RequestBudgetExceeded)
+    assert refresher.snapshot is good
+    assert len(good) > 0
@@ -0,0 +1,45 @@
+import random
+
+import pytest
+
+from gcp_compute_machines.tools.region_index import RegionSpatialIndex, haversine_km
+
+
+def _random_regions(count, seed):
+    rnd = random.Random(seed)
+    return [
+        {'name': 'n2-standard-4', 'region': f'region-{i}', 'region_lat': rnd.uniform(-80, 80),
+         'region_lng': rnd.uniform(-180, 180), 'month': rnd.uniform(50, 150)}
+        for i in range(count)
+    ]
+
+
+def _brute_force(machines, lat, lng, radius_km):
+    distances = sorted(
+        (haversine_km(lat, lng, machine['region_lat'], machine['region_lng']), machine['region'])
+        for machine in machines
+    )
+    return [region for distance, region in distances if distance <= radius_km]
+
+
+def test_within_wraps_around_non_divisor_cells():
+    # 360 isn't divisible by 7, so the last longitude cell is narrower than the others
+    machines = [{'name': 'n2-standard-4', 'region': 'far-east', 'region_lat': -57.90, 'region_lng': 77.97}]
+    index = RegionSpatialIndex(machines, cell_degrees=7)
+    assert [x.region for x in index.within(-34.53, 19.58, 5000)] == ['far-east']
+
+
+@pytest.mark.parametrize('cell_degrees', [5.0, 7.0, 11.0])
+def test_within_and_nearest_match_brute_force(cell_degrees):
+    machines = _random_regions(300, seed=int(cell_degrees))
+    index = RegionSpatialIndex(machines, cell_degrees=cell_degrees)
+    rnd = random.Random(42)
+    for _ in range(200):
+        lat, lng = rnd.uniform(-89, 89), rnd.uniform(-180, 180)
+        radius_km = rnd.choice([300, 1000, 3000, 5000, 9000])
+        expected = _brute_force(machines, lat, lng, radius_km)
+        assert [x.region for x in index.within(lat, lng, radius_km)] == expected
+
+        k = rnd.randint(1, 10)
+        expected = _brute_force(machines, lat, lng, float('inf'))[:k]
+        assert [x.region for x in index.nearest(lat, lng, k)] == expected
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from gcp_compute_machines.providers.scraper.scope import ScrapeScope
+
+
+def _prices(scraper):
+    """
+    :return: (machine type, region, usage type) -> price of `pricing_data`
+    """
+    return {
+        (name, region, usage_type): price
+        for machines in scraper.pricing_data.values()
+        for name, machine in machines.items()
+        for region, prices in machine['regions'].items()
+        for usage_type, price in prices.items()
+        if price is not None
+    }
+
+
+@pytest.fixture
+def full_prices(make_scraper):
+    scraper = make_scraper()
+    scraper.run()
+    return _prices(scraper)
+
+
+@pytest.mark.parametrize('use_async', [False, True], ids=['sync', 'async'])
+@pytest.mark.parametrize('scope', [
+    dict(regions=['europe-west4'], families=['n2', 'c3'], usage_types=['spot']),
+    dict(regions=['europe-west4', 'us-east1']),
+    dict(families=['n1', 'e2'], usage_types=['sud']),
+    dict(usage_types=['ondemand', 'cud3y']),
+])
+def test_scoped_run_is_subset_of_full_run(make_scraper, full_prices, scope, use_async):
+    scraper = make_scraper()
+    if use_async:
+        asyncio.run(scraper.arun(**scope))
+    else:
+        scraper.run(**scope)
+
+    scrape_scope = ScrapeScope(**scope)
+    expected = {
+        (name, region, usage_type): price
+        for (name, region, usage_type), price in full_prices.items()
+        if scrape_scope.accepts_machine(name)
+        and scrape_scope.accepts_region(region)
+        and scrape_scope.accepts_usage_type(usage_type)
+    }
+    assert expected
+    assert _prices(scraper) == expected
+
+
+def test_scoped_run_can_not_dump_caches(make_scraper):
+    with pytest.raises(ValueError):
+        make_scraper().run(dump=True, regions=['europe-west4'])
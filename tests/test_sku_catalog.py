@@ -0,0 +1,81 @@
+import yaml
+
+from gcp_compute_machines.providers.scraper.models.skus.sku_record import SKUCatalog, SKURecord
+from gcp_compute_machines.testing import make_sku_catalog
+from gcp_compute_machines.testing.catalog import make_sku
+
+
+def _legacy_dump(skus):
+    """
+    `gcp_sku.yaml` as the scraper wrote it before the compact records:
+    resource group -> catalog usage type -> SKU name -> SKU.
+    """
+    data = {'CPU': {}, 'GPU': {}, 'RAM': {}, 'N1Standard': {}, 'F1Micro': {}, 'G1Small': {}, 'LocalSSD': {}, 'SSD': {}}
+    for sku in skus:
+        if sku.category.resource_group not in data:
+            continue
+        expression = sku.pricing_info[0].pricing_expression
+        data[sku.category.resource_group].setdefault(sku.category.usage_type, {})[sku.name] = {
+            'name': sku.name,
+            'sku_id': sku.sku_id,
+            'description': sku.description,
+            'usage_unit': expression.usage_unit,
+            'pricing': {
+                'start_usage_amount': expression.tiered_rates[0].start_usage_amount,
+                'unit_price_currency_code': expression.tiered_rates[0].unit_price.currency_code,
+                'unit_price_units': expression.tiered_rates[0].unit_price.units,
+                'unit_price_nanos': expression.tiered_rates[0].unit_price.nanos,
+            },
+            'regions': list(sku.service_regions),
+        }
+    return data
+
+
+def test_add_keeps_priced_skus_only():
+    catalog = SKUCatalog()
+    record = catalog.add(make_sku('A', 'N2 Instance Core running in us-east1', 'CPU', 'OnDemand', ['us-east1'], 1.25))
+    assert record == SKURecord('A', 'N2 Instance Core running in us-east1', frozenset({'us-east1'}), 1.25)
+    assert catalog.add(make_sku('B', 'SSD backed PD Capacity', 'SSD', 'OnDemand', ['us-east1'], 0.17)) is None
+    assert catalog.add(make_sku('C', 'N2 Instance Core', 'CPU', 'Commit5Yr', ['us-east1'], 0.01)) is None
+    assert catalog.add(make_sku('D', 'Spot Preemptible N2 Instance Core', 'CPU', 'Preemptible', ['us-east1'], 0.3))
+    assert len(catalog) == 2
+    assert [x.sku_id for x in catalog['ondemand']] == ['A']
+    assert [x.sku_id for x in catalog['spot']] == ['D']
+
+
+def test_records_share_region_sets():
+    catalog = SKUCatalog()
+    first = catalog.add_record('ondemand', 'A', 'a', ['us-east1', 'europe-west4'], 1.0)
+    second = catalog.add_record('spot', 'B', 'b', ['us-east1', 'europe-west4'], 0.5)
+    assert first.regions is second.regions
+
+
+def test_dict_round_trip():
+    catalog = SKUCatalog()
+    for sku in make_sku_catalog():
+        catalog.add(sku)
+    restored = SKUCatalog.from_dict(yaml.safe_load(yaml.safe_dump(catalog.to_dict())))
+    assert restored.skus == catalog.skus
+
+
+def test_legacy_format_is_loaded():
+    skus = make_sku_catalog()
+    catalog = SKUCatalog()
+    for sku in skus:
+        catalog.add(sku)
+    legacy = SKUCatalog.from_dict(yaml.safe_load(yaml.safe_dump(_legacy_dump(skus))))
+    assert {k: sorted(v) for k, v in legacy.skus.items()} == {k: sorted(v) for k, v in catalog.skus.items()}
+
+
+def test_scraper_prices_legacy_sku_cache(make_scraper, fake_servers):
+    fresh = make_scraper()
+    fresh.run(dump=True)
+    catalog, _ = fake_servers
+    with open(fresh.GCP_SKU_DATA, 'w') as file:
+        yaml.safe_dump(_legacy_dump(catalog.skus), file)
+
+    catalog_requests = catalog.requests
+    loaded = make_scraper()
+    loaded.run(load=True)
+    assert catalog.requests == catalog_requests
+    assert loaded.pricing_data == fresh.pricing_data
@@ -0,0 +1,59 @@
+import pytest
+from google.cloud import billing_v1
+
+from gcp_compute_machines.providers.scraper.sku_pins import SKUPins
+
+PINS_FILE = 'gcp_sku_pins.yaml'
+
+
+def _prices(scraper):
+    return {(x.name, x.region): x.model_dump() for x in scraper.flat_pricing_data}
+
+
+@pytest.fixture
+def reword_catalog(fake_servers, monkeypatch):
+    """
+    Replaces descriptions of all catalog SKUs, so that no mapping regex matches them.
+    """
+    catalog, _ = fake_servers
+
+    def _reword_catalog():
+        reworded = []
+        for sku in catalog.skus:
+            sku = billing_v1.Sku(sku)
+            sku.description = f'Reworded {sku.description[::-1]}'
+            reworded.append(sku)
+        monkeypatch.setattr(catalog, 'skus', reworded)
+
+    return _reword_catalog
+
+
+def test_pinned_mappings_survive_reworded_catalog(make_scraper, reword_catalog):
+    resolved = make_scraper()
+    resolved.run(sku_pins_path=PINS_FILE)
+    assert resolved._sku_resolutions['pinned'] == 0
+    assert len(SKUPins.load(PINS_FILE)) > 0
+
+    reword_catalog()
+    pinned = make_scraper()
+    pinned.run(sku_pins_path=PINS_FILE)
+    assert pinned._sku_resolutions['regex'] == 0
+    assert _prices(pinned) == _prices(resolved)
+
+    unpinned = make_scraper()
+    unpinned.run()
+    assert len(unpinned.flat_pricing_data) < len(resolved.flat_pricing_data)
+
+
+def test_changed_regex_is_resolved_again(make_scraper):
+    make_scraper().run(sku_pins_path=PINS_FILE)
+    pins = SKUPins.load(PINS_FILE)
+    key = next(iter(pins.pins))
+    for pin in pins.pins[key].values():
+        pin['regex'] = 'stale'
+    pins.dump(PINS_FILE)
+
+    make_scraper().run(sku_pins_path=PINS_FILE)
+    repinned = SKUPins.load(PINS_FILE).pins[key]
+    assert repinned.keys() == pins.pins[key].keys()
+    assert all(pin['regex'] != 'stale' and pin['regions'] for pin in repinned.values())
@@ -0,0 +1,78 @@
+import json
+
+import pytest
+import yaml
+
+from gcp_compute_machines.dumps import iter_dump_rows, iter_yaml_dump_rows, read_yaml_dump_section
+from gcp_compute_machines.tools import snapshot_diff
+from gcp_compute_machines.tools.snapshot_diff import SnapshotDiffer, diff_snapshots
+
+
+def _row(name, region, ondemand, spot=None, **fields):
+    return {'name': name, 'region': region, 'ondemand': ondemand, 'spot': spot, **fields}
+
+
+def _dump(file_path, rows, **sections):
+    with open(file_path, 'w') as file:
+        yaml.safe_dump({'metadata': {'last_time_updated': 1700000000}, **sections, 'machines': rows}, file)
+    return str(file_path)
+
+
+def test_streaming_reader_matches_safe_load(tmp_path):
+    rows = [
+        _row('n2-standard-2', 'us-east1', 0.0971, 0.02, cpu_count=2.0, ram=8, gpu_support=False,
+             description='Zürich: "quoted"\nmultiline', cpu_platforms='', zones=['us-east1-b', 'us-east1-c'],
+             version='1.10', label='null', extra={'nested': [1, None, True]}),
+        _row('a2-highgpu-1g', 'europe-west4', 3.67, gpu_count_by_default=1, default_gpu='NVIDIA_TESLA_A100'),
+    ]
+    file_path = _dump(tmp_path / 'machines.yaml', rows, zones={'zones': ['us-east1-b'], 'machines': {}})
+    assert list(iter_yaml_dump_rows(file_path)) == rows
+    assert list(iter_dump_rows(file_path)) == rows
+    assert read_yaml_dump_section(file_path, 'metadata') == {'last_time_updated': 1700000000}
+    assert read_yaml_dump_section(file_path, 'zones') == {'zones': ['us-east1-b'], 'machines': {}}
+    assert read_yaml_dump_section(file_path, 'unknown') is None
+
+
+def test_unsupported_dump_format(tmp_path):
+    with pytest.raises(ValueError):
+        iter_dump_rows(str(tmp_path / 'machines.csv'))
+
+
+def test_diff():
+    old = [
+        _row('n2-standard-2', 'us-east1', 0.1, 0.03),
+        _row('n2-standard-4', 'us-east1', 0.2, 0.06),
+        _row('n1-standard-1', 'us-east1', 0.05),
+    ]
+    new = [
+        _row('n2-standard-2', 'us-east1', 0.1 + 1e-12, 0.03),
+        _row('n2-standard-4', 'us-east1', 0.25, None),
+        _row('n2-standard-4', 'us-east1', 9.0, 9.0),
+        _row('c4-standard-2', 'us-east1', 0.11),
+    ]
+    diff = SnapshotDiffer(usage_types=['ondemand', 'spot']).diff(old, new)
+    assert diff.added == [('c4-standard-2', 'us-east1')]
+    assert diff.removed == [('n1-standard-1', 'us-east1')]
+    assert [(x.usage_type, x.old, x.new) for x in diff.changed] == [('ondemand', 0.2, 0.25), ('spot', 0.06, None)]
+    assert diff.changed[0].delta == pytest.approx(0.05)
+    assert diff.changed[1].delta is None
+    assert not diff.is_empty
+    assert SnapshotDiffer().diff(old, old).is_empty
+
+
+def test_diff_files_and_cli(tmp_path, capsys):
+    old = _dump(tmp_path / 'old.yaml', [_row('n2-standard-2', 'us-east1', 0.1)])
+    new = _dump(tmp_path / 'new.yaml', [_row('n2-standard-2', 'us-east1', 0.12)])
+    diff = diff_snapshots(old, new)
+    assert [(x.name, x.old, x.new) for x in diff.changed] == [('n2-standard-2', 0.1, 0.12)]
+
+    with pytest.raises(SystemExit) as exc_info:
+        snapshot_diff.main([old, new])
+    assert exc_info.value.code == 1
+    assert [json.loads(x) for x in capsys.readouterr().out.splitlines()] == [{
+        'kind': 'changed', 'name': 'n2-standard-2', 'region': 'us-east1', 'usage_type': 'ondemand',
+        'old': 0.1, 'new': 0.12,
+    }]
+    with pytest.raises(SystemExit) as exc_info:
+        snapshot_diff.main([old, old, '--tolerance', '0.5'])
+    assert exc_info.value.code == 0
@@ -0,0 +1,70 @@
+import pytest
+
+from gcp_compute_machines.providers.scraper.unit_rates import UnitRatesTable
+
+
+@pytest.fixture
+def table():
+    table = UnitRatesTable()
+    table.set_family_rate('n2', 'us-east1', 'ondemand', 0.031611, 0.004237)
+    table.set_family_rate('n2-custom', 'us-east1', 'ondemand', 0.033174, 0.004446)
+    table.set_family_rate('g2', 'us-east1', 'ondemand', 0.024988, 0.002927)
+    table.set_gpu_rate('NVIDIA_L4', 'us-east1', 'ondemand', 0.56)
+    table.set_local_ssd_rate('us-east1', 'ondemand', 0.08 / 730)
+    return table
+
+
+def test_cpu_and_ram(table):
+    assert table.quote('n2', 'us-east1', 'ondemand', cpu=4, ram=16) == round(4 * 0.031611 + 16 * 0.004237, 5)
+    assert table.quote('n2-custom', 'us-east1', 'ondemand', cpu=6, ram=20.5) == round(
+        6 * 0.033174 + 20.5 * 0.004446, 5
+    )
+
+
+def test_gpu_and_local_ssd(table):
+    price = table.quote(
+        'g2', 'us-east1', 'ondemand', cpu=12, ram=48, gpu='NVIDIA_L4', gpu_count=1, local_ssd_gb=375
+    )
+    assert price == round(12 * 0.024988 + 48 * 0.002927 + 0.56 + 375 * 0.08 / 730, 5)
+    assert table.quote('g2', 'us-east1', 'ondemand', cpu=24, ram=96, gpu='NVIDIA_L4', gpu_count=2) == round(
+        24 * 0.024988 + 96 * 0.002927 + 2 * 0.56, 5
+    )
+    assert table.quote('n2', 'us-east1', 'ondemand', cpu=2, ram=8, local_ssd_gb=750) == round(
+        2 * 0.031611 + 8 * 0.004237 + 750 * 0.08 / 730, 5
+    )
+
+
+@pytest.mark.parametrize('kwargs', [
+    dict(family='n4'),
+    dict(region='europe-west4'),
+    dict(usage_type='spot'),
+    dict(gpu='NVIDIA_T4', gpu_count=1),
+])
+def test_unknown_rates(table, kwargs):
+    kwargs = {'family': 'n2', 'region': 'us-east1', 'usage_type': 'ondemand', 'cpu': 2, 'ram': 8, **kwargs}
+    assert table.quote(**kwargs) is None
+
+
+def test_gpu_count_requires_gpu(table):
+    with pytest.raises(ValueError):
+        table.quote('g2', 'us-east1', 'ondemand', cpu=12, ram=48, gpu_count=1)
+    # a GPU without a count isn't attached
+    assert table.quote('n2', 'us-east1', 'ondemand', cpu=2, ram=8, gpu='NVIDIA_L4') == table.quote(
+        'n2', 'us-east1', 'ondemand', cpu=2, ram=8
+    )
+
+
+def test_local_ssd_rate_is_required_only_for_local_ssd(table):
+    table.local_ssd.clear()
+    assert table.quote('n2', 'us-east1', 'ondemand', cpu=2, ram=8) is not None
+    assert table.quote('n2', 'us-east1', 'ondemand', cpu=2, ram=8, local_ssd_gb=375) is None
+
+
+def test_dump_and_load(table, tmp_path):
+    assert UnitRatesTable.from_dict(table.to_dict()).to_dict() == table.to_dict()
+    table.dump(str(tmp_path / 'rates.yaml'))
+    loaded = UnitRatesTable.load(str(tmp_path / 'rates.yaml'))
+    assert len(loaded) == len(table) == 5
+    assert loaded.quote('g2', 'us-east1', 'ondemand', 12, 48, 'NVIDIA_L4', 1, 375) == table.quote(
+        'g2', 'us-east1', 'ondemand', 12, 48, 'NVIDIA_L4', 1, 375
+    )
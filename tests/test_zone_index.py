@@ -0,0 +1,73 @@
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from gcp_compute_machines.tools.zone_index import ZoneAvailabilityIndex
+
+ZONES = [f'{region}-{suffix}' for region in ('us-east1', 'europe-west4', 'asia-east1') for suffix in 'abc']
+
+
+@pytest.fixture
+def availability():
+    rng = random.Random(0)
+    # enough machine types for bitsets wider than a machine word
+    return {f'machine-{i}': set(rng.sample(ZONES, rng.randint(1, len(ZONES)))) for i in range(100)}
+
+
+def test_queries_match_sets(availability):
+    index = ZoneAvailabilityIndex(availability)
+    rng = random.Random(1)
+    assert len(index) == 100
+    for machine, zones in availability.items():
+        assert index.zones_for(machine) == sorted(zones)
+        assert index.regions_for(machine) == sorted({zone[:-2] for zone in zones})
+    for zone in ZONES:
+        assert index.machines_in(zone) == sorted(x for x, zones in availability.items() if zone in zones)
+        assert all(index.is_available(x, zone) == (zone in zones) for x, zones in availability.items())
+
+    for _ in range(20):
+        machines = rng.sample(sorted(availability), 3)
+        assert index.zones_offering_all(machines) == sorted(set.intersection(*(availability[x] for x in machines)))
+        assert index.zones_offering_any(machines) == sorted(set.union(*(availability[x] for x in machines)))
+        zones = rng.sample(ZONES, 2)
+        assert index.machines_in_all(zones) == sorted(
+            x for x, machine_zones in availability.items() if set(zones) <= machine_zones
+        )
+        assert index.machines_in_any(zones) == sorted(
+            x for x, machine_zones in availability.items() if set(zones) & machine_zones
+        )
+
+
+def test_unknown_names(availability):
+    index = ZoneAvailabilityIndex(availability)
+    assert 'unknown' not in index
+    assert index.zones_for('unknown') == []
+    assert index.machines_in('unknown-zone1-a') == []
+    assert not index.is_available('machine-0', 'unknown-zone1-a')
+    assert index.zones_offering_all([]) == []
+    assert index.zones_offering_all(['machine-0', 'unknown']) == []
+
+
+def test_dict_round_trip(availability):
+    index = ZoneAvailabilityIndex(availability)
+    restored = ZoneAvailabilityIndex.from_dict(index.to_dict())
+    assert restored.to_dict() == index.to_dict()
+    assert all(restored.zones_for(x) == sorted(zones) for x, zones in availability.items())
+
+
+def test_from_provider_rows():
+    scraped = ZoneAvailabilityIndex.from_scraped_machines({
+        'n2-standard-2': {'zones': ['us-east1-b', 'us-east1-c']},
+        'c4-standard-2': {'zones': ['us-east1-b']},
+    })
+    assert scraped.machines_in('us-east1-b') == ['c4-standard-2', 'n2-standard-2']
+
+    gcloud_compute = ZoneAvailabilityIndex.from_gcloud_compute_machines([
+        SimpleNamespace(name='n2-standard-2', zones='us-east1-b, us-east1-c'),
+        SimpleNamespace(name='n2-standard-2', zones='europe-west4-a'),
+        SimpleNamespace(name='m1-ultramem-40', zones=''),
+    ])
+    assert gcloud_compute.zones_for('n2-standard-2') == ['europe-west4-a', 'us-east1-b', 'us-east1-c']
+    assert 'm1-ultramem-40' in gcloud_compute
+    assert gcloud_compute.zones_for('m1-ultramem-40') == []